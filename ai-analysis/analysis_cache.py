@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+AI 분석 결과 캐시
+- 키: 정규화된 제품 데이터 해시 + 프롬프트 버전 + 모델 + 파라미터
+- SQLite 기반, 항목별 TTL, 항목 수 제한 (LRU 삭제)
+- 프롬프트 템플릿이 바뀌면 이전 버전 결과 무효화
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+
+# 분석 결과에 영향을 주지 않는 필드
+VOLATILE_KEYS = {'timestamp', 'collected_at', 'scraped_at', 'cached'}
+
+
+def product_fingerprint(product_data):
+    """
+    제품 데이터 정규화 해시 (키 순서/앞뒤 공백/빈 값 차이 무시)
+    """
+    def normalize(value):
+        if isinstance(value, dict):
+            return {k: normalize(v) for k, v in value.items()
+                    if k not in VOLATILE_KEYS and v not in (None, '', [], {})}
+        if isinstance(value, (list, tuple)):
+            return [normalize(v) for v in value]
+        if isinstance(value, str):
+            return ' '.join(value.split())
+        return value
+
+    normalized = json.dumps(normalize(product_data), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class AnalysisCache:
+    def __init__(self, path=None, ttl=7 * 24 * 3600, max_entries=50000):
+        self.path = path or os.getenv('ANALYSIS_CACHE_PATH', '.cache/analysis_cache.sqlite3')
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # DuoAnalyzer 워커 스레드에서 공유
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS analyses (
+                key TEXT PRIMARY KEY,
+                analyzer TEXT NOT NULL,
+                prompt_version TEXT NOT NULL,
+                model TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_analyses_access ON analyses(last_access)')
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(analyzer, model, version, product_data, params=None):
+        params_json = json.dumps(params or {}, sort_keys=True)
+        raw = f"{analyzer}|{model}|{version}|{product_fingerprint(product_data)}|{params_json}"
+        return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+    def get(self, key):
+        """
+        캐시 조회 (만료 항목은 삭제 후 None)
+        """
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT payload, expires_at FROM analyses WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None or row[1] <= now:
+                if row is not None:
+                    self._conn.execute('DELETE FROM analyses WHERE key = ?', (key,))
+                    self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute('UPDATE analyses SET last_access = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def set(self, key, value, analyzer, model, version, ttl=None):
+        """
+        분석 결과 저장, 항목 수 초과 시 오래 안 쓴 항목부터 삭제
+        """
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO analyses '
+                '(key, analyzer, prompt_version, model, payload, expires_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, analyzer, version, model, payload, expires_at, now)
+            )
+
+            count = self._conn.execute('SELECT COUNT(*) FROM analyses').fetchone()[0]
+            overflow = count - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    'DELETE FROM analyses WHERE key IN '
+                    '(SELECT key FROM analyses ORDER BY last_access ASC LIMIT ?)', (overflow,)
+                )
+                self.evictions += overflow
+
+            self._conn.commit()
+
+    def invalidate_stale(self, analyzer, version):
+        """
+        현재 프롬프트 버전이 아닌 분석 결과 삭제
+        """
+        with self._lock:
+            deleted = self._conn.execute(
+                'DELETE FROM analyses WHERE analyzer = ? AND prompt_version != ?', (analyzer, version)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def stats(self):
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM analyses').fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            'entries': entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0,
+            'evictions': self.evictions
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
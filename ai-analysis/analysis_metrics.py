@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+AI 분석 호출 지표
+- 호출별 모델, 입력/출력/캐시 토큰, 소요 시간, 재시도 횟수, 예상 비용 기록
+- 분석기별 집계 (지연 p50/p95, 제품당 토큰, 분석 제품당 비용)
+- 프로세스 내 조회 (summary) + Prometheus 텍스트 형식 파일 (write)
+"""
+
+import os
+import json
+import threading
+from collections import deque
+import numpy as np
+
+# 모델별 100만 토큰당 가격 (USD): 입력, 출력, 캐시 읽기, 캐시 쓰기
+MODEL_PRICING = {
+    'claude-3-sonnet-20241022': {'input': 3.00, 'output': 15.00, 'cache_read': 0.30, 'cache_write': 3.75},
+    'claude-3-haiku-20240307': {'input': 0.25, 'output': 1.25, 'cache_read': 0.03, 'cache_write': 0.30},
+    'gpt-4o': {'input': 2.50, 'output': 10.00, 'cache_read': 1.25, 'cache_write': 0.0}
+}
+# Batch API 할인율
+BATCH_DISCOUNT = 0.5
+
+# 지표 파일 토큰 종류 라벨 → usage 키
+TOKEN_KINDS = {
+    'input': 'input_tokens',
+    'output': 'output_tokens',
+    'cache_read': 'cache_read_input_tokens',
+    'cache_creation': 'cache_creation_input_tokens'
+}
+
+# 분석기별로 보관하는 최근 지연 시간 수 (분위수 계산용)
+LATENCY_WINDOW = 10000
+
+
+def split_input_tokens(model, usage):
+    """
+    usage → (일반 입력, 캐시 읽기, 캐시 쓰기) 토큰
+    - Claude input_tokens는 캐시 토큰 제외, OpenAI prompt_tokens는 캐시 읽기 포함이므로 차감
+    """
+    cache_read = usage.get('cache_read_input_tokens', 0)
+    cache_write = usage.get('cache_creation_input_tokens', 0)
+    uncached = usage.get('input_tokens', 0)
+    if model.startswith('gpt'):
+        uncached -= cache_read
+    return uncached, cache_read, cache_write
+
+
+def estimate_cost(model, usage, batch=False):
+    """
+    usage(usage_summary 형식) → 예상 비용 (USD, 가격표에 없는 모델은 0)
+    """
+    pricing = MODEL_PRICING.get(model)
+    if pricing is None or not usage:
+        return 0.0
+
+    uncached, cache_read, cache_write = split_input_tokens(model, usage)
+    cost = (uncached * pricing['input'] + usage.get('output_tokens', 0) * pricing['output']
+            + cache_read * pricing['cache_read'] + cache_write * pricing['cache_write']) / 1_000_000
+    return cost * BATCH_DISCOUNT if batch else cost
+
+
+class AnalysisMetrics:
+    def __init__(self, path=None):
+        self.path = path or os.getenv('ANALYSIS_METRICS_PATH', '.cache/analysis_metrics.prom')
+        # DuoAnalyzer 워커 스레드에서 공유
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._totals = {}
+            self._latencies = {}
+
+    def record(self, analyzer, model, usage=None, latency=None, retries=0, status='success',
+               products=1, cached=False, batch=False):
+        """
+        호출 한 번 기록
+        - products: 이 호출로 분석한 제품 수 (묶음 분석은 여러 개)
+        - cached: 분석 캐시 적중 (API 호출 없음, 제품 수만 집계)
+        - latency: 초 단위 (배치 결과처럼 호출 단위 지연이 없으면 None)
+        """
+        usage = usage or {}
+        cost = 0.0 if cached else estimate_cost(model, usage, batch)
+
+        with self._lock:
+            totals = self._totals.setdefault(analyzer, {
+                'model': model, 'calls': 0, 'errors': 0, 'cache_hits': 0, 'retries': 0, 'products': 0,
+                'input_tokens': 0, 'output_tokens': 0,
+                'cache_read_input_tokens': 0, 'cache_creation_input_tokens': 0,
+                'total_input_tokens': 0, 'cost_usd': 0.0
+            })
+            totals['products'] += products
+            if cached:
+                totals['cache_hits'] += 1
+                return
+
+            totals['calls'] += 1
+            totals['errors'] += status != 'success'
+            totals['retries'] += retries
+            for name in TOKEN_KINDS.values():
+                totals[name] += usage.get(name, 0)
+            # 제공자와 무관하게 캐시 포함 전체 입력 토큰
+            totals['total_input_tokens'] += sum(split_input_tokens(model, usage))
+            totals['cost_usd'] += cost
+
+            if latency is not None:
+                self._latencies.setdefault(analyzer, deque(maxlen=LATENCY_WINDOW)).append(latency)
+
+    def summary(self):
+        """
+        분석기별 집계 지표
+        """
+        with self._lock:
+            totals = {key: dict(value) for key, value in self._totals.items()}
+            latencies = {analyzer: np.array(values) for analyzer, values in self._latencies.items()}
+
+        summary = {}
+        for analyzer, values in totals.items():
+            products = values['products']
+            tokens = values['total_input_tokens'] + values['output_tokens']
+            entry = dict(values)
+            entry['cost_usd'] = round(values['cost_usd'], 6)
+            entry['tokens_per_product'] = round(tokens / products, 1) if products else 0
+            entry['cost_per_product_usd'] = round(values['cost_usd'] / products, 6) if products else 0
+
+            samples = latencies.get(analyzer)
+            if samples is not None and samples.size:
+                p50, p95 = np.percentile(samples, [50, 95])
+                entry['latency_p50_seconds'] = round(float(p50), 3)
+                entry['latency_p95_seconds'] = round(float(p95), 3)
+            summary[analyzer] = entry
+
+        return summary
+
+    def write(self, path=None):
+        """
+        Prometheus 텍스트 형식으로 지표 파일 기록 (node_exporter textfile 수집용)
+        """
+        path = path or self.path
+        lines = []
+
+        def metric(name, help_text, kind, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+                lines.append(f"{name}{{{label_text}}} {value}")
+
+        summary = self.summary()
+        base = {analyzer: {'analyzer': analyzer, 'model': entry['model']} for analyzer, entry in summary.items()}
+
+        metric('analysis_calls_total', 'API calls made by analyzers', 'counter',
+               [(base[a], e['calls']) for a, e in summary.items()])
+        metric('analysis_errors_total', 'Failed analyzer API calls', 'counter',
+               [(base[a], e['errors']) for a, e in summary.items()])
+        metric('analysis_cache_hits_total', 'Analyses served from the analysis cache', 'counter',
+               [(base[a], e['cache_hits']) for a, e in summary.items()])
+        metric('analysis_retries_total', 'SDK retries taken', 'counter',
+               [(base[a], e['retries']) for a, e in summary.items()])
+        metric('analysis_products_total', 'Products analyzed', 'counter',
+               [(base[a], e['products']) for a, e in summary.items()])
+        metric('analysis_tokens_total', 'Tokens used by type', 'counter',
+               [(dict(base[a], type=kind), e[name]) for a, e in summary.items() for kind, name in TOKEN_KINDS.items()])
+        metric('analysis_cost_usd_total', 'Estimated API cost in USD', 'counter',
+               [(base[a], e['cost_usd']) for a, e in summary.items()])
+        metric('analysis_latency_seconds', 'Analyzer call latency', 'summary',
+               [(dict(base[a], quantile=quantile), e[key]) for a, e in summary.items()
+                for quantile, key in (('0.5', 'latency_p50_seconds'), ('0.95', 'latency_p95_seconds')) if key in e])
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 수집기가 쓰다 만 파일을 읽지 않도록 임시 파일 후 교체
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_path, path)
+        return path
+
+
+# 프로세스 공용 지표 (분석기 생성 시 metrics를 넘기지 않으면 사용)
+METRICS = AnalysisMetrics()
+
+if __name__ == "__main__":
+    METRICS.record('claude', 'claude-3-sonnet-20241022',
+                   {'input_tokens': 120, 'output_tokens': 300, 'cache_read_input_tokens': 1400}, latency=4.2)
+    METRICS.record('gpt', 'gpt-4o', {'input_tokens': 1500, 'output_tokens': 250, 'cache_read_input_tokens': 1280},
+                   latency=2.1, retries=1)
+    print(json.dumps(METRICS.summary(), ensure_ascii=False, indent=2))
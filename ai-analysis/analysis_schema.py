@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+AI 분석 결과 스키마
+- Claude/GPT 출력 필드 정의 → 요청용 JSON Schema (tool use / response_format)
+- 응답을 경계에서 한 번만 파싱/검증해 타입이 정해진 결과 객체로 변환
+- 코드 블록이나 앞뒤 설명이 붙은 응답용 JSON 추출기 (구조화 출력 실패 시 대체)
+"""
+
+import re
+import json
+
+_decoder = json.JSONDecoder()
+_FENCE_PATTERN = re.compile(r'```(?:json)?\s*(.*?)\s*```', re.DOTALL)
+_NUMBER_NOISE = re.compile(r'[,\s%원₩]|KRW')
+
+# 앞뒤 설명이 붙은 응답에서 JSON 시작 위치를 찾는 최대 시도 횟수
+MAX_DECODE_ATTEMPTS = 20
+
+
+def _extract_json(text, kind, opener):
+    """
+    텍스트에서 kind 타입 JSON 값 하나 추출 (실패 시 None)
+    - 전체 → 코드 블록 → 여는 괄호 위치마다 raw_decode 순서로 시도
+    """
+    if not isinstance(text, str):
+        return text if isinstance(text, kind) else None
+
+    candidates = [text.strip()]
+    candidates.extend(match.group(1) for match in _FENCE_PATTERN.finditer(text))
+
+    for candidate in candidates:
+        try:
+            parsed = json.loads(candidate)
+        except ValueError:
+            continue
+        if isinstance(parsed, kind):
+            return parsed
+
+    start = text.find(opener)
+    attempts = 0
+    while start != -1 and attempts < MAX_DECODE_ATTEMPTS:
+        try:
+            parsed, _ = _decoder.raw_decode(text, start)
+            if isinstance(parsed, kind):
+                return parsed
+        except ValueError:
+            pass
+        start = text.find(opener, start + 1)
+        attempts += 1
+
+    return None
+
+
+def extract_json_object(text):
+    """
+    응답 텍스트에서 JSON 객체 추출 (코드 블록/앞뒤 설명 허용, 실패 시 None)
+    """
+    return _extract_json(text, dict, '{')
+
+
+def extract_json_array(text):
+    """
+    응답 텍스트에서 JSON 배열 추출 (코드 블록/앞뒤 설명 허용, 실패 시 None)
+    """
+    return _extract_json(text, list, '[')
+
+
+def _to_number(value):
+    if isinstance(value, bool):
+        raise ValueError('boolean is not a number')
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        return float(_NUMBER_NOISE.sub('', value))
+    raise ValueError(f'not a number: {value!r}')
+
+
+def _integer(low=None, high=None):
+    def coerce(value):
+        number = int(round(_to_number(value)))
+        if (low is not None and number < low) or (high is not None and number > high):
+            raise ValueError(f'{number} out of range {low}-{high}')
+        return number
+    coerce.schema = {'type': 'integer'}
+    return coerce
+
+
+def _number():
+    def coerce(value):
+        return round(float(_to_number(value)), 1)
+    coerce.schema = {'type': 'number'}
+    return coerce
+
+
+def _text(max_length=None):
+    def coerce(value):
+        if not isinstance(value, str):
+            raise ValueError(f'not a string: {value!r}')
+        value = value.strip()
+        return value[:max_length] if max_length else value
+    coerce.schema = {'type': 'string'}
+    return coerce
+
+
+def _text_list():
+    def coerce(value):
+        if isinstance(value, str):
+            value = [value]
+        if not isinstance(value, (list, tuple)):
+            raise ValueError(f'not a list: {value!r}')
+        return [str(item).strip() for item in value if str(item).strip()]
+    coerce.schema = {'type': 'array', 'items': {'type': 'string'}}
+    return coerce
+
+
+def _boolean():
+    def coerce(value):
+        if isinstance(value, bool):
+            return value
+        if isinstance(value, str) and value.strip().lower() in ('true', 'yes', '예'):
+            return True
+        if isinstance(value, str) and value.strip().lower() in ('false', 'no', '아니오'):
+            return False
+        raise ValueError(f'not a boolean: {value!r}')
+    coerce.schema = {'type': 'boolean'}
+    return coerce
+
+
+def _price_range():
+    krw = _integer(low=0)
+
+    def coerce(value):
+        if not isinstance(value, dict):
+            raise ValueError(f'not an object: {value!r}')
+        low, high = krw(value['min_krw']), krw(value['max_krw'])
+        return {'min_krw': min(low, high), 'max_krw': max(low, high)}
+    coerce.schema = _object_schema({'min_krw': krw, 'max_krw': krw})
+    return coerce
+
+
+def _object_schema(fields):
+    # OpenAI strict 모드 조건: 모든 필드 required, 추가 필드 금지
+    return {
+        'type': 'object',
+        'properties': {name: coerce.schema for name, coerce in fields.items()},
+        'required': list(fields),
+        'additionalProperties': False
+    }
+
+
+class AnalysisRecord:
+    """
+    분석 결과 공통 기반 (FIELDS: 필드명 → 변환/검증 함수)
+    """
+    __slots__ = ()
+    FIELDS = {}
+
+    def __init__(self, **values):
+        for name in self.FIELDS:
+            setattr(self, name, values[name])
+
+    def __repr__(self):
+        values = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.FIELDS)
+        return f"{type(self).__name__}({values})"
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    @classmethod
+    def schema(cls):
+        """
+        요청용 JSON Schema
+        """
+        return _object_schema(cls.FIELDS)
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        dict → 결과 객체 (누락/형식 오류 시 ValueError)
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f'{cls.__name__}: expected an object')
+
+        values = {}
+        for name, coerce in cls.FIELDS.items():
+            if name not in data:
+                raise ValueError(f'{cls.__name__}: missing field {name}')
+            try:
+                values[name] = coerce(data[name])
+            except (TypeError, KeyError, ValueError) as e:
+                raise ValueError(f'{cls.__name__}: invalid {name} ({e})') from None
+        return cls(**values)
+
+    @classmethod
+    def parse(cls, text):
+        """
+        응답 텍스트 → 결과 객체 (JSON 없음/검증 실패 시 ValueError)
+        """
+        data = extract_json_object(text)
+        if data is None:
+            raise ValueError(f'{cls.__name__}: no JSON object in response')
+        return cls.from_dict(data)
+
+    def to_dict(self):
+        return {name: getattr(self, name) for name in self.FIELDS}
+
+
+class ClaudeAnalysis(AnalysisRecord):
+    FIELDS = {
+        'market_potential': _integer(1, 10),
+        'competition_level': _integer(1, 10),
+        'expected_margin_percent': _number(),
+        'entry_score': _integer(1, 100),
+        'keywords': _text_list(),
+        'target_customers': _text(),
+        'risks': _text_list(),
+        'recommended': _boolean()
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class GPTAnalysis(AnalysisRecord):
+    # 금액 계산은 margin_engine.MarginEngine이 담당, GPT는 정성적 항목만
+    FIELDS = {
+        'competitor_price_range': _price_range(),
+        'marketing_points': _text_list(),
+        'hashtags': _text_list(),
+        'description': _text()
+    }
+    __slots__ = tuple(FIELDS)
+
+
+class ScreeningAnalysis(AnalysisRecord):
+    # 저가 모델 1차 선별 (진출 점수만)
+    FIELDS = {
+        'entry_score': _integer(1, 100),
+        'reason': _text(max_length=200)
+    }
+    __slots__ = tuple(FIELDS)
+
+
+def analysis_of(result):
+    """
+    분석기 결과 dict → 분석 dict (실패 결과, 예전 텍스트 분석처럼 구조화되지 않은 결과면 None)
+    - 분석기가 응답 경계에서 from_dict로 검증한 뒤 to_dict로 저장한 값이므로 다시 검증하지 않음
+    """
+    if not isinstance(result, dict) or result.get('status') != 'success':
+        return None
+    analysis = result.get('analysis')
+    return analysis if isinstance(analysis, dict) else None
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+분석기 공통 기반 (Claude / GPT / 1차 선별 분석기)
+- 캐시 키/조회/저장, 성공·실패 결과 형식, 호출 지표 기록
+- 하위 클래스는 NAME(캐시/지표의 분석기 이름), MODEL, MAX_TOKENS, PROMPT_VERSION과
+  send(요청 전송) / result_from_response(응답 → 결과)를 정의
+"""
+
+import time
+from datetime import datetime
+from analysis_cache import AnalysisCache
+from analysis_metrics import METRICS, estimate_cost
+
+
+class AnalyzerBase:
+    NAME = None
+    MODEL = None
+    MAX_TOKENS = None
+    PROMPT_VERSION = None
+
+    def __init__(self, cache=None, metrics=None, client=None):
+        # None이면 프로세스 공용 클라이언트 (처음 호출할 때 생성)
+        self._client = client
+        # AnalysisCache 인스턴스 (None이면 캐시 미사용)
+        self.cache = cache
+        if self.cache is not None:
+            self.cache.invalidate_stale(self.NAME, self.PROMPT_VERSION)
+        # AnalysisMetrics 인스턴스 (기본: 프로세스 공용)
+        self.metrics = metrics or METRICS
+
+    def analyze(self, product_data):
+        """
+        캐시 조회 → 요청 → 결과 변환 → 지표 기록 → 캐시 저장 (성공 결과만)
+        """
+        cache_key = self.cache_key(product_data)
+        cached = self.cached_result(cache_key)
+        if cached is not None:
+            self.metrics.record(self.NAME, self.MODEL, cached=True)
+            return cached
+
+        started = time.perf_counter()
+        retries = 0
+        try:
+            raw = self.send(product_data)
+            # SDK 재시도 횟수는 버전에 따라 없을 수 있음
+            retries = getattr(raw, 'retries_taken', 0)
+            result = self.result_from_response(raw.parse())
+        except Exception as e:
+            result = self.failed_result(e)
+
+        # 지표는 호출 성공/실패와 무관하게 기록 (파싱 실패도 사용량/비용 포함)
+        self.record_call(result, time.perf_counter() - started, retries)
+        return self.store_result(cache_key, result)
+
+    def send(self, product_data):
+        """
+        요청 전송 → with_raw_response 응답 (parse()로 응답 객체)
+        """
+        raise NotImplementedError
+
+    def result_from_response(self, response):
+        """
+        응답 객체 → success_result / failed_result
+        """
+        raise NotImplementedError
+
+    def record_call(self, result, latency=None, retries=0, batch=False):
+        """
+        호출 지표 기록 및 결과에 모델/소요 시간/재시도/예상 비용 추가
+        """
+        usage = result.get('usage')
+        result['model'] = self.MODEL
+        result['latency_seconds'] = None if latency is None else round(latency, 3)
+        result['retries'] = retries
+        result['cost_usd'] = round(estimate_cost(self.MODEL, usage, batch), 6)
+        self.metrics.record(self.NAME, self.MODEL, usage, latency, retries, result['status'], batch=batch)
+        return result
+
+    def cache_key(self, product_data):
+        if self.cache is None:
+            return None
+        return AnalysisCache.make_key(self.NAME, self.MODEL, self.PROMPT_VERSION, product_data,
+                                      {'max_tokens': self.MAX_TOKENS})
+
+    def cached_result(self, cache_key):
+        if cache_key is None:
+            return None
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            cached['cached'] = True
+        return cached
+
+    def store_result(self, cache_key, result):
+        if cache_key is not None and result['status'] == 'success':
+            self.cache.set(cache_key, result, self.NAME, self.MODEL, self.PROMPT_VERSION)
+        return result
+
+    def success_result(self, analysis, usage=None):
+        # analysis: AnalysisRecord (캐시/시트 저장용으로 dict로 보관)
+        result = {
+            'timestamp': datetime.now().isoformat(),
+            'analysis': analysis.to_dict(),
+            'status': 'success'
+        }
+        if usage is not None:
+            # 캐시 읽기/쓰기 토큰 포함
+            result['usage'] = usage
+        return result
+
+    def failed_result(self, error, usage=None):
+        result = {
+            'timestamp': datetime.now().isoformat(),
+            'error': str(error),
+            'status': 'failed'
+        }
+        if usage is not None:
+            # 응답은 받았지만 검증에 실패한 경우에도 사용한 토큰은 비용에 포함
+            result['usage'] = usage
+        return result
@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+대량 제품 배치 분석
+- Claude Message Batches / OpenAI Batch API로 수백 개 제품 일괄 제출
+- 배치 ID를 로컬 파일에 저장 (프로세스 재시작 후에도 이어서 수집)
+- 완료 여부 폴링 후 제품별로 기존 분석 결과와 같은 형태로 매핑
+- 로컬 대역 서버 테스트: ANTHROPIC_BASE_URL / OPENAI_BASE_URL 환경변수 사용
+"""
+
+import os
+import json
+import time
+import uuid
+from datetime import datetime
+from claude_analysis import ClaudeAnalyzer
+from gpt_analysis import GPTAnalyzer, usage_summary as gpt_usage
+
+CLAUDE_DONE = {'ended'}
+GPT_DONE = {'completed', 'failed', 'expired', 'cancelled'}
+
+
+class BatchAnalyzer:
+    def __init__(self, claude=None, gpt=None, state_path=None):
+        self.claude = claude or ClaudeAnalyzer()
+        self.gpt = gpt or GPTAnalyzer()
+        self.state_path = state_path or os.getenv('BATCH_STATE_PATH', '.cache/batch_runs.json')
+
+    def submit(self, products, exchange_rate=1350):
+        """
+        제품 목록 배치 제출 (캐시에 있는 제품은 제출하지 않음)
+        - 일부 배치 제출에 실패하면 status 'submit_failed'로 저장 (resubmit으로 남은 배치만 다시 제출)
+        """
+        run_id = datetime.now().strftime('%Y%m%d-%H%M%S-') + uuid.uuid4().hex[:6]
+        products = [self._as_dict(product) for product in products]
+        custom_ids = [f"p{index:05d}" for index in range(len(products))]
+
+        run = {
+            'created_at': datetime.now().isoformat(),
+            'exchange_rate': exchange_rate,
+            'custom_ids': custom_ids,
+            'products': products,
+            'cached': {'claude': {}, 'gpt': {}},
+            'claude_batch_id': None,
+            'gpt_batch_id': None,
+            'status': 'submitted'
+        }
+
+        for custom_id, product in zip(custom_ids, products):
+            cached = self.claude.cached_result(self.claude.cache_key(product))
+            if cached is not None:
+                run['cached']['claude'][custom_id] = cached
+            cached = self.gpt.cached_result(self.gpt.cache_key(product))
+            if cached is not None:
+                run['cached']['gpt'][custom_id] = cached
+
+        return self._submit(run_id, run)
+
+    def resubmit(self, run_id):
+        """
+        제출에 실패한 배치만 다시 제출 (이미 제출된 배치는 그대로)
+        """
+        run = self._load_runs()[run_id]
+        if run['status'] == 'collected':
+            return {
+                'run_id': run_id,
+                'timestamp': datetime.now().isoformat(),
+                'error': 'run already collected',
+                'status': 'failed'
+            }
+        return self._submit(run_id, run)
+
+    def _submit(self, run_id, run):
+        """
+        배치 ID가 없는 분석기의 미캐시 제품만 제출
+        """
+        claude_requests = []
+        gpt_lines = []
+        for custom_id, product in zip(run['custom_ids'], run['products']):
+            if run['claude_batch_id'] is None and custom_id not in run['cached']['claude']:
+                claude_requests.append({'custom_id': custom_id, 'params': self.claude.build_params(product)})
+
+            if run['gpt_batch_id'] is None and custom_id not in run['cached']['gpt']:
+                gpt_lines.append(json.dumps({
+                    'custom_id': custom_id,
+                    'method': 'POST',
+                    'url': '/v1/chat/completions',
+                    'body': self.gpt.build_params(product)
+                }, ensure_ascii=False))
+
+        try:
+            if claude_requests:
+                batch = self.claude.client.messages.batches.create(requests=claude_requests)
+                run['claude_batch_id'] = batch.id
+
+            if gpt_lines:
+                input_file = self.gpt.client.files.create(
+                    file=(f"{run_id}.jsonl", '\n'.join(gpt_lines).encode('utf-8')),
+                    purpose='batch'
+                )
+                batch = self.gpt.client.batches.create(
+                    input_file_id=input_file.id,
+                    endpoint='/v1/chat/completions',
+                    completion_window='24h'
+                )
+                run['gpt_batch_id'] = batch.id
+
+        except Exception as e:
+            # 이미 제출된 배치 ID는 남겨 두어 나중에 수집할 수 있게 함
+            run['status'] = 'submit_failed'
+            run['error'] = str(e)
+            self._save_run(run_id, run)
+            return {
+                'run_id': run_id,
+                'timestamp': datetime.now().isoformat(),
+                'unsubmitted': self._unsubmitted(run),
+                'error': str(e),
+                'status': 'failed'
+            }
+
+        run['status'] = 'submitted'
+        run.pop('error', None)
+        self._save_run(run_id, run)
+
+        return {
+            'run_id': run_id,
+            'timestamp': datetime.now().isoformat(),
+            'products': len(run['products']),
+            'claude_submitted': len(claude_requests),
+            'gpt_submitted': len(gpt_lines),
+            'claude_batch_id': run['claude_batch_id'],
+            'gpt_batch_id': run['gpt_batch_id'],
+            'status': 'submitted'
+        }
+
+    @staticmethod
+    def _unsubmitted(run):
+        """
+        제출할 제품이 있었지만 배치 ID가 없는 분석기 목록 (제출 실패)
+        """
+        return [name for name in ('claude', 'gpt')
+                if run[f"{name}_batch_id"] is None and len(run['cached'][name]) < len(run['custom_ids'])]
+
+    def poll(self, run_id):
+        """
+        배치 진행 상태 조회
+        - 제출에 실패한 분석기는 'submit_failed' (기다릴 배치가 없으므로 완료로 봄, resubmit으로 재제출)
+        """
+        run = self._load_runs()[run_id]
+        unsubmitted = self._unsubmitted(run) if run['status'] == 'submit_failed' else []
+        claude_status = 'submit_failed' if 'claude' in unsubmitted else 'none'
+        gpt_status = 'submit_failed' if 'gpt' in unsubmitted else 'none'
+
+        if run['claude_batch_id']:
+            claude_status = self.claude.client.messages.batches.retrieve(run['claude_batch_id']).processing_status
+        if run['gpt_batch_id']:
+            gpt_status = self.gpt.client.batches.retrieve(run['gpt_batch_id']).status
+
+        finished = {'none', 'submit_failed'}
+        done = claude_status in CLAUDE_DONE | finished and gpt_status in GPT_DONE | finished
+        status = {
+            'run_id': run_id,
+            'claude_status': claude_status,
+            'gpt_status': gpt_status,
+            'done': done
+        }
+        if unsubmitted:
+            status['error'] = run.get('error')
+        return status
+
+    def collect(self, run_id):
+        """
+        완료된 배치 결과를 제품별 {'product', 'claude', 'gpt'}로 매핑
+        - 각 결과는 analyze_product / calculate_margins와 같은 형태
+        - 배치에서 누락된 제품, 제출에 실패한 분석기의 제품은 status 'failed'
+        - 배치 결과는 처음 수집할 때 상태 파일에 저장, 다시 호출해도 배치를 다시 읽거나 지표를 중복 기록하지 않음
+        """
+        runs = self._load_runs()
+        run = runs[run_id]
+        unsubmitted = self._unsubmitted(run) if run['status'] == 'submit_failed' else []
+        collected = run.setdefault('collected', {})
+
+        if run['claude_batch_id'] and 'claude' not in collected:
+            collected['claude'] = self._collect_claude(run)
+            self._save_run(run_id, run)
+        if run['gpt_batch_id'] and 'gpt' not in collected:
+            collected['gpt'] = self._collect_gpt(run)
+            self._save_run(run_id, run)
+
+        claude_results = dict(run['cached']['claude'], **collected.get('claude', {}))
+        gpt_results = dict(run['cached']['gpt'], **collected.get('gpt', {}))
+
+        def missing(analyzer, name):
+            if name in unsubmitted:
+                return analyzer.failed_result(f"batch submit failed: {run.get('error', '')}")
+            return analyzer.failed_result('missing from batch output')
+
+        claude_missing = missing(self.claude, 'claude')
+        gpt_missing = missing(self.gpt, 'gpt')
+        # 마진은 배치 결과 수집 시 로컬 엔진으로 한 번에 계산
+        gpt_list = self.gpt.attach_margins(
+            run['products'],
+            [gpt_results.get(custom_id, gpt_missing) for custom_id in run['custom_ids']],
+            run['exchange_rate']
+        )
+
+        results = []
+        for custom_id, product, gpt_result in zip(run['custom_ids'], run['products'], gpt_list):
+            results.append({
+                'product': product,
+                'claude': claude_results.get(custom_id, claude_missing),
+                'gpt': gpt_result
+            })
+
+        run['status'] = 'collected'
+        self._save_run(run_id, run)
+        return results
+
+    def wait(self, run_id, poll_interval=60, timeout=None):
+        """
+        배치 완료까지 폴링 후 결과 수집 (timeout 초과 시 None)
+        """
+        started = time.monotonic()
+        while not self.poll(run_id)['done']:
+            if timeout is not None and time.monotonic() - started > timeout:
+                return None
+            time.sleep(poll_interval)
+        return self.collect(run_id)
+
+    def pending_runs(self):
+        """
+        아직 수집하지 않은 배치 실행 ID 목록
+        """
+        return [run_id for run_id, run in self._load_runs().items() if run['status'] != 'collected']
+
+    def _collect_claude(self, run):
+        products = dict(zip(run['custom_ids'], run['products']))
+        results = {}
+
+        for entry in self.claude.client.messages.batches.results(run['claude_batch_id']):
+            outcome = entry.result
+            if outcome.type == 'succeeded':
+                result = self.claude.record_call(self.claude.result_from_message(outcome.message), batch=True)
+                product = products.get(entry.custom_id)
+                if product is not None:
+                    self.claude.store_result(self.claude.cache_key(product), result)
+            else:
+                error = getattr(outcome, 'error', None) or outcome.type
+                result = self.claude.record_call(self.claude.failed_result(error), batch=True)
+            results[entry.custom_id] = result
+
+        return results
+
+    def _collect_gpt(self, run):
+        products = dict(zip(run['custom_ids'], run['products']))
+        batch = self.gpt.client.batches.retrieve(run['gpt_batch_id'])
+        results = {}
+
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if not file_id:
+                continue
+            for line in self.gpt.client.files.content(file_id).text.splitlines():
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                response = entry.get('response') or {}
+
+                if response.get('status_code') == 200:
+                    body = response['body']
+                    text = body['choices'][0]['message']['content']
+                    result = self.gpt.result_from_content(text, gpt_usage(body.get('usage')))
+                    self.gpt.record_call(result, batch=True)
+                    product = products.get(entry['custom_id'])
+                    if product is not None:
+                        self.gpt.store_result(self.gpt.cache_key(product), result)
+                else:
+                    error = entry.get('error') or response.get('body') or 'batch request failed'
+                    result = self.gpt.record_call(self.gpt.failed_result(error), batch=True)
+                results[entry['custom_id']] = result
+
+        return results
+
+    def _load_runs(self):
+        if not os.path.exists(self.state_path):
+            return {}
+        with open(self.state_path, encoding='utf-8') as f:
+            return json.load(f)
+
+    def _save_run(self, run_id, run):
+        runs = self._load_runs()
+        runs[run_id] = run
+
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # 중간에 중단되어도 상태 파일이 깨지지 않도록 임시 파일 후 교체
+        tmp_path = self.state_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(runs, f, ensure_ascii=False)
+        os.replace(tmp_path, self.state_path)
+
+    @staticmethod
+    def _as_dict(product):
+        to_dict = getattr(product, 'to_dict', None)
+        return to_dict() if callable(to_dict) else product
+
+if __name__ == "__main__":
+    import sys
+
+    batch = BatchAnalyzer()
+
+    # 사용법: python batch_analysis.py submit products.json | collect <run_id> | resubmit <run_id>
+    if len(sys.argv) > 2 and sys.argv[1] == 'submit':
+        with open(sys.argv[2], encoding='utf-8') as f:
+            result = batch.submit(json.load(f))
+    elif len(sys.argv) > 2 and sys.argv[1] == 'collect':
+        status = batch.poll(sys.argv[2])
+        result = batch.collect(sys.argv[2]) if status['done'] else status
+    elif len(sys.argv) > 2 and sys.argv[1] == 'resubmit':
+        result = batch.resubmit(sys.argv[2])
+    else:
+        result = {'pending_runs': batch.pending_runs()}
+
+    print(json.dumps(result, ensure_ascii=False, indent=2))
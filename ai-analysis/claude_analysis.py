@@ -7,58 +7,107 @@ Claude 구조적 분석 모듈
 """
 
 import os
+import sys
 import json
-from datetime import datetime
-from anthropic import Anthropic
-from dotenv import load_dotenv
 
-load_dotenv()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from config.clients import load_env, anthropic_client
+from analyzer_base import AnalyzerBase
+from analysis_schema import ClaudeAnalysis
+from prompts import (
+    CLAUDE_SYSTEM_PROMPT, CLAUDE_PROMPT_VERSION as PROMPT_VERSION,
+    claude_product_message, cached_system
+)
 
-class ClaudeAnalyzer:
-    def __init__(self):
-        self.client = Anthropic(api_key=os.getenv('CLAUDE_API_KEY'))
-        
+load_env()
+
+MODEL = "claude-3-sonnet-20241022"
+MAX_TOKENS = 1000
+
+# 구조화 출력용 도구 (tool_choice로 강제, 입력 = 분석 결과)
+ANALYSIS_TOOL = {
+    'name': 'record_analysis',
+    'description': '제품의 한국 시장 분석 결과를 출력 형식에 맞춰 기록합니다.',
+    'input_schema': ClaudeAnalysis.schema()
+}
+
+def usage_summary(usage):
+    """
+    Claude 응답 usage → 공통 토큰 사용량 dict (배치 결과의 dict 형태도 지원)
+    """
+    def get(name):
+        value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+        return value or 0
+    
+    if usage is None:
+        return None
+    return {
+        'input_tokens': get('input_tokens'),
+        'output_tokens': get('output_tokens'),
+        'cache_read_input_tokens': get('cache_read_input_tokens'),
+        'cache_creation_input_tokens': get('cache_creation_input_tokens')
+    }
+
+class ClaudeAnalyzer(AnalyzerBase):
+    NAME = 'claude'
+    MODEL = MODEL
+    MAX_TOKENS = MAX_TOKENS
+    PROMPT_VERSION = PROMPT_VERSION
+    
+    @property
+    def client(self):
+        return self._client or anthropic_client()
+    
     def analyze_product(self, product_data):
         """
         제품 구조적 분석
         """
-        prompt = f"""
-        다음 캐나다 제품을 한국 시장 진출 관점에서 분석해주세요:
-        
-        제품 정보: {json.dumps(product_data, ensure_ascii=False, indent=2)}
-        
-        분석 항목:
-        1. 시장성 (1-10점)
-        2. 경쟁강도 (1-10점)
-        3. 마진 예상 (%)
-        4. 진출 점수 (1-100점)
-        5. 핵심 키워드 (5개)
-        6. 타겟 고객
-        7. 리스크 요소
-        8. 추천 여부 (예/아니오)
-        
-        JSON 형태로 응답해주세요.
+        return self.analyze(product_data)
+    
+    def send(self, product_data):
+        return self.client.messages.with_raw_response.create(**self.build_params(product_data))
+    
+    def build_params(self, product_data):
+        """
+        messages.create 요청 파라미터 (배치 분석에서도 동일하게 사용)
+        - 고정 지시문은 캐시 지정된 시스템 프롬프트, 제품 정보만 사용자 메시지
+        - 분석 결과는 record_analysis 도구 입력으로 받음 (스키마 강제)
         """
+        return {
+            'model': MODEL,
+            'max_tokens': MAX_TOKENS,
+            'system': cached_system(CLAUDE_SYSTEM_PROMPT),
+            'tools': [ANALYSIS_TOOL],
+            'tool_choice': {'type': 'tool', 'name': ANALYSIS_TOOL['name']},
+            'messages': [{"role": "user", "content": claude_product_message(product_data)}]
+        }
+    
+    def result_from_message(self, message):
+        """
+        응답 메시지 → 검증된 분석 결과 (도구 입력 우선, 없으면 텍스트에서 JSON 추출)
+        """
+        usage = usage_summary(getattr(message, 'usage', None))
+        tool_input = None
+        texts = []
+        for block in message.content:
+            if block.type == 'tool_use' and block.name == ANALYSIS_TOOL['name']:
+                tool_input = block.input
+            elif block.type == 'text':
+                texts.append(block.text)
         
         try:
-            response = self.client.messages.create(
-                model="claude-3-sonnet-20241022",
-                max_tokens=1000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            
-            return {
-                'timestamp': datetime.now().isoformat(),
-                'analysis': response.content[0].text,
-                'status': 'success'
-            }
-            
-        except Exception as e:
-            return {
-                'timestamp': datetime.now().isoformat(),
-                'error': str(e),
-                'status': 'failed'
-            }
+            if tool_input is not None:
+                analysis = ClaudeAnalysis.from_dict(tool_input)
+            else:
+                analysis = ClaudeAnalysis.parse('\n'.join(texts))
+        except ValueError as e:
+            result = self.failed_result(e, usage)
+            result['raw'] = tool_input if tool_input is not None else '\n'.join(texts)
+            return result
+        
+        return self.success_result(analysis, usage)
+    
+    result_from_response = result_from_message
 
 if __name__ == "__main__":
     analyzer = ClaudeAnalyzer()
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Claude/GPT 교차 검증
+- 제품 목록 전체의 분석 결과를 배열로 모아 한 번에 계산 (제품 수천 개 단일 패스)
+- 항목별 일치도: 마진 (Claude 예상 vs 마진 엔진), 판매가 위치 (경쟁 가격대), 추천 여부, 키워드 중복
+- 일치도 + 점수 → 최종 점수 / 결론 / 신뢰도 / 다음 단계
+"""
+
+import json
+import zlib
+from datetime import datetime
+import numpy as np
+from analysis_schema import analysis_of
+
+# 항목별 일치도 가중치 (없는 항목은 제외하고 나머지로 정규화)
+AGREEMENT_WEIGHTS = {'margin': 0.35, 'price': 0.25, 'recommendation': 0.25, 'keywords': 0.15}
+# 마진 차이가 이 값(%p) 이상이면 마진 일치도 0
+MARGIN_TOLERANCE = 30
+# 마진 엔진 순마진이 이 값(%) 이상이면 '추천'으로 간주
+MIN_MARGIN_PERCENT = 15
+
+# 최종 점수 구성 가중치 (진출 점수, 순마진, 시장성)
+SCORE_WEIGHTS = {'entry': 0.5, 'margin': 0.3, 'market': 0.2}
+# 순마진 점수 상한 (이 값 이상이면 100점)
+MARGIN_FOR_FULL_SCORE = 40
+
+# 키워드 해시 버킷 수 (제품 × 버킷 불리언 행렬로 중복도 계산)
+KEYWORD_BUCKETS = 512
+
+# 최종 점수 구간별 결론 (prompts의 진출 점수 기준과 동일)
+DECISIONS = [
+    (80, '즉시 테스트 판매', ['소량 테스트 발주', '상세페이지/마케팅 문구 작성', '통관 서류 확인']),
+    (60, '현지 조사 후 진행', ['현지 매장 가격/재고 확인 (재호)', '경쟁 제품 국내 판매가 재확인']),
+    (40, '보류', ['다음 분기 재평가', '유사 제품 대안 탐색']),
+    (0, '비추천', ['후보 목록에서 제외'])
+]
+LOW_CONSISTENCY_STEP = 'Claude/GPT 분석 차이 검토 (최종 합의 전 재호 의견 요청)'
+LOW_CONSISTENCY = 0.5
+
+
+def _keyword_matrix(keyword_lists):
+    """
+    키워드 목록들 → (제품 수, KEYWORD_BUCKETS) 불리언 행렬 ('#'/공백/대소문자 무시)
+    """
+    rows, cols = [], []
+    for row, keywords in enumerate(keyword_lists):
+        for keyword in keywords:
+            token = keyword.lstrip('#').replace(' ', '').lower()
+            if token:
+                rows.append(row)
+                cols.append(zlib.crc32(token.encode('utf-8')) % KEYWORD_BUCKETS)
+
+    matrix = np.zeros((len(keyword_lists), KEYWORD_BUCKETS), dtype=bool)
+    matrix[rows, cols] = True
+    return matrix
+
+
+def _weighted_nanmean(columns, weights):
+    """
+    항목별 배열의 가중 평균 (NaN 항목은 해당 제품에서 제외), 전부 NaN이면 NaN
+    """
+    values = np.column_stack(columns)
+    weights = np.broadcast_to(np.asarray(weights, dtype=float), values.shape)
+    present = ~np.isnan(values)
+    total = np.where(present, weights, 0).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(present, values * weights, 0).sum(axis=1) / total
+
+
+class CrossValidator:
+    def collect(self, claude_results, gpt_results):
+        """
+        분석 결과 목록 → 항목별 배열 (값이 없으면 NaN / 빈 키워드)
+        """
+        count = len(claude_results)
+        fields = {name: np.full(count, np.nan) for name in (
+            'entry_score', 'market_potential', 'expected_margin', 'claude_recommended',
+            'net_margin', 'korean_price', 'competitor_min', 'competitor_max'
+        )}
+        claude_keywords = [()] * count
+        gpt_keywords = [()] * count
+
+        for index, (claude_result, gpt_result) in enumerate(zip(claude_results, gpt_results)):
+            claude = analysis_of(claude_result)
+            if claude is not None:
+                fields['entry_score'][index] = claude['entry_score']
+                fields['market_potential'][index] = claude['market_potential']
+                fields['expected_margin'][index] = claude['expected_margin_percent']
+                fields['claude_recommended'][index] = claude['recommended']
+                claude_keywords[index] = claude['keywords']
+
+            gpt = analysis_of(gpt_result)
+            if gpt is not None:
+                fields['competitor_min'][index] = gpt['competitor_price_range']['min_krw']
+                fields['competitor_max'][index] = gpt['competitor_price_range']['max_krw']
+                gpt_keywords[index] = gpt['hashtags']
+
+            margins = (gpt_result or {}).get('margins')
+            if margins:
+                fields['net_margin'][index] = margins['net_margin_percent']
+                fields['korean_price'][index] = margins['korean_price_krw']
+
+        fields['claude_keywords'] = _keyword_matrix(claude_keywords)
+        fields['gpt_keywords'] = _keyword_matrix(gpt_keywords)
+        return fields
+
+    def agreement(self, fields):
+        """
+        항목별 일치도 배열 (0-1, 비교할 값이 없으면 NaN)
+        """
+        margin = 1 - np.clip(np.abs(fields['expected_margin'] - fields['net_margin']) / MARGIN_TOLERANCE, 0, 1)
+
+        # 판매가가 경쟁 가격대 안이면 1, 벗어난 비율만큼 감소
+        low, high, price = fields['competitor_min'], fields['competitor_max'], fields['korean_price']
+        with np.errstate(invalid='ignore', divide='ignore'):
+            outside = np.maximum(low - price, 0) + np.maximum(price - high, 0)
+            price_agreement = 1 - np.clip(outside / high, 0, 1)
+
+        engine_recommended = np.where(np.isnan(fields['net_margin']), np.nan,
+                                      fields['net_margin'] >= MIN_MARGIN_PERCENT)
+        recommendation = np.where(np.isnan(fields['claude_recommended']) | np.isnan(engine_recommended), np.nan,
+                                  (fields['claude_recommended'] == engine_recommended).astype(float))
+
+        # 키워드/해시태그 Jaccard (둘 중 하나라도 비어 있으면 NaN)
+        claude_keywords, gpt_keywords = fields['claude_keywords'], fields['gpt_keywords']
+        intersection = (claude_keywords & gpt_keywords).sum(axis=1)
+        union = (claude_keywords | gpt_keywords).sum(axis=1)
+        both = claude_keywords.any(axis=1) & gpt_keywords.any(axis=1)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            keywords = np.where(both, intersection / union, np.nan)
+
+        return {'margin': margin, 'price': price_agreement, 'recommendation': recommendation, 'keywords': keywords}
+
+    def validate_many(self, claude_results, gpt_results):
+        """
+        제품별 교차 검증 결과 목록 (입력 순서대로)
+        """
+        if len(claude_results) != len(gpt_results):
+            raise ValueError('claude_results and gpt_results must have the same length')
+
+        fields = self.collect(claude_results, gpt_results)
+        agreement = self.agreement(fields)
+
+        names = list(AGREEMENT_WEIGHTS)
+        consistency = np.nan_to_num(_weighted_nanmean([agreement[name] for name in names],
+                                                      [AGREEMENT_WEIGHTS[name] for name in names]))
+        # 비교 가능한 항목 비율 (신뢰도 계산용)
+        coverage = np.column_stack([~np.isnan(agreement[name]) for name in names]).mean(axis=1)
+
+        margin_score = np.clip(fields['net_margin'] / MARGIN_FOR_FULL_SCORE, 0, 1) * 100
+        base = _weighted_nanmean(
+            [fields['entry_score'], margin_score, fields['market_potential'] * 10],
+            [SCORE_WEIGHTS['entry'], SCORE_WEIGHTS['margin'], SCORE_WEIGHTS['market']]
+        )
+        # 두 분석이 어긋날수록 최종 점수 감점 (최대 30%)
+        final_scores = np.clip(np.nan_to_num(base) * (0.7 + 0.3 * consistency), 0, 100)
+        confidence = consistency * coverage
+
+        thresholds = np.array([threshold for threshold, _, _ in DECISIONS])
+        decision_index = np.argmax(final_scores[:, None] >= thresholds[None, :], axis=1)
+
+        timestamp = datetime.now().isoformat()
+        results = []
+        for index in range(len(claude_results)):
+            _, decision, steps = DECISIONS[decision_index[index]]
+            next_steps = list(steps)
+            if consistency[index] < LOW_CONSISTENCY:
+                next_steps.insert(0, LOW_CONSISTENCY_STEP)
+
+            values = {name: float(agreement[name][index]) for name in names}
+            results.append({
+                'timestamp': timestamp,
+                'consistency_score': round(float(consistency[index]), 3),
+                'final_score': round(float(final_scores[index]), 1),
+                'agreement': {name: None if np.isnan(value) else round(value, 3) for name, value in values.items()},
+                'final_recommendation': {
+                    'decision': decision,
+                    'confidence': round(float(confidence[index]), 3),
+                    'next_steps': next_steps
+                },
+                'status': 'success'
+            })
+        return results
+
+    def validate_analysis(self, claude_result, gpt_result):
+        """
+        단일 제품 교차 검증
+        """
+        if claude_result.get('status') != 'success' or gpt_result.get('status') != 'success':
+            return {
+                'timestamp': datetime.now().isoformat(),
+                'error': 'both analyses must succeed before cross validation',
+                'status': 'failed'
+            }
+        return self.validate_many([claude_result], [gpt_result])[0]
+
+if __name__ == "__main__":
+    validator = CrossValidator()
+
+    # 테스트 데이터
+    claude_result = {
+        'status': 'success',
+        'analysis': {
+            'market_potential': 8, 'competition_level': 6, 'expected_margin_percent': 30,
+            'entry_score': 75, 'keywords': ['오메가3', '캐나다영양제', '피쉬오일', '혈행건강', '직구'],
+            'target_customers': '30-50대 건강 관심층', 'risks': ['통관 수량 제한'], 'recommended': True
+        }
+    }
+    gpt_result = {
+        'status': 'success',
+        'analysis': {
+            'competitor_price_range': {'min_krw': 35000, 'max_krw': 65000},
+            'marketing_points': ['캐나다산 야생 연어 원료'], 'hashtags': ['#오메가3', '#캐나다영양제', '#건강루틴'],
+            'description': '캐나다 야생 연어에서 온 오메가3'
+        },
+        'margins': {'korean_price_krw': 59800, 'net_margin_percent': 25.5}
+    }
+
+    result = validator.validate_analysis(claude_result, gpt_result)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Claude + GPT-4o 병렬 듀오 분석
+- 제품별 Claude/GPT 호출 동시 실행 (제품당 지연 = 둘 중 느린 쪽)
+- 여러 제품을 전역 동시 호출 수 제한 안에서 병렬 처리
+- 제품별 통합 결과 + 분석기별 소요 시간
+"""
+
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from claude_analysis import ClaudeAnalyzer
+from gpt_analysis import GPTAnalyzer
+from cross_validation import CrossValidator
+
+
+class DuoAnalyzer:
+    def __init__(self, claude=None, gpt=None, max_concurrency=8, validator=None, deduplicator=None):
+        self.claude = claude or ClaudeAnalyzer()
+        self.gpt = gpt or GPTAnalyzer()
+        self.validator = validator or CrossValidator()
+        # ProductDeduplicator 인스턴스 (None이면 중복 제거 없이 제품마다 분석)
+        self.deduplicator = deduplicator
+        # 동시에 진행되는 API 호출 수 상한 (Claude/GPT 합산)
+        self.max_concurrency = max_concurrency
+
+    def analyze_product(self, product_data, exchange_rate=1350):
+        """
+        단일 제품 듀오 분석
+        """
+        return self.analyze_many([product_data], exchange_rate=exchange_rate)[0]
+
+    def analyze_many(self, products, exchange_rate=1350):
+        """
+        여러 제품 듀오 분석 (입력 순서대로 결과 반환)
+        - deduplicator가 있으면 유사 중복 클러스터의 대표 제품만 분석하고 결과를 구성원에게 전달
+          (마진/교차 검증은 구성원 가격으로 다시 계산)
+        """
+        products = [self._as_dict(product) for product in products]
+        if self.deduplicator is not None:
+            return self.deduplicator.analyze(products, self._analyze_many, reprice=self.reprice,
+                                             exchange_rate=exchange_rate)
+        return self._analyze_many(products, exchange_rate)
+
+    def reprice(self, products, results, exchange_rate=1350):
+        """
+        다른 제품(유사 중복 대표)의 결과를 이 제품 가격 기준으로 (마진 재계산 후 교차 검증 다시)
+        - GPT 결과가 없는 결과(선별 단계 제외 등)는 그대로
+        """
+        results = list(results)
+        indices = [index for index, entry in enumerate(results) if isinstance(entry.get('gpt'), dict)]
+        if not indices:
+            return results
+
+        gpt_results = self.gpt.attach_margins([products[i] for i in indices],
+                                              [results[i]['gpt'] for i in indices], exchange_rate)
+        for index, gpt_result in zip(indices, gpt_results):
+            results[index] = dict(results[index], gpt=gpt_result)
+
+        validated = [results[i] for i in indices if results[i]['status'] == 'success']
+        validations = self.validator.validate_many([entry['claude'] for entry in validated],
+                                                   [entry['gpt'] for entry in validated])
+        for entry, validation in zip(validated, validations):
+            entry['validation'] = validation
+        return results
+
+    def _analyze_many(self, products, exchange_rate=1350):
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            started = time.perf_counter()
+
+            # 같은 제품의 두 호출이 함께 시작되도록 제품 순서대로 나란히 제출
+            pairs = [
+                (
+                    executor.submit(self._timed, self.claude.analyze_product, product),
+                    executor.submit(self._timed, self.gpt.analyze_marketing, product)
+                )
+                for product in products
+            ]
+
+            outcomes = [(claude_future.result(), gpt_future.result()) for claude_future, gpt_future in pairs]
+
+        # 마진은 GPT 결과(경쟁 제품 가격대)를 모은 뒤 로컬 엔진으로 한 번에 계산
+        gpt_results = self.gpt.attach_margins(
+            products, [gpt_outcome[0] for _, gpt_outcome in outcomes], exchange_rate
+        )
+
+        results = []
+        for product, gpt_result, (claude_outcome, gpt_outcome) in zip(products, gpt_results, outcomes):
+            claude_result, claude_seconds, claude_done = claude_outcome
+            _, gpt_seconds, gpt_done = gpt_outcome
+
+            results.append(self._combine(
+                product, claude_result, gpt_result,
+                claude_seconds, gpt_seconds,
+                max(claude_done, gpt_done) - started
+            ))
+
+        # 두 분석이 모두 성공한 제품만 한 번에 교차 검증
+        validated = [entry for entry in results if entry['status'] == 'success']
+        validations = self.validator.validate_many([entry['claude'] for entry in validated],
+                                                   [entry['gpt'] for entry in validated])
+        for entry, validation in zip(validated, validations):
+            entry['validation'] = validation
+
+        return results
+
+    def _combine(self, product, claude_result, gpt_result, claude_seconds, gpt_seconds, elapsed):
+        succeeded = [r['status'] == 'success' for r in (claude_result, gpt_result)]
+        if all(succeeded):
+            status = 'success'
+        elif any(succeeded):
+            status = 'partial'
+        else:
+            status = 'failed'
+
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'product': product,
+            'claude': claude_result,
+            'gpt': gpt_result,
+            'timings': {
+                'claude_seconds': round(claude_seconds, 3),
+                'gpt_seconds': round(gpt_seconds, 3),
+                'product_seconds': round(max(claude_seconds, gpt_seconds), 3),
+                'elapsed_seconds': round(elapsed, 3)
+            },
+            'status': status
+        }
+
+    @staticmethod
+    def _timed(func, *args):
+        """
+        (결과, 호출 소요 시간, 완료 시각)
+        """
+        start = time.perf_counter()
+        result = func(*args)
+        end = time.perf_counter()
+        return result, end - start, end
+
+    @staticmethod
+    def _as_dict(product):
+        # ProductRecord 등은 분석기 입력용 dict로 변환
+        to_dict = getattr(product, 'to_dict', None)
+        return to_dict() if callable(to_dict) else product
+
+if __name__ == "__main__":
+    duo = DuoAnalyzer()
+
+    # 테스트 데이터
+    test_products = [
+        {
+            'name': 'Canadian Omega-3 Fish Oil',
+            'price_cad': 29.99,
+            'brand': 'NaturePath',
+            'category': '건강식품'
+        },
+        {
+            'name': 'Maple Syrup Lip Balm',
+            'price_cad': 6.49,
+            'brand': 'Maple Beauty',
+            'category': '뷰티'
+        }
+    ]
+
+    results = duo.analyze_many(test_products)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+
+    # 호출 지표 (분석기 공용 METRICS)
+    print(json.dumps(duo.claude.metrics.summary(), ensure_ascii=False, indent=2))
+    duo.claude.metrics.write()
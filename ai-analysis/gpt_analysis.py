@@ -1,64 +1,123 @@
 #!/usr/bin/env python3
 """
 GPT-4o 보조 분석 모듈
-- 마진 계산
-- 마케팅 분석
-- 실용적 계산 처리
+- 경쟁 제품 가격대 / 마케팅 분석 (GPT)
+- 마진 계산 (로컬 MarginEngine, 경쟁 제품 최고가를 판매가 상한으로 사용)
 """
 
 import os
+import sys
 import json
-from datetime import datetime
-from openai import OpenAI
-from dotenv import load_dotenv
 
-load_dotenv()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from config.clients import load_env, openai_client
+from analyzer_base import AnalyzerBase
+from analysis_schema import GPTAnalysis
+from margin_engine import MarginEngine
+from prompts import GPT_SYSTEM_PROMPT, GPT_PROMPT_VERSION as PROMPT_VERSION, gpt_product_message
 
-class GPTAnalyzer:
-    def __init__(self):
-        self.client = OpenAI(api_key=os.getenv('OPENAI_API_KEY'))
+load_env()
+
+MODEL = "gpt-4o"
+MAX_TOKENS = 1000
+
+# 구조화 출력 (strict JSON Schema)
+RESPONSE_FORMAT = {
+    'type': 'json_schema',
+    'json_schema': {'name': 'margin_analysis', 'strict': True, 'schema': GPTAnalysis.schema()}
+}
+
+def usage_summary(usage):
+    """
+    OpenAI 응답 usage → 공통 토큰 사용량 dict (배치 결과의 dict 형태도 지원)
+    - OpenAI는 1024 토큰 이상 동일 접두부를 자동 캐시 (쓰기 토큰은 별도 보고 없음)
+    """
+    def get(obj, name):
+        if obj is None:
+            return None
+        return obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+    
+    if usage is None:
+        return None
+    details = get(usage, 'prompt_tokens_details')
+    return {
+        'input_tokens': get(usage, 'prompt_tokens') or 0,
+        'output_tokens': get(usage, 'completion_tokens') or 0,
+        'cache_read_input_tokens': get(details, 'cached_tokens') or 0,
+        'cache_creation_input_tokens': 0
+    }
+
+class GPTAnalyzer(AnalyzerBase):
+    NAME = 'gpt'
+    MODEL = MODEL
+    MAX_TOKENS = MAX_TOKENS
+    PROMPT_VERSION = PROMPT_VERSION
+    
+    def __init__(self, cache=None, margin_engine=None, metrics=None, client=None):
+        super().__init__(cache, metrics, client)
+        self.margin_engine = margin_engine or MarginEngine()
         
+    @property
+    def client(self):
+        return self._client or openai_client()
+    
     def calculate_margins(self, product_data, exchange_rate=1350):
         """
         마진 계산 및 마케팅 분석
         """
-        prompt = f"""
-        캐나다 제품의 한국 진출 마진 계산을 해주세요:
-        
-        제품: {json.dumps(product_data, ensure_ascii=False)}
-        환율: {exchange_rate} 원/CAD
-        
-        계산 항목:
-        1. 한국 예상 판매가 (원)
-        2. 순마진 (%)
-        3. 배송비 포함 총비용
-        4. 경쟁 제품 가격대
-        5. 마케팅 포인트 3가지
-        6. 인스타그램 해시태그 10개
-        7. 제품 설명문 (50자 이내)
-        
-        JSON 형태로 정확한 숫자와 함께 응답해주세요.
+        result = self.analyze_marketing(product_data)
+        return self.attach_margins([product_data], [result], exchange_rate)[0]
+    
+    def analyze_marketing(self, product_data):
+        """
+        경쟁 제품 가격대 및 마케팅 분석 (GPT 호출, 환율과 무관하게 캐시)
+        """
+        return self.analyze(product_data)
+    
+    def send(self, product_data):
+        return self.client.chat.completions.with_raw_response.create(**self.build_params(product_data))
+    
+    def attach_margins(self, products, results, exchange_rate=1350):
+        """
+        분석 결과 목록에 로컬 마진 계산 결과 추가 ('margins', 제품 전체를 한 번에 계산)
+        - 경쟁 제품 최고가가 있으면 판매가 상한으로 사용
+        """
+        price_caps = [
+            result['analysis']['competitor_price_range']['max_krw'] if result['status'] == 'success' else None
+            for result in results
+        ]
+        margins = self.margin_engine.calculate_records(products, exchange_rate, price_caps)
+        return [dict(result, margins=margin) for result, margin in zip(results, margins)]
+    
+    def build_params(self, product_data):
+        """
+        chat.completions.create 요청 파라미터 (배치 분석에서도 동일하게 사용)
+        - 고정 지시문을 시스템 메시지로 앞에 두어 자동 프롬프트 캐시 적중
+        """
+        return {
+            'model': MODEL,
+            'messages': [
+                {"role": "system", "content": GPT_SYSTEM_PROMPT},
+                {"role": "user", "content": gpt_product_message(product_data)}
+            ],
+            'response_format': RESPONSE_FORMAT,
+            'max_tokens': MAX_TOKENS
+        }
+    
+    def result_from_response(self, response):
+        return self.result_from_content(response.choices[0].message.content, usage_summary(response.usage))
+    
+    def result_from_content(self, content, usage=None):
+        """
+        응답 본문 → 검증된 분석 결과 (구조화 출력이 아니어도 JSON 추출 시도)
         """
-        
         try:
-            response = self.client.chat.completions.create(
-                model="gpt-4o",
-                messages=[{"role": "user", "content": prompt}],
-                max_tokens=1000
-            )
-            
-            return {
-                'timestamp': datetime.now().isoformat(),
-                'analysis': response.choices[0].message.content,
-                'status': 'success'
-            }
-            
-        except Exception as e:
-            return {
-                'timestamp': datetime.now().isoformat(),
-                'error': str(e),
-                'status': 'failed'
-            }
+            analysis = GPTAnalysis.parse(content)
+        except ValueError as e:
+            result = self.failed_result(e, usage)
+            result['raw'] = content
+            return result
+        return self.success_result(analysis, usage)
 
 if __name__ == "__main__":
     analyzer = GPTAnalyzer()
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+마진 계산 엔진 (LLM 없이 로컬 계산)
+- 제품 목록 전체를 NumPy 배열로 한 번에 계산 (수천 개 제품 수 ms)
+- 배송비 구간, 관부가세, 결제/오픈마켓 수수료, 판매가, 순마진
+- 비용 기준표는 설정 가능, 기준이 바뀌면 같은 입력으로 즉시 재계산
+"""
+
+import os
+import sys
+import json
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data-collection'))
+from product_record import ProductRecord
+
+# 기본 비용 기준표 (이전 GPT 마진 계산 프롬프트의 기준과 동일)
+DEFAULT_COST_TABLE = {
+    # 국제 배송비: 중량(kg) 구간 상한 → 건당 배송비(원), 마지막 구간 초과 시 마지막 요금
+    'shipping_weight_tiers_kg': [0.5, 1.0, 2.0, 5.0],
+    'shipping_fees_krw': [8000, 12000, 15000, 22000],
+    # 중량 정보가 없을 때 카테고리별 추정 중량(kg)
+    'category_weights_kg': {'건강식품': 0.4, '뷰티': 0.3, '펫용품': 2.5},
+    'default_weight_kg': 0.8,
+    # 관부가세: 미화 기준 면세 한도 초과 시 (제품가 + 배송비)에 관세, 관세 포함 금액에 부가세
+    'duty_free_limit_usd': 150,
+    'duty_rate': 0.08,
+    'vat_rate': 0.10,
+    'usd_per_cad': 0.73,
+    # 수수료
+    'payment_fee_rate': 0.035,
+    'platform_fee_rate': 0.12,
+    # 판매가: 총비용 × (1 + 목표 마크업), 100원 단위 반올림, 경쟁 제품 최고가 상한
+    'target_markup': 0.6,
+    'price_rounding_krw': 100
+}
+
+
+class MarginEngine:
+    def __init__(self, cost_table=None, exchange_rate=1350):
+        self.cost_table = dict(DEFAULT_COST_TABLE, **(cost_table or {}))
+        # 원/CAD
+        self.exchange_rate = exchange_rate
+
+    def with_costs(self, **overrides):
+        """
+        기준표 일부를 바꾼 새 엔진 (가정 변경 후 재계산용)
+        """
+        return MarginEngine(dict(self.cost_table, **overrides), self.exchange_rate)
+
+    def prepare(self, products):
+        """
+        제품 목록 → 계산 입력 배열 (원래 통화 가격, 통화, 중량 kg, 카테고리)
+        - 가격 파싱은 여기서 한 번만, 통화 변환/추정 중량은 calculate()에서 그때의 환율·기준표로
+          (환율이나 기준표가 바뀌어도 prepare() 결과를 그대로 재사용)
+        - 가격은 ProductRecord.from_dict와 같은 우선순위 (price_cents + currency → price_cad → price + currency)
+        - 중량이 없으면 NaN (calculate()에서 카테고리 추정 중량)
+        """
+        amounts = np.full(len(products), np.nan)
+        currencies = np.full(len(products), 'CAD', dtype=object)
+        weights = np.full(len(products), np.nan)
+        categories = np.full(len(products), '', dtype=object)
+
+        for index, product in enumerate(products):
+            to_dict = getattr(product, 'to_dict', None)
+            product = to_dict() if callable(to_dict) else product
+
+            record = ProductRecord.from_dict(product)
+            if record.price_cents is not None:
+                amounts[index] = record.price_cents / 100
+                currencies[index] = record.currency or 'CAD'
+
+            weight = product.get('weight_kg')
+            if weight is not None:
+                weights[index] = weight
+            categories[index] = product.get('category') or ''
+
+        return {'amount': amounts, 'currency': currencies, 'weight_kg': weights, 'category': categories}
+
+    def to_cad(self, inputs, exchange_rate=None):
+        """
+        prepare() 결과 → CAD 가격 배열 (USD는 기준표 usd_per_cad, KRW는 환율로 변환)
+        """
+        rate = exchange_rate or self.exchange_rate
+        amount, currency = inputs['amount'], inputs['currency']
+        return np.where(currency == 'USD', amount / self.cost_table['usd_per_cad'],
+                        np.where(currency == 'KRW', amount / rate, amount))
+
+    def weights(self, inputs):
+        """
+        prepare() 결과 → 중량 배열 (중량이 없는 제품은 기준표의 카테고리 추정 중량)
+        """
+        table = self.cost_table
+        weights = inputs['weight_kg'].copy()
+        missing = np.isnan(weights)
+        weights[missing] = [table['category_weights_kg'].get(category, table['default_weight_kg'])
+                            for category in inputs['category'][missing]]
+        return weights
+
+    def calculate(self, products, exchange_rate=None, price_caps=None):
+        """
+        제품 목록 마진 일괄 계산 → 항목별 NumPy 배열
+        - products: 제품 dict/ProductRecord 목록 또는 prepare() 결과
+        - exchange_rate: 원/CAD (없으면 엔진 환율), KRW 가격 제품의 CAD 변환에도 같은 환율 사용
+        - price_caps: 제품별 경쟁 제품 최고가(원), 없으면 NaN/None (0 이하는 무시)
+        - 가격을 알 수 없는 제품은 모든 값이 NaN
+        """
+        table = self.cost_table
+        rate = exchange_rate or self.exchange_rate
+        inputs = products if isinstance(products, dict) else self.prepare(products)
+        price_cad = self.to_cad(inputs, rate)
+
+        goods_krw = price_cad * rate
+        tier = np.searchsorted(table['shipping_weight_tiers_kg'], self.weights(inputs))
+        fees = np.asarray(table['shipping_fees_krw'], dtype=float)
+        shipping_krw = fees[np.minimum(tier, len(fees) - 1)]
+
+        taxable = price_cad * table['usd_per_cad'] > table['duty_free_limit_usd']
+        duty_krw = np.where(taxable, (goods_krw + shipping_krw) * table['duty_rate'], 0.0)
+        vat_krw = np.where(taxable, (goods_krw + shipping_krw + duty_krw) * table['vat_rate'], 0.0)
+        payment_fee_krw = goods_krw * table['payment_fee_rate']
+        total_cost_krw = goods_krw + shipping_krw + duty_krw + vat_krw + payment_fee_krw
+
+        step = table['price_rounding_krw']
+        price_krw = np.round(total_cost_krw * (1 + table['target_markup']) / step) * step
+        if price_caps is not None:
+            caps = np.array([np.nan if cap is None else cap for cap in price_caps], dtype=float)
+            # 경쟁 제품 가격 0원 등은 상한으로 쓰면 판매가 0 → 마진 NaN
+            caps[~(caps > 0)] = np.nan
+            price_krw = np.where(np.isnan(caps), price_krw, np.minimum(price_krw, caps))
+
+        platform_fee_krw = price_krw * table['platform_fee_rate']
+        net_profit_krw = price_krw - total_cost_krw - platform_fee_krw
+        with np.errstate(divide='ignore', invalid='ignore'):
+            net_margin_percent = np.where(price_krw > 0, net_profit_krw / price_krw * 100, np.nan)
+
+        return {
+            'goods_krw': goods_krw,
+            'shipping_krw': shipping_krw,
+            'duty_krw': duty_krw,
+            'vat_krw': vat_krw,
+            'payment_fee_krw': payment_fee_krw,
+            'total_cost_krw': total_cost_krw,
+            'korean_price_krw': price_krw,
+            'platform_fee_krw': platform_fee_krw,
+            'net_profit_krw': net_profit_krw,
+            'net_margin_percent': net_margin_percent
+        }
+
+    def calculate_records(self, products, exchange_rate=None, price_caps=None):
+        """
+        calculate() 결과를 제품별 dict 목록으로 (원 단위 정수, 마진은 소수점 첫째 자리)
+        - 가격을 알 수 없는 제품은 None
+        """
+        margins = self.calculate(products, exchange_rate, price_caps)
+        names = list(margins)
+        rows = np.column_stack([margins[name] for name in names])
+
+        # 행 단위 변환도 배열로 처리 (제품 수천 개에서 파이썬 루프 최소화)
+        valid = ~np.isnan(rows).any(axis=1)
+        amounts = np.rint(np.where(valid[:, None], rows, 0)).astype(np.int64).tolist()
+        net_margins = np.round(margins['net_margin_percent'], 1).tolist()
+
+        return [
+            dict(zip(names, row), net_margin_percent=net_margin) if ok else None
+            for ok, row, net_margin in zip(valid.tolist(), amounts, net_margins)
+        ]
+
+if __name__ == "__main__":
+    engine = MarginEngine()
+
+    # 테스트 데이터
+    test_products = [
+        {'name': 'Canadian Omega-3 Fish Oil', 'price_cad': 29.99, 'category': '건강식품'},
+        {'name': 'Maple Syrup Lip Balm', 'price_cad': 6.49, 'category': '뷰티'},
+        {'name': 'Wild Salmon Dog Food', 'price_cad': 219.99, 'category': '펫용품'}
+    ]
+
+    print(json.dumps(engine.calculate_records(test_products), ensure_ascii=False, indent=2))
@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Claude 묶음 분석 (여러 제품을 한 요청으로)
+- N개 제품을 고유 id와 함께 한 프롬프트에 담아 도구 입력(JSON 배열)으로 응답 요청
+- 응답을 검증해 제품별로 분리, 누락/형식 오류 제품만 재요청
+- 결과는 묶음 전용 프롬프트 버전으로 캐시 (단건 분석 캐시와 분리)
+- 제품별 결과에 묶음 응답 사용량을 나눈 몫(usage)과 모델/예상 비용 기록
+- 제품당 입력 토큰 절감량 측정 (N 조정용, 단건 요청 입력 토큰은 count_tokens API 보고값)
+"""
+
+import json
+import time
+from claude_analysis import ClaudeAnalyzer, MODEL, MAX_TOKENS, usage_summary
+from analysis_cache import AnalysisCache
+from analysis_metrics import estimate_cost
+from analysis_schema import ClaudeAnalysis, extract_json_array
+from prompts import CLAUDE_SYSTEM_PROMPT, PACKED_PROMPT_VERSION, packed_products_message, cached_system
+
+# 묶음 요청 최대 출력 토큰
+PACKED_MAX_TOKENS = 8192
+# 캐시/지표의 분석기 이름 (단건 분석 'claude'와 구분)
+PACKED_ANALYZER = 'claude_packed'
+
+# 구조화 출력용 도구 (tool_choice로 강제, 입력 = 제품별 분석 결과 배열)
+PACKED_TOOL = {
+    'name': 'record_analyses',
+    'description': '여러 제품의 한국 시장 분석 결과를 제품 id별로 기록합니다.',
+    'input_schema': {
+        'type': 'object',
+        'properties': {
+            'analyses': {
+                'type': 'array',
+                'items': {
+                    'type': 'object',
+                    'properties': {'id': {'type': 'string'}, 'analysis': ClaudeAnalysis.schema()},
+                    'required': ['id', 'analysis'],
+                    'additionalProperties': False
+                }
+            }
+        },
+        'required': ['analyses']
+    }
+}
+
+
+def split_usage(usage, parts):
+    """
+    묶음 응답 usage → 제품별 몫 목록 (토큰 수 합계가 원래 값과 같도록 나머지는 앞 제품부터 1씩)
+    """
+    shares = [{} for _ in range(parts)]
+    for name, value in (usage or {}).items():
+        base, remainder = divmod(value, parts)
+        for index, share in enumerate(shares):
+            share[name] = base + (1 if index < remainder else 0)
+    return shares
+
+
+class PackedAnalyzer:
+    def __init__(self, claude=None, pack_size=10, max_retries=2, measure_savings=True):
+        self.claude = claude or ClaudeAnalyzer()
+        self.pack_size = pack_size
+        self.max_retries = max_retries
+        # True면 묶음마다 제품별 단건 요청 입력 토큰을 count_tokens로 조회 (절감량 측정용)
+        self.measure_savings = measure_savings
+        if self.claude.cache is not None:
+            self.claude.cache.invalidate_stale(PACKED_ANALYZER, PACKED_PROMPT_VERSION)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.token_stats = {
+            'requests': 0,
+            'products': 0,
+            'retried_products': 0,
+            'input_tokens': 0,
+            'output_tokens': 0,
+            'cache_read_input_tokens': 0,
+            # 절감량 측정에 성공한 묶음만 (묶음 입력 토큰 / 같은 제품의 단건 요청 입력 토큰)
+            'measured_products': 0,
+            'measured_input_tokens': 0,
+            'single_input_tokens': 0
+        }
+
+    def analyze_many(self, products):
+        """
+        제품 목록 묶음 분석 (입력 순서대로 analyze_product와 같은 형태의 결과 반환)
+        """
+        products = [self._as_dict(product) for product in products]
+        ids = [f"p{index}" for index in range(len(products))]
+        by_id = dict(zip(ids, products))
+        results = {}
+
+        # 캐시에 있는 제품은 요청에서 제외 (묶음 결과 → 단건 결과 순서로 조회)
+        pending = []
+        for product_id, product in by_id.items():
+            cached = self.claude.cached_result(self.cache_key(product))
+            if cached is None:
+                cached = self.claude.cached_result(self.claude.cache_key(product))
+            if cached is not None:
+                self.claude.metrics.record('claude', MODEL, cached=True)
+                results[product_id] = cached
+            else:
+                pending.append(product_id)
+
+        attempt = 0
+        while pending and attempt <= self.max_retries:
+            if attempt > 0:
+                self.token_stats['retried_products'] += len(pending)
+
+            failed = []
+            for start in range(0, len(pending), self.pack_size):
+                pack = pending[start:start + self.pack_size]
+                pack_results = self._analyze_pack(pack, by_id)
+
+                for product_id in pack:
+                    if product_id in pack_results:
+                        results[product_id] = pack_results[product_id]
+                    else:
+                        failed.append(product_id)
+
+            pending = failed
+            attempt += 1
+
+        for product_id in pending:
+            results[product_id] = self.claude.failed_result('missing or malformed in packed response')
+
+        return [results[product_id] for product_id in ids]
+
+    def _analyze_pack(self, pack, by_id):
+        """
+        한 묶음 요청 → {id: 결과} (검증 통과한 제품만)
+        """
+        packed_products = [{'id': product_id, 'product': by_id[product_id]} for product_id in pack]
+        prompt = packed_products_message(packed_products)
+
+        started = time.perf_counter()
+        try:
+            # 단건 분석과 같은 캐시 지정 시스템 프롬프트 사용
+            raw = self.claude.client.messages.with_raw_response.create(
+                model=MODEL,
+                max_tokens=min(PACKED_MAX_TOKENS, MAX_TOKENS * len(pack)),
+                system=cached_system(CLAUDE_SYSTEM_PROMPT),
+                tools=[PACKED_TOOL],
+                tool_choice={'type': 'tool', 'name': PACKED_TOOL['name']},
+                messages=[{"role": "user", "content": prompt}]
+            )
+            response = raw.parse()
+        except Exception:
+            self.claude.metrics.record('claude', MODEL, latency=time.perf_counter() - started,
+                                       status='failed', products=0)
+            return {}
+        latency = time.perf_counter() - started
+        retries = getattr(raw, 'retries_taken', 0)
+
+        usage = usage_summary(getattr(response, 'usage', None))
+        self._record_usage(usage, [by_id[product_id] for product_id in pack])
+
+        try:
+            items = self._response_items(response)
+        except Exception:
+            # 빈 응답/예상 밖 블록 → 묶음 전체 실패 (제품은 재요청 대상)
+            items = []
+        expected = set(pack)
+        analyses = {}
+
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            product_id = item.get('id')
+            if product_id not in expected or product_id in analyses:
+                continue
+            try:
+                analyses[product_id] = ClaudeAnalysis.from_dict(item.get('analysis'))
+            except ValueError:
+                continue
+
+        # 묶음 사용량은 요청한 제품 수로 나눔 (검증에 실패한 제품 몫은 재요청 비용에 포함되지 않음)
+        shares = dict(zip(pack, split_usage(usage, len(pack)))) if usage else {}
+        results = {}
+        for product_id, analysis in analyses.items():
+            result = self.claude.success_result(analysis, shares.get(product_id))
+            result['packed'] = True
+            result['pack_size'] = len(pack)
+            result['model'] = MODEL
+            result['latency_seconds'] = round(latency, 3)
+            result['retries'] = retries
+            result['cost_usd'] = round(estimate_cost(MODEL, result.get('usage')), 6)
+            results[product_id] = self.store_result(self.cache_key(by_id[product_id]), result)
+
+        # 묶음 요청 1회 = 호출 1회, 제품 수는 검증 통과한 제품만
+        self.claude.metrics.record('claude', MODEL, usage, latency, retries,
+                                   'success' if results else 'failed', products=len(results))
+        return results
+
+    @staticmethod
+    def _response_items(response):
+        """
+        응답 → 제품별 항목 목록 (도구 입력 우선, 없으면 텍스트에서 JSON 배열 추출)
+        """
+        texts = []
+        for block in response.content:
+            if block.type == 'tool_use' and block.name == PACKED_TOOL['name']:
+                return block.input.get('analyses') or []
+            if block.type == 'text':
+                texts.append(block.text)
+        return extract_json_array('\n'.join(texts)) or []
+
+    def cache_key(self, product_data):
+        if self.claude.cache is None:
+            return None
+        return AnalysisCache.make_key(PACKED_ANALYZER, MODEL, PACKED_PROMPT_VERSION, product_data,
+                                      {'max_tokens': MAX_TOKENS})
+
+    def store_result(self, cache_key, result):
+        if cache_key is not None and result['status'] == 'success':
+            self.claude.cache.set(cache_key, result, PACKED_ANALYZER, MODEL, PACKED_PROMPT_VERSION)
+        return result
+
+    def _record_usage(self, usage, products):
+        """
+        묶음 요청 토큰 사용량 누적, measure_savings면 같은 제품의 단건 요청 입력 토큰도 누적
+        - 입력 토큰은 프롬프트 캐시 읽기/쓰기 토큰 포함 (count_tokens 보고값과 같은 기준)
+        """
+        usage = usage or {}
+        input_tokens = (usage.get('input_tokens', 0) + usage.get('cache_read_input_tokens', 0)
+                        + usage.get('cache_creation_input_tokens', 0))
+
+        self.token_stats['requests'] += 1
+        self.token_stats['products'] += len(products)
+        self.token_stats['input_tokens'] += input_tokens
+        self.token_stats['output_tokens'] += usage.get('output_tokens', 0)
+        self.token_stats['cache_read_input_tokens'] += usage.get('cache_read_input_tokens', 0)
+
+        if not self.measure_savings or not usage:
+            return
+        try:
+            single_tokens = sum(self._count_single_tokens(product) for product in products)
+        except Exception:
+            # 측정 실패는 분석 결과와 무관 (이 묶음은 절감량 집계에서 제외)
+            return
+        self.token_stats['measured_products'] += len(products)
+        self.token_stats['measured_input_tokens'] += input_tokens
+        self.token_stats['single_input_tokens'] += single_tokens
+
+    def _count_single_tokens(self, product):
+        """
+        단건 분석 요청(ClaudeAnalyzer.build_params)의 입력 토큰 (API 보고값)
+        """
+        params = self.claude.build_params(product)
+        params.pop('max_tokens', None)
+        return self.claude.client.messages.count_tokens(**params).input_tokens
+
+    def stats(self):
+        """
+        제품당 입력 토큰 및 절감량 (절감량은 측정에 성공한 묶음 기준)
+        """
+        stats = dict(self.token_stats)
+        if stats['products']:
+            stats['input_tokens_per_product'] = round(stats['input_tokens'] / stats['products'], 1)
+        measured = stats['measured_products']
+        if measured:
+            per_product = stats['measured_input_tokens'] / measured
+            single = stats['single_input_tokens'] / measured
+            stats['single_input_tokens_per_product'] = round(single, 1)
+            stats['tokens_saved_per_product'] = round(single - per_product, 1)
+        return stats
+
+    @staticmethod
+    def _as_dict(product):
+        to_dict = getattr(product, 'to_dict', None)
+        return to_dict() if callable(to_dict) else product
+
+if __name__ == "__main__":
+    packed = PackedAnalyzer(pack_size=5)
+
+    # 테스트 데이터
+    test_products = [
+        {'name': 'Canadian Omega-3 Fish Oil', 'price_cad': 29.99, 'brand': 'NaturePath', 'category': '건강식품'},
+        {'name': 'Maple Syrup Lip Balm', 'price_cad': 6.49, 'brand': 'Maple Beauty', 'category': '뷰티'},
+        {'name': 'Wild Salmon Dog Treats', 'price_cad': 14.99, 'brand': 'Northern Pet', 'category': '펫용품'}
+    ]
+
+    results = packed.analyze_many(test_products)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    print(json.dumps(packed.stats(), ensure_ascii=False, indent=2))
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+AI 분석 프롬프트
+- 고정 접두부 (지시문, 채점 기준, 출력 형식): 시스템 프롬프트로 보내 제공자 측 프롬프트 캐시 적중
+- 제품별 접미부 (제품 JSON): 사용자 메시지
+- 접두부는 제공자의 최소 캐시 길이(약 1024 토큰) 이상을 유지해야 캐시가 동작함
+"""
+
+import json
+import hashlib
+from analysis_schema import ClaudeAnalysis, GPTAnalysis, ScreeningAnalysis
+
+CLAUDE_SYSTEM_PROMPT = """당신은 캐나다 제품을 한국 시장에 소싱하는 팀의 구조적 분석 담당입니다.
+사용자가 캐나다 제품 정보(JSON)를 보내면 한국 시장 진출 관점에서 아래 항목을 분석합니다.
+제품 정보에 없는 내용은 추측임을 감안해 보수적으로 평가하고, 과장된 표현은 쓰지 않습니다.
+
+[분석 항목]
+1. 시장성 (1-10점)
+2. 경쟁강도 (1-10점)
+3. 마진 예상 (%)
+4. 진출 점수 (1-100점)
+5. 핵심 키워드 (5개)
+6. 타겟 고객
+7. 리스크 요소
+8. 추천 여부 (예/아니오)
+
+[채점 기준]
+시장성 (market_potential, 1-10점)
+- 9-10점: 한국에서 이미 수요가 확인된 카테고리(건강기능식품, 펫 영양제, 클린 뷰티 등)이며 '캐나다산' 자체가 구매 이유가 되는 제품
+- 7-8점: 수요는 뚜렷하지만 유사 제품이 많아 브랜드/원료 스토리로 차별화가 필요한 제품
+- 4-6점: 수요가 일부 연령대나 관심층에 한정되거나 계절성이 강한 제품
+- 1-3점: 한국 소비자에게 생소하거나 사용 문화가 맞지 않는 제품
+
+경쟁강도 (competition_level, 1-10점, 높을수록 경쟁이 치열함)
+- 9-10점: 쿠팡/스마트스토어에 동일·유사 제품이 다수이며 최저가 경쟁이 심함
+- 6-8점: 해외직구 판매자가 여럿 있으나 가격대나 구성으로 차별화 여지가 있음
+- 3-5점: 유사 제품은 있으나 해당 브랜드/원료 조합은 드묾
+- 1-2점: 국내 판매처가 거의 없음
+
+마진 예상 (expected_margin_percent, %)
+- 캐나다 판매가, 국제 배송비(소형 건강식품 기준 건당 약 8,000-15,000원), 관부가세(미화 150달러 초과 시), 오픈마켓 수수료(약 10-15%)를 고려한 순마진 추정치
+- 근거가 부족하면 보수적으로 낮게 추정
+
+진출 점수 (entry_score, 1-100점)
+- 시장성 40%, 경쟁 여유(10 - 경쟁강도) 25%, 마진 25%, 통관/인증 리스크 10%를 반영한 종합 점수
+- 80점 이상: 즉시 테스트 판매 추천
+- 60-79점: 현지 조사 후 진행
+- 40-59점: 보류
+- 39점 이하: 비추천
+
+핵심 키워드 (keywords)
+- 한국 소비자가 실제로 검색할 만한 한국어 키워드 5개 (브랜드명 단독 키워드는 1개 이하)
+
+타겟 고객 (target_customers)
+- 연령대, 성별, 라이프스타일, 구매 동기를 한 문장으로
+
+리스크 요소 (risks)
+- 통관 제한 성분(멜라토닌, 일부 허브 등), 식약처 기준, 유통기한, 파손/변질, 상표권, 가격 변동 등 구체적인 항목
+
+추천 여부 (recommended)
+- 진출 점수 70점 이상이고 치명적 리스크가 없으면 true, 그 외에는 false
+
+[출력 형식]
+반드시 아래 형태의 JSON 객체 하나로만 응답합니다. 앞뒤 설명 문장이나 코드 블록 표시는 붙이지 않습니다.
+{
+  "market_potential": 1-10 정수,
+  "competition_level": 1-10 정수,
+  "expected_margin_percent": 숫자,
+  "entry_score": 1-100 정수,
+  "keywords": ["키워드1", "키워드2", "키워드3", "키워드4", "키워드5"],
+  "target_customers": "문자열",
+  "risks": ["리스크1", "리스크2"],
+  "recommended": true 또는 false
+}"""
+
+GPT_SYSTEM_PROMPT = """당신은 캐나다 제품을 한국 시장에 소싱하는 팀의 시장 조사 및 마케팅 담당입니다.
+사용자가 캐나다 제품 정보(JSON)를 보내면 한국 판매 기준으로 아래 항목을 조사하고 작성합니다.
+판매가, 총비용, 순마진 등 금액 계산은 팀의 마진 계산 엔진이 따로 처리하므로 직접 계산하지 않습니다.
+
+[작성 항목]
+1. 경쟁 제품 가격대
+2. 마케팅 포인트 3가지
+3. 인스타그램 해시태그 10개
+4. 제품 설명문 (50자 이내)
+
+[작성 기준]
+경쟁 제품 가격대 (competitor_price_range)
+- 쿠팡/스마트스토어에서 판매 중인 같은 브랜드 또는 같은 원료·용량의 유사 제품 최저가와 최고가 (원 단위 정수)
+- 해외직구(구매대행) 상품과 국내 정식 수입품이 섞여 있으면 둘 다 포함한 범위
+- 묶음 상품은 1개 기준으로 환산하고, 용량이 다르면 가장 가까운 용량 기준으로 판단
+- 유사 제품을 찾기 어려우면 같은 카테고리 대표 제품의 가격대를 보수적으로 추정
+- 이 범위의 최고가는 마진 계산 엔진에서 판매가 상한으로 사용되므로 과대 추정하지 않음
+
+마케팅 포인트 (marketing_points)
+- 캐나다 현지 감성, 원료/인증, 가격 대비 가치 중심으로 3가지, 각 한 문장
+- 첫 번째 포인트는 한국 소비자가 이 제품을 사야 하는 가장 큰 이유
+- 원료 원산지, 캐나다 보건부 NPN 번호, 유기농/비건/크루얼티프리 인증 등 확인 가능한 사실 위주
+- 경쟁 제품과 비교해 차별화되는 점을 최소 한 가지 포함
+- 효능을 단정하거나 질병 예방·치료를 암시하는 표현 금지 (건강기능식품 광고 심의 기준)
+
+인스타그램 해시태그 (hashtags)
+- '#' 포함 한국어 위주 10개, 브랜드 해시태그 1개 이하, 중복 없이
+- 카테고리 일반 태그(예: #영양제추천), 사용 상황 태그(예: #출근길루틴), 캐나다 관련 태그(예: #캐나다직구)를 고루 섞음
+- 띄어쓰기 없이 작성하고 영어 태그는 3개 이하
+
+제품 설명문 (description)
+- 상세페이지 첫 줄에 들어갈 50자 이내 한국어 문장, 효능을 단정하는 표현(치료, 완치 등) 금지
+- 제품명을 그대로 반복하지 말고 핵심 가치 한 가지를 전달
+
+[출력 형식]
+반드시 아래 형태의 JSON 객체 하나로만 응답합니다. 앞뒤 설명 문장이나 코드 블록 표시는 붙이지 않습니다.
+{
+  "competitor_price_range": {"min_krw": 정수, "max_krw": 정수},
+  "marketing_points": ["포인트1", "포인트2", "포인트3"],
+  "hashtags": ["#해시태그1", "...", "#해시태그10"],
+  "description": "50자 이내 문자열"
+}"""
+
+# 1차 선별용 (저가 모델, 짧은 프롬프트라 캐시 최소 길이 미만)
+SCREENING_SYSTEM_PROMPT = """당신은 캐나다 제품의 한국 시장 진출 가능성을 빠르게 선별하는 담당입니다.
+제품 정보(JSON)만 보고 진출 점수(entry_score, 1-100점)와 한 문장 근거(reason)를 매깁니다.
+시장성 40%, 경쟁 여유 25%, 마진 25%, 통관/인증 리스크 10%를 반영하되, 판단 근거가 부족하면 50점 전후로 둡니다.
+통관 금지 성분, 한국에서 수요가 거의 없는 제품, 부피/중량 대비 저가 제품은 40점 이하로 매깁니다.
+결과는 record_screening 도구로만 제출합니다."""
+
+SCREENING_PRODUCT_TEMPLATE = "제품 정보: {product_json}"
+
+CLAUDE_PRODUCT_TEMPLATE = "제품 정보: {product_json}"
+
+GPT_PRODUCT_TEMPLATE = "제품: {product_json}"
+
+PACKED_PRODUCTS_TEMPLATE = """다음 캐나다 제품 {count}개를 각각 분석해주세요. 각 제품은 고유 id로 구분됩니다.
+
+제품 목록: {products_json}
+
+이번 요청에 한해 결과는 record_analyses 도구의 analyses 배열로 기록해주세요.
+배열의 각 원소는 {{"id": "<제품 id>", "analysis": <출력 형식의 JSON 객체>}} 형태이며,
+모든 id에 대해 정확히 하나씩 포함해야 합니다."""
+
+
+def prompt_version(*templates):
+    """
+    프롬프트 템플릿/출력 스키마 내용 해시 (수정 시 자동으로 바뀜)
+    - 템플릿 사이 구분자를 넣어 경계만 옮긴 경우('ab', 'c' / 'a', 'bc')도 다른 버전
+    """
+    digest = hashlib.sha256()
+    for template in templates:
+        if not isinstance(template, str):
+            template = json.dumps(template, sort_keys=True, ensure_ascii=False)
+        digest.update(template.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()[:12]
+
+
+CLAUDE_PROMPT_VERSION = prompt_version(CLAUDE_SYSTEM_PROMPT, CLAUDE_PRODUCT_TEMPLATE, ClaudeAnalysis.schema())
+GPT_PROMPT_VERSION = prompt_version(GPT_SYSTEM_PROMPT, GPT_PRODUCT_TEMPLATE, GPTAnalysis.schema())
+SCREENING_PROMPT_VERSION = prompt_version(SCREENING_SYSTEM_PROMPT, SCREENING_PRODUCT_TEMPLATE,
+                                          ScreeningAnalysis.schema())
+# 묶음 분석은 프롬프트가 달라 단건 분석과 캐시를 따로 관리
+PACKED_PROMPT_VERSION = prompt_version(CLAUDE_SYSTEM_PROMPT, PACKED_PRODUCTS_TEMPLATE, ClaudeAnalysis.schema())
+
+
+def claude_product_message(product_data):
+    return CLAUDE_PRODUCT_TEMPLATE.format(
+        product_json=json.dumps(product_data, ensure_ascii=False, indent=2)
+    )
+
+
+def screening_product_message(product_data):
+    return SCREENING_PRODUCT_TEMPLATE.format(
+        product_json=json.dumps(product_data, ensure_ascii=False)
+    )
+
+
+def gpt_product_message(product_data):
+    return GPT_PRODUCT_TEMPLATE.format(
+        product_json=json.dumps(product_data, ensure_ascii=False)
+    )
+
+
+def packed_products_message(packed_products):
+    """
+    [{'id': ..., 'product': {...}}, ...] → 묶음 분석 사용자 메시지
+    """
+    return PACKED_PRODUCTS_TEMPLATE.format(
+        count=len(packed_products),
+        products_json=json.dumps(packed_products, ensure_ascii=False)
+    )
+
+
+def cached_system(text):
+    """
+    Claude 시스템 프롬프트 블록 (프롬프트 캐시 지정)
+    """
+    return [{'type': 'text', 'text': text, 'cache_control': {'type': 'ephemeral'}}]
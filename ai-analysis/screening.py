@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+단계별 선별 분석 (비싼 듀오 분석 전 1차 선별)
+- 1단계: 로컬 휴리스틱 (카테고리 수요, 비용 구조, 평점/리뷰 수) → 제품 전체를 NumPy로 한 번에
+- 2단계: 저가 모델(Claude Haiku) 진출 점수
+- 3단계: 진출 점수 기준 이상만 DuoAnalyzer 전체 분석
+- 제품별로 어느 단계에서 결정되었는지 기록 ('tier')
+"""
+
+import os
+import sys
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from config.clients import anthropic_client
+from analyzer_base import AnalyzerBase
+from analysis_schema import ScreeningAnalysis
+from claude_analysis import usage_summary
+from duo_analysis import DuoAnalyzer
+from margin_engine import MarginEngine
+from prompts import SCREENING_SYSTEM_PROMPT, SCREENING_PROMPT_VERSION as PROMPT_VERSION, screening_product_message
+
+SCREENING_MODEL = "claude-3-haiku-20240307"
+SCREENING_MAX_TOKENS = 200
+
+SCREENING_TOOL = {
+    'name': 'record_screening',
+    'description': '제품의 1차 선별 진출 점수와 근거를 기록합니다.',
+    'input_schema': ScreeningAnalysis.schema()
+}
+
+# 카테고리별 한국 수요 추정 (0-1, 없는 카테고리는 기본값)
+CATEGORY_DEMAND = {'건강식품': 0.9, '뷰티': 0.8, '펫용품': 0.8}
+DEFAULT_DEMAND = 0.5
+
+# 휴리스틱 점수 가중치 (합계 1)
+HEURISTIC_WEIGHTS = {'demand': 0.40, 'cost': 0.35, 'rating': 0.15, 'reviews': 0.10}
+
+
+def heuristic_scores(products, margin_engine=None):
+    """
+    제품 목록 휴리스틱 진출 점수 (0-100 배열, 가격을 모르면 비용 구조를 알 수 없어 NaN)
+    - cost: 총비용 중 제품 원가 비중 (배송비/관부가세 비중이 클수록 낮음)
+    - rating: 평점 3점 → 0, 5점 → 1 (없으면 0.5)
+    - reviews: 리뷰 수 로그 스케일, 1000개 이상 → 1 (없으면 0.3)
+    """
+    engine = margin_engine or MarginEngine()
+    margins = engine.calculate(products)
+
+    demand = np.empty(len(products))
+    ratings = np.full(len(products), np.nan)
+    reviews = np.full(len(products), np.nan)
+    for index, product in enumerate(products):
+        demand[index] = CATEGORY_DEMAND.get(product.get('category', ''), DEFAULT_DEMAND)
+        if isinstance(product.get('rating'), (int, float)):
+            ratings[index] = product['rating']
+        if isinstance(product.get('reviews_count'), (int, float)):
+            reviews[index] = product['reviews_count']
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        cost = margins['goods_krw'] / margins['total_cost_krw']
+    rating = np.where(np.isnan(ratings), 0.5, np.clip((ratings - 3) / 2, 0, 1))
+    review = np.where(np.isnan(reviews), 0.3, np.clip(np.log10(np.maximum(reviews, 0) + 1) / 3, 0, 1))
+
+    weights = HEURISTIC_WEIGHTS
+    scores = 100 * (weights['demand'] * demand + weights['cost'] * cost
+                    + weights['rating'] * rating + weights['reviews'] * review)
+    return np.round(scores, 1)
+
+
+class ScreeningAnalyzer(AnalyzerBase):
+    NAME = 'screening'
+    MODEL = SCREENING_MODEL
+    MAX_TOKENS = SCREENING_MAX_TOKENS
+    PROMPT_VERSION = PROMPT_VERSION
+
+    @property
+    def client(self):
+        return self._client or anthropic_client()
+
+    def screen_product(self, product_data):
+        """
+        저가 모델 진출 점수 ('analysis': {'entry_score', 'reason'})
+        """
+        return self.analyze(product_data)
+
+    def send(self, product_data):
+        return self.client.messages.with_raw_response.create(
+            model=SCREENING_MODEL,
+            max_tokens=SCREENING_MAX_TOKENS,
+            system=SCREENING_SYSTEM_PROMPT,
+            tools=[SCREENING_TOOL],
+            tool_choice={'type': 'tool', 'name': SCREENING_TOOL['name']},
+            messages=[{"role": "user", "content": screening_product_message(product_data)}]
+        )
+
+    def result_from_response(self, message):
+        usage = usage_summary(getattr(message, 'usage', None))
+        tool_input = next((block.input for block in message.content if block.type == 'tool_use'), None)
+        try:
+            analysis = ScreeningAnalysis.from_dict(tool_input)
+        except ValueError as e:
+            return self.failed_result(e, usage)
+        return self.success_result(analysis, usage)
+
+
+class TieredAnalyzer:
+    def __init__(self, duo=None, screener=None, margin_engine=None, threshold=None,
+                 heuristic_threshold=None, use_model=True, max_concurrency=8, deduplicator=None):
+        self.duo = duo or DuoAnalyzer()
+        self.screener = screener or (ScreeningAnalyzer() if use_model else None)
+        self.margin_engine = margin_engine or MarginEngine()
+        # 저가 모델 진출 점수 기준 (이상이면 전체 분석)
+        self.threshold = threshold if threshold is not None else float(os.getenv('SCREENING_THRESHOLD', 60))
+        # 휴리스틱 점수 기준 (미만이면 모델 호출 없이 제외)
+        self.heuristic_threshold = (heuristic_threshold if heuristic_threshold is not None
+                                    else float(os.getenv('HEURISTIC_THRESHOLD', 50)))
+        self.max_concurrency = max_concurrency
+        # ProductDeduplicator 인스턴스 (있으면 선별 전에 유사 중복 제거, 대표 제품 결과를 구성원에게 전달)
+        self.deduplicator = deduplicator
+        self.tier_counts = {'heuristic': 0, 'unpriced': 0, 'screening_model': 0, 'full': 0}
+
+    def analyze_product(self, product_data, exchange_rate=1350):
+        return self.analyze_many([product_data], exchange_rate=exchange_rate)[0]
+
+    def analyze_many(self, products, exchange_rate=1350):
+        """
+        단계별 선별 후 통과 제품만 듀오 분석 (입력 순서대로 결과 반환)
+        - 제외 제품: status 'rejected', tier는 제외를 결정한 단계
+        - 가격을 모르는 제품은 휴리스틱으로 제외하지 않고 저가 모델 선별로 (screening 'unpriced': True),
+          저가 모델을 쓰지 않으면 tier 'unpriced'로 제외
+        - 통과 제품: DuoAnalyzer 결과 + tier 'full'
+        - tier_counts는 실제로 분석한 (대표) 제품 기준
+        - 유사 중복 구성원은 대표 제품의 선별 결과를 따르고, 마진/교차 검증만 자기 가격으로 다시 계산
+        """
+        products = [self._as_dict(product) for product in products]
+        if self.deduplicator is not None:
+            return self.deduplicator.analyze(products, self._analyze_many, reprice=self.duo.reprice,
+                                             exchange_rate=exchange_rate)
+        return self._analyze_many(products, exchange_rate)
+
+    def _analyze_many(self, products, exchange_rate=1350):
+        scores = heuristic_scores(products, self.margin_engine)
+        screening = [{'heuristic_score': None if np.isnan(score) else float(score)} for score in scores]
+        results = [None] * len(products)
+
+        candidates = []
+        for index, score in enumerate(scores):
+            if np.isnan(score):
+                screening[index]['unpriced'] = True
+                if self.screener is None:
+                    results[index] = self._rejected(products[index], screening[index], 'unpriced')
+                else:
+                    candidates.append(index)
+            elif score < self.heuristic_threshold:
+                results[index] = self._rejected(products[index], screening[index], 'heuristic')
+            else:
+                candidates.append(index)
+
+        if self.screener is not None and candidates:
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                outcomes = list(executor.map(self.screener.screen_product, [products[i] for i in candidates]))
+
+            passed = []
+            for index, outcome in zip(candidates, outcomes):
+                screening[index]['model'] = outcome.get('model')
+                # 캐시 적중은 이번 실행 비용 0
+                screening[index]['cost_usd'] = 0.0 if outcome.get('cached') else outcome.get('cost_usd', 0.0)
+                # 선별 호출 실패 시 제외하지 않고 전체 분석으로 넘김
+                if outcome['status'] == 'success':
+                    screening[index]['model_score'] = outcome['analysis']['entry_score']
+                    screening[index]['reason'] = outcome['analysis']['reason']
+                    if outcome['analysis']['entry_score'] < self.threshold:
+                        results[index] = self._rejected(products[index], screening[index], 'screening_model')
+                        continue
+                passed.append(index)
+            candidates = passed
+
+        analyzed = self.duo.analyze_many([products[i] for i in candidates], exchange_rate=exchange_rate)
+        for index, entry in zip(candidates, analyzed):
+            entry['tier'] = 'full'
+            entry['screening'] = screening[index]
+            results[index] = entry
+            self.tier_counts['full'] += 1
+
+        return results
+
+    def _rejected(self, product, screening, tier):
+        self.tier_counts[tier] += 1
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'product': product,
+            'tier': tier,
+            'screening': screening,
+            'status': 'rejected'
+        }
+
+    @staticmethod
+    def _as_dict(product):
+        to_dict = getattr(product, 'to_dict', None)
+        return to_dict() if callable(to_dict) else product
+
+if __name__ == "__main__":
+    tiered = TieredAnalyzer()
+
+    # 테스트 데이터
+    test_products = [
+        {'name': 'Canadian Omega-3 Fish Oil', 'price_cad': 29.99, 'brand': 'NaturePath',
+         'category': '건강식품', 'rating': 4.7, 'reviews_count': 1250},
+        {'name': 'Plastic Snow Shovel', 'price_cad': 9.99, 'category': '생활용품', 'rating': 3.1}
+    ]
+
+    results = tiered.analyze_many(test_products)
+    print(json.dumps(results, ensure_ascii=False, indent=2))
+    print(json.dumps(tiered.tier_counts, ensure_ascii=False, indent=2))
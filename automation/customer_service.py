@@ -7,15 +7,34 @@
 """
 
 import os
+import sys
 import json
 from datetime import datetime
-from dotenv import load_dotenv
 
-load_dotenv()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from config.clients import load_env
+from keyword_matcher import KeywordMatcher
+from inquiry_model import InquiryModel, DEFAULT_MODEL_PATH
+
+load_env()
+
+# 자동 응답 최소 신뢰도 (미만이면 담당자 확인)
+AUTO_RESPONSE_CONFIDENCE = 0.5
+# 키워드 근거 1개당 남는 불확실성 비율 (근거 n개 → 1 - 0.4^(n+1))
+KEYWORD_UNCERTAINTY = 0.4
+# 다른 분류 근거 1개가 선택 분류 근거 대비 갖는 무게 (두 분류 동률은 자동 응답, 세 분류 동률은 담당자 확인)
+COMPETING_EVIDENCE_WEIGHT = 0.5
+# 모델 분류 자동 응답 최소 신뢰도 (보정 확률)
+MODEL_CONFIDENCE = 0.6
 
 class CustomerService:
-    def __init__(self):
+    def __init__(self, model_path=None):
         self.faq_data = self.load_faq_templates()
+        # FAQ 키워드 표를 한 번만 컴파일
+        self.matcher = KeywordMatcher({category: data['keywords'] for category, data in self.faq_data.items()})
+        # 문의 분류 모델 (시작 시 한 번 로드, 모델 파일이 없으면 키워드 규칙만 사용)
+        model_path = model_path or os.getenv('INQUIRY_MODEL_PATH', DEFAULT_MODEL_PATH)
+        self.model = InquiryModel.load(model_path) if os.path.exists(model_path) else None
         
     def load_faq_templates(self):
         """
@@ -43,18 +62,26 @@ class CustomerService:
     def classify_inquiry(self, message):
         """
         문의 자동 분류
+        - 메시지를 한 번 훑어 모든 분류의 키워드 근거 집계, 근거가 가장 많은 분류 선택 (같으면 먼저 나온 분류)
+        - 신뢰도: 근거 수가 많을수록 높고 (1 - 0.4^(근거+1)), 다른 분류 근거가 있으면
+          근거 / (근거 + 0.5 × 다른 분류 근거)만큼 낮춤
+          예) 키워드 1개 0.84, '환불 배송' 0.56, 세 분류 각 1개 0.42 (담당자 확인)
         """
-        message_lower = message.lower()
+        evidence = self.matcher.scores(message)
         
-        for category, data in self.faq_data.items():
-            for keyword in data['keywords']:
-                if keyword in message_lower:
-                    return {
-                        'category': category,
-                        'confidence': 0.8,
-                        'auto_response': data['response'],
-                        'requires_human': False
-                    }
+        if evidence:
+            category = min(evidence, key=lambda name: (-evidence[name]['hits'], evidence[name]['first']))
+            hits = evidence[category]['hits']
+            competing = sum(entry['hits'] for entry in evidence.values()) - hits
+            share = hits / (hits + COMPETING_EVIDENCE_WEIGHT * competing)
+            confidence = round(share * (1 - KEYWORD_UNCERTAINTY ** (hits + 1)), 3)
+            return {
+                'category': category,
+                'confidence': confidence,
+                'auto_response': self.faq_data[category]['response'],
+                'requires_human': confidence < AUTO_RESPONSE_CONFIDENCE,
+                'matched_keywords': {name: entry['keywords'] for name, entry in evidence.items()}
+            }
         
         return {
             'category': '기타',
@@ -63,6 +90,37 @@ class CustomerService:
             'requires_human': True
         }
     
+    def classify_many(self, messages):
+        """
+        여러 문의 일괄 분류 (입력 순서대로)
+        - 키워드 규칙으로 자동 응답 가능한 메시지는 그대로 사용 ('source': 'keywords')
+        - 나머지는 모델로 한 번에 분류, 보정 신뢰도가 MODEL_CONFIDENCE 이상이면 자동 응답 ('source': 'model')
+        - 그 외에는 담당자 확인 ('source': 'human', 모델 예측은 'model_prediction'으로 첨부)
+        """
+        results = [self.classify_inquiry(message) for message in messages]
+        for result in results:
+            result['source'] = 'human' if result['requires_human'] else 'keywords'
+        
+        pending = [index for index, result in enumerate(results) if result['requires_human']]
+        if self.model is None or not pending:
+            return results
+        
+        predictions = self.model.classify([messages[index] for index in pending])
+        for index, (category, confidence) in zip(pending, predictions):
+            confidence = round(confidence, 3)
+            if category in self.faq_data and confidence >= MODEL_CONFIDENCE:
+                results[index] = {
+                    'category': category,
+                    'confidence': confidence,
+                    'auto_response': self.faq_data[category]['response'],
+                    'requires_human': False,
+                    'source': 'model'
+                }
+            else:
+                results[index]['model_prediction'] = {'category': category, 'confidence': confidence}
+        
+        return results
+    
     def send_notification(self, phone_number, message_type, order_data=None):
         """
         알림톡 발송
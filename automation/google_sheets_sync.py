@@ -6,55 +6,155 @@ Google Sheets 연동 모듈
 """
 
 import os
+import sys
 import json
+import threading
 from datetime import datetime
-import gspread
 from google.auth import default
-from dotenv import load_dotenv
 
-load_dotenv()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data-collection'))
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'ai-analysis'))
+from product_record import ProductRecord
+from analysis_schema import analysis_of
+from cross_validation import CrossValidator
+from config.clients import load_env, sheets_client
+
+load_env()
+
+ANALYSIS_SHEET = '분석결과'
+ANALYSIS_HEADERS = [
+    '수집일자', '출처사이트', '제품명', '브랜드', '캐나다가격', '카테고리',
+    '주요성분', '평점', '제품설명', '핵심키워드', '타겟키워드',
+    '검색량추정', '경쟁강도', '마진예상', '진출점수', '상태',
+    'Claude분석', 'ChatGPT분석', '교차검증', '최종결론',
+    '재호의견', '최종합의'
+]
 
 class GoogleSheetsSync:
-    def __init__(self):
-        # Google Sheets 인증
-        self.gc = gspread.service_account(filename=os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON'))
+    def __init__(self, gc=None, spool=None):
+        # None이면 공용 gspread 클라이언트 (서비스 계정 인증은 처음 사용할 때)
+        self._gc = gc
+        # SheetsSpool 인스턴스 (None이면 처음 기록할 때 프로세스 공용 스풀, False면 스풀 없이 바로 기록)
+        self._spool = spool
         self.sheet_id = os.getenv('SHEET_ID')
+        # 워크북/워크시트 핸들 캐시 (처음 사용할 때 한 번만 조회)
+        self._workbook = None
+        self._worksheets = {}
+        self._lock = threading.Lock()
+        # 이 인스턴스가 보낸 Sheets API 요청 수 (워크북/워크시트 조회 + 행 추가)
+        self.api_calls = 0
+    
+    @property
+    def gc(self):
+        return self._gc or sheets_client()
+    
+    @property
+    def spool(self):
+        if self._spool is None:
+            # sheets_spool이 이 모듈을 가져오므로 사용할 때 가져옴
+            from sheets_spool import shared_spool
+            self._spool = shared_spool(self, ANALYSIS_SHEET) or False
+        return self._spool or None
+    
+    def workbook(self):
+        with self._lock:
+            if self._workbook is None:
+                self._workbook = self.gc.open_by_key(self.sheet_id)
+                self.api_calls += 1
+            return self._workbook
+    
+    def worksheet(self, title=ANALYSIS_SHEET):
+        workbook = self.workbook()
+        with self._lock:
+            if title not in self._worksheets:
+                self._worksheets[title] = workbook.worksheet(title)
+                self.api_calls += 1
+            return self._worksheets[title]
+    
+    def append_rows(self, rows, title=ANALYSIS_SHEET):
+        """
+        여러 행을 한 번의 API 요청으로 추가 (응답의 updates.updatedRange에 추가된 범위)
+        """
+        response = self.worksheet(title).append_rows(rows)
+        self._count_call()
+        return response
+    
+    def batch_update(self, data, title=ANALYSIS_SHEET):
+        """
+        여러 범위 값을 한 번의 API 요청으로 갱신 (data: [{'range': 'J5:N5', 'values': [[...]]}, ...])
+        """
+        response = self.worksheet(title).batch_update(data)
+        self._count_call()
+        return response
+    
+    def batch_get(self, ranges, title=ANALYSIS_SHEET):
+        """
+        여러 범위 값을 한 번의 API 요청으로 조회
+        """
+        values = self.worksheet(title).batch_get(ranges)
+        self._count_call()
+        return values
+    
+    def get_all_values(self, title=ANALYSIS_SHEET):
+        values = self.worksheet(title).get_all_values()
+        self._count_call()
+        return values
+    
+    def _count_call(self, count=1):
+        with self._lock:
+            self.api_calls += count
+    
+    def build_row(self, product_data, claude_result, gpt_result, validation=None):
+        """
+        분석 결과 → 분석결과 시트 한 행 (ANALYSIS_HEADERS 순서)
+        - validation: CrossValidator 결과 (없으면 여기서 계산)
+        - 구조화되지 않은 분석(예전 텍스트 분석, 형식 오류)은 분석 열에 원문 그대로 기록
+        """
+        # 새 행 데이터 준비 (dict 또는 ProductRecord)
+        record = ProductRecord.from_dict(product_data)
+        claude = analysis_of(claude_result)
+        gpt = analysis_of(gpt_result)
+        if validation is None:
+            try:
+                validation = CrossValidator().validate_analysis(claude_result, gpt_result)
+            except (AttributeError, TypeError, KeyError, ValueError) as e:
+                validation = {'status': 'failed', 'error': str(e)}
+        validated = validation.get('status') == 'success'
+        return [
+            datetime.now().strftime('%Y-%m-%d %H:%M:%S'),  # 수집일자
+            # 출처사이트 ~ 제품설명
+            *record.sheet_values(),
+            ', '.join(claude['keywords']) if claude else '',  # 핵심키워드
+            ' '.join(gpt['hashtags']) if gpt else '',  # 타겟키워드
+            '',  # 검색량추정
+            claude['competition_level'] if claude else '',  # 경쟁강도
+            self._margin_cell(claude, gpt_result),  # 마진예상
+            claude['entry_score'] if claude else '',  # 진출점수
+            '',  # 상태
+            self._analysis_cell(claude, claude_result),  # Claude분석
+            self._analysis_cell(gpt, gpt_result),        # ChatGPT분석
+            validation['consistency_score'] if validated else '',  # 교차검증
+            validation['final_recommendation']['decision'] if validated else '',  # 최종결론
+            '',  # 재호의견
+            ''   # 최종합의
+        ]
         
-    def update_analysis_result(self, product_data, claude_result, gpt_result):
+    def update_analysis_result(self, product_data, claude_result, gpt_result, validation=None):
         """
         분석 결과를 Google Sheets에 업데이트
+        - 기본은 스풀에 기록 후 바로 반환 (status 'queued', 시트 기록은 스풀 기록 스레드가 묶어서)
+        - 스풀을 쓰지 않으면 (spool=False, SHEETS_USE_SPOOL=0) 한 행씩 바로 기록
+        - validation: CrossValidator 결과 (없으면 여기서 계산)
         """
+        spool = self.spool
+        if spool is not None:
+            return spool.update_analysis_result(product_data, claude_result, gpt_result, validation)
+        
         try:
-            workbook = self.gc.open_by_key(self.sheet_id)
-            worksheet = workbook.worksheet('분석결과')
-            
-            # 새 행 데이터 준비
-            row_data = [
-                datetime.now().strftime('%Y-%m-%d %H:%M:%S'),  # 수집일자
-                product_data.get('source_url', ''),            # 출처사이트
-                product_data.get('name', ''),                  # 제품명
-                product_data.get('brand', ''),                 # 브랜드
-                product_data.get('price_cad', ''),             # 캐나다가격
-                product_data.get('category', ''),              # 카테고리
-                product_data.get('ingredients', ''),           # 주요성분
-                product_data.get('rating', ''),                # 평점
-                product_data.get('description', ''),           # 제품설명
-                '',  # 핵심키워드 (AI가 채움)
-                '',  # 타겟키워드 (AI가 채움)
-                '',  # 검색량추정
-                '',  # 경쟁강도
-                '',  # 마진예상
-                '',  # 진출점수
-                '',  # 상태
-                json.dumps(claude_result, ensure_ascii=False),  # Claude분석
-                json.dumps(gpt_result, ensure_ascii=False),     # ChatGPT분석
-                '',  # 교차검증
-                '',  # 최종결론
-                '',  # 재호의견
-                ''   # 최종합의
-            ]
-            
-            worksheet.append_row(row_data)
+            row_data = self.build_row(product_data, claude_result, gpt_result, validation)
+            self.worksheet(ANALYSIS_SHEET).append_row(row_data)
+            self._count_call()
             
             return {
                 'timestamp': datetime.now().isoformat(),
@@ -69,22 +169,36 @@ class GoogleSheetsSync:
                 'error': str(e)
             }
     
+    @staticmethod
+    def _margin_cell(claude, gpt_result):
+        # 마진 엔진 계산 순마진 우선, 없으면 Claude 예상 마진
+        margins = gpt_result.get('margins') if isinstance(gpt_result, dict) else None
+        if margins:
+            return margins['net_margin_percent']
+        return claude['expected_margin_percent'] if claude is not None else ''
+    
+    @staticmethod
+    def _analysis_cell(analysis, result):
+        if analysis is not None:
+            return json.dumps(analysis, ensure_ascii=False)
+        # 텍스트 분석은 원문 그대로
+        raw = result.get('analysis') if isinstance(result, dict) else result
+        if isinstance(raw, str):
+            return raw
+        return json.dumps(result, ensure_ascii=False, default=str)
+    
     def create_analysis_sheet(self):
         """
         분석용 시트 헤더 생성
         """
-        headers = [
-            '수집일자', '출처사이트', '제품명', '브랜드', '캐나다가격', '카테고리',
-            '주요성분', '평점', '제품설명', '핵심키워드', '타겟키워드',
-            '검색량추정', '경쟁강도', '마진예상', '진출점수', '상태',
-            'Claude분석', 'ChatGPT분석', '교차검증', '최종결론',
-            '재호의견', '최종합의'
-        ]
+        headers = ANALYSIS_HEADERS
         
         try:
-            workbook = self.gc.open_by_key(self.sheet_id)
-            worksheet = workbook.add_worksheet(title='분석결과', rows=1000, cols=len(headers))
+            worksheet = self.workbook().add_worksheet(title=ANALYSIS_SHEET, rows=1000, cols=len(headers))
             worksheet.append_row(headers)
+            with self._lock:
+                self._worksheets[ANALYSIS_SHEET] = worksheet
+                self.api_calls += 2
             
             return {'status': 'success', 'message': 'Analysis sheet created'}
             
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+문의 분류 모델 (문자 n-gram TF-IDF + 소프트맥스 선형 분류기)
+- 라벨 문의로 오프라인 학습 → 모델 파일(.npz) 저장, 서비스 시작 시 한 번 로드
+- 메시지 목록을 SciPy 희소 행렬로 한 번에 변환, 행렬 곱 한 번으로 전체 분류
+- 검증 데이터로 temperature scaling 보정 (신뢰도 = 보정된 확률)
+
+학습: python inquiry_model.py labeled.jsonl [모델 경로]
+      (JSONL 한 줄: {"message": "...", "category": "배송"})
+"""
+
+import os
+import sys
+import json
+import numpy as np
+from scipy import sparse
+from scipy.optimize import minimize, minimize_scalar
+
+DEFAULT_MODEL_PATH = 'models/inquiry_model.npz'
+NGRAM_RANGE = (2, 4)
+# temperature scaling 탐색 범위
+TEMPERATURE_BOUNDS = (0.5, 20.0)
+
+
+def char_ngrams(text, ngram_range=NGRAM_RANGE):
+    """
+    문자 n-gram 목록 (소문자, 공백 정리, 앞뒤 공백으로 단어 경계 표시)
+    """
+    text = ' ' + ' '.join(text.lower().split()) + ' '
+    low, high = ngram_range
+    return [text[i:i + n] for n in range(low, high + 1) for i in range(len(text) - n + 1)]
+
+
+def split_indices(count, validation_ratio=0.2, seed=7):
+    """
+    학습/검증 분할 (training, validation) 인덱스 배열, 50개 미만이면 검증 분할 없음
+    """
+    order = np.random.default_rng(seed).permutation(count)
+    holdout = int(count * validation_ratio) if count >= 50 else 0
+    return order[holdout:], order[:holdout]
+
+
+def _softmax(logits):
+    logits = logits - logits.max(axis=1, keepdims=True)
+    exp = np.exp(logits)
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+class InquiryModel:
+    def __init__(self, vocabulary, idf, coef, intercept, classes, temperature=1.0, ngram_range=NGRAM_RANGE):
+        # n-gram → 열 번호
+        self.vocabulary = vocabulary
+        self.idf = np.asarray(idf, dtype=np.float64)
+        # (특징 수, 분류 수) 가중치 / 분류별 절편
+        self.coef = np.asarray(coef, dtype=np.float64)
+        self.intercept = np.asarray(intercept, dtype=np.float64)
+        self.classes = list(classes)
+        self.temperature = float(temperature)
+        self.ngram_range = tuple(ngram_range)
+
+    def transform(self, messages):
+        """
+        메시지 목록 → (메시지 수, 특징 수) CSR 행렬 (sublinear TF × IDF, 행 L2 정규화)
+        """
+        lookup = self.vocabulary.get
+        indptr = [0]
+        indices = []
+        for message in messages:
+            indices.extend(index for index in map(lookup, char_ngrams(message, self.ngram_range))
+                           if index is not None)
+            indptr.append(len(indices))
+
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices)), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(messages), len(self.idf))
+        )
+        matrix.sum_duplicates()
+        matrix.data = (1 + np.log(matrix.data)) * self.idf[matrix.indices]
+
+        norms = np.sqrt(np.asarray(matrix.multiply(matrix).sum(axis=1)).ravel())
+        norms[norms == 0] = 1
+        return sparse.diags(1 / norms) @ matrix
+
+    def logits(self, matrix):
+        return matrix @ self.coef + self.intercept
+
+    def predict_proba(self, messages):
+        """
+        (메시지 수, 분류 수) 보정 확률 (열 순서는 self.classes)
+        """
+        if not messages:
+            return np.zeros((0, len(self.classes)))
+        return _softmax(self.logits(self.transform(messages)) / self.temperature)
+
+    def classify(self, messages):
+        """
+        메시지별 (분류, 신뢰도) 목록
+        """
+        probabilities = self.predict_proba(messages)
+        best = probabilities.argmax(axis=1)
+        confidence = probabilities[np.arange(len(best)), best]
+        return [(self.classes[index], float(value)) for index, value in zip(best, confidence)]
+
+    def save(self, path=None):
+        """
+        모델 파일 저장 (numpy npz, pickle 없음)
+        """
+        path = path or os.getenv('INQUIRY_MODEL_PATH', DEFAULT_MODEL_PATH)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        vocabulary = sorted(self.vocabulary, key=self.vocabulary.get)
+        # 쓰다 만 파일을 읽지 않도록 임시 파일 후 교체
+        tmp_path = path + '.tmp.npz'
+        np.savez_compressed(
+            tmp_path, vocabulary=np.array(vocabulary), idf=self.idf, coef=self.coef, intercept=self.intercept,
+            classes=np.array(self.classes), temperature=np.array(self.temperature),
+            ngram_range=np.array(self.ngram_range)
+        )
+        os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=None):
+        path = path or os.getenv('INQUIRY_MODEL_PATH', DEFAULT_MODEL_PATH)
+        with np.load(path, allow_pickle=False) as data:
+            vocabulary = {ngram: index for index, ngram in enumerate(data['vocabulary'].tolist())}
+            return cls(vocabulary, data['idf'], data['coef'], data['intercept'], data['classes'].tolist(),
+                       float(data['temperature']), tuple(data['ngram_range'].tolist()))
+
+    @classmethod
+    def train(cls, messages, labels, min_df=2, max_features=100000, l2=1e-2, validation_ratio=0.2, seed=7,
+              ngram_range=NGRAM_RANGE):
+        """
+        라벨 문의로 학습
+        - 어휘/IDF: 학습 분할에서 문서 빈도 min_df 이상 n-gram 중 빈도 상위 max_features개
+          (검증 분할은 어휘/IDF에 넣지 않아 보정이 처음 보는 문의 기준)
+        - 가중치: L2 정규화 소프트맥스 회귀 (L-BFGS)
+        - 보정: 검증 분할(validation_ratio)의 음의 로그 우도를 최소화하는 temperature
+        """
+        classes = sorted(set(labels))
+        targets = np.array([classes.index(label) for label in labels])
+        training, validation = split_indices(len(messages), validation_ratio, seed)
+
+        document_frequency = {}
+        for index in training:
+            for ngram in set(char_ngrams(messages[index], ngram_range)):
+                document_frequency[ngram] = document_frequency.get(ngram, 0) + 1
+        kept = sorted((ngram for ngram, count in document_frequency.items() if count >= min_df),
+                      key=lambda ngram: (-document_frequency[ngram], ngram))[:max_features]
+        vocabulary = {ngram: index for index, ngram in enumerate(kept)}
+        counts = np.array([document_frequency[ngram] for ngram in kept], dtype=np.float64)
+        idf = np.log((1 + len(training)) / (1 + counts)) + 1
+
+        model = cls(vocabulary, idf, np.zeros((len(kept), len(classes))), np.zeros(len(classes)), classes,
+                    ngram_range=ngram_range)
+        matrix = model.transform(messages)
+
+        model._fit(matrix[training], targets[training], l2)
+        if len(validation):
+            model._calibrate(matrix[validation], targets[validation])
+        return model
+
+    def _fit(self, matrix, targets, l2):
+        count, features = matrix.shape
+        classes = len(self.classes)
+        onehot = np.zeros((count, classes))
+        onehot[np.arange(count), targets] = 1
+
+        def loss(params):
+            coef = params[:-classes].reshape(features, classes)
+            intercept = params[-classes:]
+            probabilities = _softmax(matrix @ coef + intercept)
+            value = -np.log(probabilities[np.arange(count), targets] + 1e-12).mean() + 0.5 * l2 * (coef ** 2).sum()
+            error = (probabilities - onehot) / count
+            gradient = np.concatenate([(matrix.T @ error + l2 * coef).ravel(), error.sum(axis=0)])
+            return value, gradient
+
+        result = minimize(loss, np.zeros(features * classes + classes), jac=True, method='L-BFGS-B',
+                          options={'maxiter': 500})
+        self.coef = result.x[:-classes].reshape(features, classes)
+        self.intercept = result.x[-classes:]
+
+    def _calibrate(self, matrix, targets):
+        logits = self.logits(matrix)
+
+        def negative_log_likelihood(log_temperature):
+            probabilities = _softmax(logits / np.exp(log_temperature))
+            return -np.log(probabilities[np.arange(len(targets)), targets] + 1e-12).mean()
+
+        # 검증 데이터가 작거나 쉽게 분리되면 temperature가 0으로 수렴하므로 범위 제한
+        result = minimize_scalar(negative_log_likelihood, bounds=np.log(TEMPERATURE_BOUNDS), method='bounded')
+        self.temperature = float(np.exp(result.x))
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print('usage: python inquiry_model.py labeled.jsonl [model_path]')
+        sys.exit(1)
+
+    with open(sys.argv[1], encoding='utf-8') as f:
+        examples = [json.loads(line) for line in f if line.strip()]
+
+    model = InquiryModel.train([example['message'] for example in examples],
+                               [example['category'] for example in examples])
+    path = model.save(sys.argv[2] if len(sys.argv) > 2 else None)
+    print(json.dumps({'path': path, 'examples': len(examples), 'classes': model.classes,
+                      'features': len(model.vocabulary), 'temperature': round(model.temperature, 3)},
+                     ensure_ascii=False, indent=2))
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+다중 키워드 매처 (Aho-Corasick)
+- 분류별 키워드 표를 한 번만 오토마톤으로 컴파일
+- 메시지를 한 번만 훑어 모든 키워드 위치를 찾음 (키워드 수와 무관, 메시지 길이에 비례)
+- 분류별 근거(서로 다른 키워드 수) 집계
+"""
+
+import json
+from collections import deque
+
+
+class KeywordMatcher:
+    def __init__(self, keyword_table):
+        """
+        keyword_table: {분류: [키워드, ...]} (대소문자 무시, 같은 키워드가 여러 분류에 있어도 됨)
+        """
+        # 상태별 전이 / 실패 링크 / 끝나는 (키워드, 분류) 목록, 상태 0은 루트
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        self.categories = list(keyword_table)
+
+        for category, keywords in keyword_table.items():
+            for keyword in keywords:
+                keyword = keyword.lower()
+                if keyword:
+                    self._add(keyword, category)
+        self._build_failure_links()
+
+    def _add(self, keyword, category):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+                self._goto[state][char] = next_state
+            state = next_state
+        self._output[state].append((keyword, category))
+
+    def _build_failure_links(self):
+        """
+        너비 우선으로 실패 링크 계산, 실패 상태의 출력도 합쳐 둠 (겹친 키워드도 한 번에 찾도록)
+        """
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find(self, text):
+        """
+        텍스트의 모든 키워드 일치 [(시작 위치, 키워드, 분류), ...]
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []
+        state = 0
+        for position, char in enumerate(text.lower()):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for keyword, category in output[state]:
+                matches.append((position - len(keyword) + 1, keyword, category))
+        return matches
+
+    def scores(self, text):
+        """
+        분류별 근거 {분류: {'hits': 서로 다른 키워드 수, 'keywords': [...], 'first': 첫 위치}}
+        """
+        evidence = {}
+        for start, keyword, category in self.find(text):
+            entry = evidence.setdefault(category, {'hits': 0, 'keywords': [], 'first': start})
+            if keyword not in entry['keywords']:
+                entry['keywords'].append(keyword)
+                entry['hits'] += 1
+            entry['first'] = min(entry['first'], start)
+        return evidence
+
+if __name__ == "__main__":
+    matcher = KeywordMatcher({'배송': ['배송', '도착'], '환불': ['환불', '반품'], '가격': ['할인', '세일']})
+    print(json.dumps(matcher.scores('반품하면 배송비 환불되나요? 도착이 늦어서요'), ensure_ascii=False, indent=2))
@@ -0,0 +1,413 @@
+#!/usr/bin/env python3
+"""
+분석결과 시트 로컬 미러 (SQLite)
+- 제품 키별 현재 행(local)과 마지막으로 시트와 맞춘 행(synced) 보관, 조회는 API 없이 로컬에서
+- push: 바뀐 셀만 연속 구간 범위로 묶어 batch_update, 새 제품은 append_rows 한 번
+- pull: 사람이 편집하는 열(상태/재호의견/최종합의)만 batch_get 한 번으로 가져와 병합
+- 시트에서 행을 직접 삭제/정렬한 경우 load()로 행 번호 재매핑
+- 새 행은 append 전에 '추가 중'으로 표시, 다음 push에서 표시가 남아 있으면 시트를 먼저 읽어 중복 추가 방지
+- 새 행은 기본으로 SheetsSpool(프로세스 공용)을 거쳐 기록, 행 번호는 스풀이 기록을 마친 뒤 다음 push에서 찾음
+  (spool=False, SHEETS_USE_SPOOL=0이면 append_rows로 바로 기록)
+- 기존 행 셀 갱신은 batch_update로 바로 기록 (반영 안 된 행은 SQLite에 dirty로 남아 재시도)
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from gspread.utils import rowcol_to_a1
+from google_sheets_sync import GoogleSheetsSync, ANALYSIS_SHEET, ANALYSIS_HEADERS
+from sheets_spool import shared_spool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data-collection'))
+from url_frontier import canonicalize_url
+
+# 사람이 시트에서 편집하는 열 (시트 값이 우선, push하지 않음)
+HUMAN_COLUMNS = ('상태', '재호의견', '최종합의')
+HUMAN_INDICES = [ANALYSIS_HEADERS.index(column) for column in HUMAN_COLUMNS]
+# 매번 바뀌어 단독으로는 변경으로 보지 않는 열
+VOLATILE_INDICES = [ANALYSIS_HEADERS.index('수집일자')]
+SOURCE_INDEX, NAME_INDEX, BRAND_INDEX = (ANALYSIS_HEADERS.index(column) for column in ('출처사이트', '제품명', '브랜드'))
+
+# 헤더 행 수 (데이터는 다음 행부터)
+HEADER_ROWS = 1
+# batch_update 요청 하나에 넣는 범위 수 상한
+MAX_RANGES_PER_REQUEST = 500
+
+UPDATED_ROW_PATTERN = re.compile(r'![A-Z]+(\d+)')
+# 시트 숫자 서식 ('1,350', '29.90')
+NUMBER_PATTERN = re.compile(r'^[+-]?(\d{1,3}(,\d{3})+|\d+)?(\.\d+)?$')
+
+
+def product_key(row):
+    """
+    시트 행 → 제품 키 (정규화 출처 URL, URL이 없으면 브랜드 + 제품명)
+    """
+    source = str(row[SOURCE_INDEX] or '')
+    if source.startswith(('http://', 'https://')):
+        basis = canonicalize_url(source, keep_listing_params=False)
+    else:
+        basis = '|'.join(' '.join(str(row[index] or '').lower().split()) for index in (BRAND_INDEX, NAME_INDEX))
+    return hashlib.sha256(basis.encode('utf-8')).hexdigest()[:32]
+
+
+def _cell(value):
+    """
+    비교용 셀 값 (시트에서 읽은 값은 서식이 붙은 문자열이므로 숫자/불리언은 정규화: 29.9 == '29.90')
+    """
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, (int, float)):
+        return repr(float(value))
+    text = str(value).strip()
+    if text.upper() in ('TRUE', 'FALSE'):
+        return text.upper()
+    if any(char.isdigit() for char in text) and NUMBER_PATTERN.match(text):
+        return repr(float(text.replace(',', '')))
+    return text
+
+
+def _pad(row):
+    row = list(row)[:len(ANALYSIS_HEADERS)]
+    return row + [''] * (len(ANALYSIS_HEADERS) - len(row))
+
+
+def _runs(indices):
+    """
+    정렬된 열 번호 → 연속 구간 [(시작, 끝), ...]
+    """
+    runs = []
+    for index in indices:
+        if runs and index == runs[-1][1] + 1:
+            runs[-1][1] = index
+        else:
+            runs.append([index, index])
+    return [tuple(run) for run in runs]
+
+
+class SheetMirror:
+    def __init__(self, sync=None, path=None, title=ANALYSIS_SHEET, spool=None):
+        self.sync = sync or GoogleSheetsSync()
+        self.title = title
+        self.path = path or os.getenv('SHEET_MIRROR_PATH', '.cache/sheet_mirror.sqlite3')
+        # SheetsSpool 인스턴스 (None이면 처음 push할 때 프로세스 공용 스풀, False면 새 행도 append_rows로 바로)
+        self._spool = spool
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS sheet_rows (
+                key TEXT PRIMARY KEY,
+                row_number INTEGER,
+                local TEXT NOT NULL,
+                synced TEXT,
+                dirty INTEGER NOT NULL,
+                appending INTEGER NOT NULL DEFAULT 0,
+                updated_at REAL NOT NULL
+            )
+        """)
+        # 이전 버전 미러 파일에는 appending 열이 없음
+        columns = {column[1] for column in self._conn.execute('PRAGMA table_info(sheet_rows)')}
+        if 'appending' not in columns:
+            self._conn.execute('ALTER TABLE sheet_rows ADD COLUMN appending INTEGER NOT NULL DEFAULT 0')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_sheet_rows_dirty ON sheet_rows(dirty)')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_sheet_rows_number ON sheet_rows(row_number)')
+        self._conn.commit()
+
+    @property
+    def spool(self):
+        if self._spool is None:
+            self._spool = shared_spool(self.sync, self.title) or False
+        return self._spool or None
+
+    def upsert(self, row):
+        """
+        로컬 행 추가/갱신 (사람 편집 열은 기존 값 유지), 실제로 바뀌었으면 True
+        """
+        row = _pad(row)
+        key = product_key(row)
+
+        with self._lock:
+            existing = self._conn.execute('SELECT local FROM sheet_rows WHERE key = ?', (key,)).fetchone()
+            if existing is None:
+                self._conn.execute(
+                    'INSERT INTO sheet_rows (key, row_number, local, synced, dirty, updated_at) '
+                    'VALUES (?, NULL, ?, NULL, 1, ?)',
+                    (key, json.dumps(row, ensure_ascii=False), time.time())
+                )
+                self._conn.commit()
+                return True
+
+            current = json.loads(existing[0])
+            for index in HUMAN_INDICES:
+                row[index] = current[index]
+            if not self._changed_indices(row, current):
+                return False
+
+            self._conn.execute(
+                'UPDATE sheet_rows SET local = ?, dirty = 1, updated_at = ? WHERE key = ?',
+                (json.dumps(row, ensure_ascii=False), time.time(), key)
+            )
+            self._conn.commit()
+        return True
+
+    def upsert_result(self, product_data, claude_result, gpt_result, validation=None):
+        """
+        분석 결과 → 로컬 행 (GoogleSheetsSync.build_row와 같은 열 구성)
+        """
+        return self.upsert(self.sync.build_row(product_data, claude_result, gpt_result, validation))
+
+    def get(self, key):
+        with self._lock:
+            row = self._conn.execute('SELECT local FROM sheet_rows WHERE key = ?', (key,)).fetchone()
+        return None if row is None else dict(zip(ANALYSIS_HEADERS, json.loads(row[0])))
+
+    def records(self, filters=None):
+        """
+        로컬 행 조회 (filters: {열 이름: 값}, 값이 같은 행만), 시트 행 순서
+        """
+        clauses, params = [], []
+        for column, value in (filters or {}).items():
+            clauses.append(f"json_extract(local, '$[{ANALYSIS_HEADERS.index(column)}]') = ?")
+            params.append(value)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+
+        with self._lock:
+            rows = self._conn.execute(
+                f'SELECT local FROM sheet_rows {where} ORDER BY row_number IS NULL, row_number', params
+            ).fetchall()
+        return [dict(zip(ANALYSIS_HEADERS, json.loads(row[0]))) for row in rows]
+
+    def push(self):
+        """
+        바뀐 행만 시트에 반영
+        - 기존 행: 바뀐 셀만 연속 구간 범위로 batch_update (요청당 MAX_RANGES_PER_REQUEST개)
+        - 새 행: append 전에 '추가 중'으로 표시 후 스풀에 넘기거나 (행 번호는 다음 push에서)
+          스풀이 없으면 append_rows 한 번, 응답 범위로 행 번호 기록
+        - 실패하면 반영되지 않은 행은 dirty로 남아 다음 push에서 재시도
+        - '추가 중' 표시가 남아 있으면 (스풀 기록 완료 / append 후 행 번호 기록 전에 실패·중단) 먼저 load()로
+          시트에 이미 들어간 행을 찾아 다시 추가하지 않음, 스풀에 아직 기록할 행이 있으면 다음 push로 미룸
+        """
+        spool = self.spool
+        calls_before = self.sync.api_calls
+        try:
+            with self._lock:
+                unconfirmed = self._conn.execute('SELECT COUNT(*) FROM sheet_rows WHERE appending = 1').fetchone()[0]
+            if unconfirmed and (spool is None or not spool.stats()['pending']):
+                self.load()
+        except Exception as e:
+            return {'status': 'failed', 'error': str(e), 'api_calls': self.sync.api_calls - calls_before}
+
+        with self._lock:
+            # 스풀이 아직 기록하지 않은 새 행은 제외 (바뀌었어도 행 번호를 찾은 뒤 셀 갱신)
+            pending = self._conn.execute(
+                'SELECT key, row_number, local, synced FROM sheet_rows '
+                'WHERE dirty = 1 AND NOT (row_number IS NULL AND appending = 1) ORDER BY row_number'
+            ).fetchall()
+
+        updates, ranges, new_rows = [], [], []
+        cells = 0
+        for key, row_number, local_json, synced_json in pending:
+            local = json.loads(local_json)
+            if row_number is None:
+                new_rows.append((key, local_json, local))
+                continue
+
+            changed = self._changed_indices(local, json.loads(synced_json) if synced_json else None)
+            if changed:
+                # 내용이 바뀐 행은 수집일자도 함께 갱신
+                changed = sorted(set(changed) | set(VOLATILE_INDICES))
+            for start, end in _runs(changed):
+                ranges.append({
+                    'range': f"{rowcol_to_a1(row_number, start + 1)}:{rowcol_to_a1(row_number, end + 1)}",
+                    'values': [local[start:end + 1]]
+                })
+                cells += end - start + 1
+            updates.append((key, local_json))
+
+        try:
+            for start in range(0, len(ranges), MAX_RANGES_PER_REQUEST):
+                self.sync.batch_update(ranges[start:start + MAX_RANGES_PER_REQUEST], self.title)
+            self._mark_synced(updates)
+
+            if new_rows and spool is not None:
+                self._mark_appending([key for key, _, _ in new_rows])
+                for _, _, local in new_rows:
+                    spool.append(local)
+                self._mark_synced([(key, local_json) for key, local_json, _ in new_rows])
+            elif new_rows:
+                self._mark_appending([key for key, _, _ in new_rows])
+                response = self.sync.append_rows([local for _, _, local in new_rows], self.title)
+                match = UPDATED_ROW_PATTERN.search(((response or {}).get('updates') or {}).get('updatedRange', ''))
+                if match:
+                    first_row = int(match.group(1))
+                    self._mark_synced([(key, local_json) for key, local_json, _ in new_rows],
+                                      [first_row + offset for offset in range(len(new_rows))])
+                else:
+                    # 추가된 위치를 모르면 시트 전체로 행 번호 재매핑
+                    self.load()
+
+        except Exception as e:
+            return {'status': 'failed', 'error': str(e), 'api_calls': self.sync.api_calls - calls_before}
+
+        return {
+            'status': 'success',
+            'updated_rows': len(updates),
+            'new_rows': len(new_rows),
+            'spooled': spool is not None,
+            'cells': cells,
+            'ranges': len(ranges),
+            'api_calls': self.sync.api_calls - calls_before
+        }
+
+    def pull(self):
+        """
+        사람 편집 열만 batch_get 한 번으로 가져와 로컬/동기화 값에 병합, 바뀐 행 수 반환
+        """
+        with self._lock:
+            numbered = dict(self._conn.execute(
+                'SELECT row_number, key FROM sheet_rows WHERE row_number IS NOT NULL'
+            ).fetchall())
+        if not numbered:
+            return {'status': 'success', 'changed_rows': 0, 'api_calls': 0}
+
+        calls_before = self.sync.api_calls
+        first_row, last_row = HEADER_ROWS + 1, max(numbered)
+        runs = _runs(sorted(HUMAN_INDICES))
+        try:
+            value_ranges = self.sync.batch_get([
+                f"{rowcol_to_a1(first_row, start + 1)}:{rowcol_to_a1(last_row, end + 1)}" for start, end in runs
+            ], self.title)
+        except Exception as e:
+            return {'status': 'failed', 'error': str(e), 'api_calls': self.sync.api_calls - calls_before}
+
+        # 행 번호 → {열 번호: 시트 값}
+        sheet_values = {}
+        for (start, end), values in zip(runs, value_ranges):
+            for offset in range(last_row - first_row + 1):
+                row_values = values[offset] if offset < len(values) else []
+                cells = sheet_values.setdefault(first_row + offset, {})
+                for index in range(start, end + 1):
+                    position = index - start
+                    cells[index] = row_values[position] if position < len(row_values) else ''
+
+        changed_rows = 0
+        with self._lock:
+            for row_number, key in numbered.items():
+                local_json, synced_json = self._conn.execute(
+                    'SELECT local, synced FROM sheet_rows WHERE key = ?', (key,)
+                ).fetchone()
+                local = json.loads(local_json)
+                synced = json.loads(synced_json) if synced_json else list(local)
+                values = sheet_values.get(row_number, {})
+                if all(_cell(local[index]) == _cell(values.get(index, '')) for index in HUMAN_INDICES):
+                    continue
+                for index in HUMAN_INDICES:
+                    local[index] = synced[index] = values.get(index, '')
+                self._conn.execute(
+                    'UPDATE sheet_rows SET local = ?, synced = ?, updated_at = ? WHERE key = ?',
+                    (json.dumps(local, ensure_ascii=False), json.dumps(synced, ensure_ascii=False), time.time(), key)
+                )
+                changed_rows += 1
+            self._conn.commit()
+
+        return {'status': 'success', 'changed_rows': changed_rows, 'api_calls': self.sync.api_calls - calls_before}
+
+    def load(self):
+        """
+        시트 전체를 한 번 읽어 제품 키 → 행 번호 매핑 (처음 연결할 때 / 시트 구조가 바뀐 뒤)
+        - 로컬에 없는 행은 그대로 가져오고, 있는 행은 사람 편집 열만 시트 값으로 맞춤
+        """
+        values = self.sync.get_all_values(self.title)
+        now = time.time()
+        loaded = 0
+
+        with self._lock:
+            self._conn.execute('UPDATE sheet_rows SET row_number = NULL')
+            for offset, sheet_row in enumerate(values[HEADER_ROWS:]):
+                sheet_row = _pad(sheet_row)
+                if not any(sheet_row):
+                    continue
+                key = product_key(sheet_row)
+                row_number = HEADER_ROWS + 1 + offset
+                existing = self._conn.execute('SELECT local FROM sheet_rows WHERE key = ?', (key,)).fetchone()
+
+                local = sheet_row
+                if existing is not None:
+                    local = json.loads(existing[0])
+                    for index in HUMAN_INDICES:
+                        local[index] = sheet_row[index]
+                dirty = int(bool(self._changed_indices(local, sheet_row)))
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO sheet_rows (key, row_number, local, synced, dirty, updated_at) '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (key, row_number, json.dumps(local, ensure_ascii=False),
+                     json.dumps(sheet_row, ensure_ascii=False), dirty, now)
+                )
+                loaded += 1
+            # 시트에 없는 로컬 행은 새 행으로 다시 추가 ('추가 중' 표시는 시트와 맞췄으므로 해제)
+            self._conn.execute('UPDATE sheet_rows SET dirty = 1, synced = NULL WHERE row_number IS NULL')
+            self._conn.execute('UPDATE sheet_rows SET appending = 0 WHERE appending = 1')
+            self._conn.commit()
+        return loaded
+
+    def stats(self):
+        with self._lock:
+            total, dirty, unsent = self._conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(dirty), 0), COALESCE(SUM(row_number IS NULL), 0) FROM sheet_rows'
+            ).fetchone()
+        return {'rows': total, 'dirty': dirty, 'new': unsent}
+
+    def _mark_appending(self, keys):
+        """
+        append 직전 '추가 중' 표시 (append 결과를 기록하기 전에 중단되면 다음 push가 시트를 확인)
+        """
+        with self._lock:
+            self._conn.executemany('UPDATE sheet_rows SET appending = 1 WHERE key = ?', [(key,) for key in keys])
+            self._conn.commit()
+
+    def _mark_synced(self, entries, row_numbers=None):
+        """
+        반영한 행의 synced 갱신 (보내는 동안 다시 바뀐 행은 dirty 유지)
+        """
+        with self._lock:
+            for position, (key, local_json) in enumerate(entries):
+                if row_numbers is not None:
+                    self._conn.execute('UPDATE sheet_rows SET row_number = ?, appending = 0 WHERE key = ?',
+                                       (row_numbers[position], key))
+                self._conn.execute(
+                    'UPDATE sheet_rows SET synced = ?, dirty = (local != ?) WHERE key = ?',
+                    (local_json, local_json, key)
+                )
+            self._conn.commit()
+
+    @staticmethod
+    def _changed_indices(row, synced):
+        """
+        push 대상 열 중 값이 다른 열 번호 (사람 편집 열, 수집일자 제외)
+        """
+        skipped = set(HUMAN_INDICES) | set(VOLATILE_INDICES)
+        return [index for index in range(len(ANALYSIS_HEADERS))
+                if index not in skipped and (synced is None or _cell(row[index]) != _cell(synced[index]))]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+if __name__ == "__main__":
+    mirror = SheetMirror()
+
+    print(json.dumps(mirror.pull(), ensure_ascii=False, indent=2))
+    print(json.dumps(mirror.push(), ensure_ascii=False, indent=2))
+    print(json.dumps(mirror.stats(), ensure_ascii=False, indent=2))
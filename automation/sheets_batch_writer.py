@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Google Sheets 버퍼 일괄 기록
+- 기본은 행을 SheetsSpool(프로세스 공용)에 바로 넘김: 디스크 로그에 먼저 남고 스풀 기록 스레드가 묶어서 기록
+- 스풀을 쓰지 않으면 (spool=False, SHEETS_USE_SPOOL=0) 메모리 버퍼에 모아 append_rows 한 번으로 기록
+  (워크북/워크시트 핸들은 GoogleSheetsSync에서 재사용)
+  - 버퍼 행 수(SHEETS_BATCH_SIZE) 또는 마지막 기록 후 경과 시간(SHEETS_FLUSH_SECONDS) 기준, 종료 시 남은 행 기록
+    (경과 시간 기준은 백그라운드 스레드가 확인하므로 행 추가가 끊겨도 기록됨)
+  - 버퍼 상한(SHEETS_MAX_PENDING): 기록 실패로 행이 쌓여 상한에 도달하면 새 행을 거절
+  - 버퍼는 메모리에만 있어 기록 전에 프로세스가 죽으면 유실
+- 초당 기록 행 수, 행 단위 기록 대비 절약한 API 요청 수 보고
+"""
+
+import os
+import json
+import time
+import threading
+from datetime import datetime
+from google_sheets_sync import GoogleSheetsSync, ANALYSIS_SHEET
+from sheets_spool import shared_spool
+
+# 행 단위 기록 시 행마다 드는 API 요청 수 (open_by_key + worksheet + append_row)
+UNBUFFERED_CALLS_PER_ROW = 3
+
+
+class SheetsBatchWriter:
+    def __init__(self, sync=None, title=ANALYSIS_SHEET, batch_size=None, flush_interval=None,
+                 max_pending=None, spool=None):
+        self.sync = sync or GoogleSheetsSync()
+        self.title = title
+        # 버퍼가 이 행 수에 도달하면 기록
+        self.batch_size = batch_size or int(os.getenv('SHEETS_BATCH_SIZE', 100))
+        # 마지막 기록 후 이 시간(초)이 지나면 기록 (0 이하면 추가할 때마다 기록, 백그라운드 스레드 없음)
+        self.flush_interval = (flush_interval if flush_interval is not None
+                               else float(os.getenv('SHEETS_FLUSH_SECONDS', 30)))
+        # 버퍼 + 기록 중인 행 수 상한
+        self.max_pending = max_pending or int(os.getenv('SHEETS_MAX_PENDING', 1000))
+        # SheetsSpool 인스턴스 (None이면 처음 추가할 때 프로세스 공용 스풀, False면 메모리 버퍼로 바로 기록)
+        self._spool = spool
+
+        self._rows = []
+        # 기록 중인 행 수 (실패하면 버퍼로 돌아오므로 상한에 포함)
+        self._in_flight = 0
+        # 버퍼 보호 / 기록 순서 보장 (DuoAnalyzer 워커 스레드에서 공유)
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._started = None
+        self._timer = None
+        self._stop = threading.Event()
+        self._stats = {'rows_added': 0, 'rows_written': 0, 'flushes': 0, 'failed_flushes': 0,
+                       'rejected_rows': 0, 'spooled_rows': 0, 'api_calls': 0, 'write_seconds': 0.0}
+
+    @property
+    def spool(self):
+        if self._spool is None:
+            self._spool = shared_spool(self.sync, self.title) or False
+        return self._spool or None
+
+    def add(self, product_data, claude_result, gpt_result, validation=None):
+        """
+        분석 결과 한 건을 스풀/버퍼에 추가 (버퍼는 기준에 도달하면 기록)
+        """
+        return self.add_row(self.sync.build_row(product_data, claude_result, gpt_result, validation))
+
+    def add_row(self, row):
+        """
+        행 추가 (스풀이 있으면 스풀 결과 'queued', 버퍼가 상한에 도달했으면 추가하지 않고 'failed')
+        """
+        spool = self.spool
+        if spool is not None:
+            result = spool.append(row)
+            with self._lock:
+                self._stats['rows_added'] += 1
+                self._stats['spooled_rows'] += 1
+            return result
+
+        self.start()
+        with self._lock:
+            if self._started is None:
+                self._started = time.monotonic()
+            if len(self._rows) + self._in_flight >= self.max_pending:
+                self._stats['rejected_rows'] += 1
+                return {
+                    'timestamp': datetime.now().isoformat(),
+                    'status': 'failed',
+                    'pending': len(self._rows) + self._in_flight,
+                    'error': 'buffer full'
+                }
+            self._rows.append(row)
+            self._stats['rows_added'] += 1
+            pending = len(self._rows)
+            due = pending >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval
+
+        if due:
+            return self.flush()
+        return {'status': 'buffered', 'pending': pending}
+
+    def start(self):
+        """
+        경과 시간 기준 기록 스레드 시작 (첫 행 추가 시 자동, 이미 시작했거나 닫았으면 무시)
+        """
+        with self._lock:
+            if self._timer is None and self.flush_interval > 0 and not self._stop.is_set():
+                self._timer = threading.Thread(target=self._run, name='sheets-batch-writer', daemon=True)
+                self._timer.start()
+        return self
+
+    def _run(self):
+        while True:
+            with self._lock:
+                remaining = self.flush_interval - (time.monotonic() - self._last_flush)
+            if self._stop.wait(max(remaining, 0.05)):
+                return
+            with self._lock:
+                due = bool(self._rows) and time.monotonic() - self._last_flush >= self.flush_interval
+            if due:
+                self.flush()
+
+    def flush(self):
+        """
+        버퍼의 행을 append_rows 한 번으로 기록
+        - 실패하면 행을 버퍼 앞쪽에 되돌려 다음 기록 때 재시도 (순서 유지)
+        - 스풀을 쓰면 버퍼가 비어 있어 아무것도 하지 않음 (기록은 스풀 기록 스레드)
+        """
+        with self._flush_lock:
+            with self._lock:
+                rows, self._rows = self._rows, []
+                self._in_flight = len(rows)
+                self._last_flush = time.monotonic()
+            if not rows:
+                return {'status': 'success', 'rows': 0}
+
+            calls_before = self.sync.api_calls
+            started = time.perf_counter()
+            try:
+                self.sync.append_rows(rows, self.title)
+            except Exception as e:
+                with self._lock:
+                    self._rows[:0] = rows
+                    self._in_flight = 0
+                    self._stats['failed_flushes'] += 1
+                    self._stats['api_calls'] += self.sync.api_calls - calls_before
+                    pending = len(self._rows)
+                return {
+                    'timestamp': datetime.now().isoformat(),
+                    'status': 'failed',
+                    'pending': pending,
+                    'error': str(e)
+                }
+
+            with self._lock:
+                self._in_flight = 0
+                self._stats['rows_written'] += len(rows)
+                self._stats['flushes'] += 1
+                self._stats['api_calls'] += self.sync.api_calls - calls_before
+                self._stats['write_seconds'] += time.perf_counter() - started
+            return {'status': 'success', 'rows': len(rows)}
+
+    def close(self):
+        """
+        기록 스레드 종료 후 남은 행 모두 기록
+        """
+        self._stop.set()
+        if self._timer is not None:
+            self._timer.join()
+        return self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def stats(self):
+        """
+        기록 통계
+        - rows_per_second: 첫 행 추가부터 지금까지 기준 기록 행 수
+        - api_calls_saved: 행 단위 기록(행당 3회) 대비 절약한 요청 수
+        - spooled_rows: 스풀로 넘긴 행 수 (이 행들의 시트 기록 통계는 스풀 stats())
+        """
+        with self._lock:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._rows)
+            elapsed = time.monotonic() - self._started if self._started is not None else 0
+
+        stats['write_seconds'] = round(stats['write_seconds'], 3)
+        stats['rows_per_second'] = round(stats['rows_written'] / elapsed, 1) if elapsed else 0
+        stats['api_calls_saved'] = stats['rows_written'] * UNBUFFERED_CALLS_PER_ROW - stats['api_calls']
+        return stats
+
+if __name__ == "__main__":
+    # 테스트 데이터 (분석 실패 결과도 원문 그대로 기록)
+    test_product = {'name': 'Canadian Omega-3 Fish Oil', 'price_cad': 29.99, 'brand': 'NaturePath'}
+    failed = {'status': 'failed', 'error': 'not analyzed'}
+
+    with SheetsBatchWriter(batch_size=50) as writer:
+        for _ in range(3):
+            writer.add(test_product, failed, failed)
+    print(json.dumps(writer.stats(), ensure_ascii=False, indent=2))
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Google Sheets 기록 스풀 (write-ahead)
+- 시트에 쓸 행을 먼저 디스크의 추가 전용 로그(JSONL)에 기록 후 즉시 반환 (분석 파이프라인은 Sheets 지연과 무관)
+- 백그라운드 스레드가 미기록 행을 append_rows로 묶어 기록, 실패 시 full jitter 백오프 후 재시도
+- 기록한 행은 완료 표시를 로그에 추가, 재시작 시 완료 표시가 없는 행부터 다시 기록
+- 완료된 항목이 쌓이면 미기록 행만 남겨 로그 압축 (임시 파일 후 교체)
+- 기록 직후 완료 표시 전에 프로세스가 죽으면 해당 묶음은 재시작 후 한 번 더 기록될 수 있음 (유실 대신 중복)
+- 쓰기 도중 죽어 마지막 줄이 잘렸으면 시작 시 마지막 완전한 줄까지 잘라낸 뒤 이어 씀
+- 같은 묶음이 SHEETS_SPOOL_MAX_ATTEMPTS번 연속 실패하면 묶음 크기를 반씩 줄여 문제 행을 찾고,
+  한 행만 남아도 계속 실패하면 dead-letter 파일(SHEETS_SPOOL_DEAD_PATH)로 옮기고 다음 행 기록
+- 기본 사용: GoogleSheetsSync.update_analysis_result / SheetsBatchWriter / SheetMirror.push(새 행)는
+  shared_spool()의 프로세스 공용 스풀을 거침 (spool=False 또는 SHEETS_USE_SPOOL=0이면 시트에 바로 기록)
+"""
+
+import os
+import json
+import atexit
+import random
+import threading
+from datetime import datetime
+from google_sheets_sync import GoogleSheetsSync, ANALYSIS_SHEET
+
+DEFAULT_PATH = '.cache/sheets_spool.jsonl'
+# 프로세스 종료 시 남은 행 기록을 기다리는 최대 시간 (초, 남은 행은 다음 실행에서 기록)
+SHUTDOWN_TIMEOUT = 10
+
+# 시트 이름 → 프로세스 공용 스풀
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+def dead_letter_path(path):
+    """
+    스풀 로그 경로 → dead-letter 파일 경로 (.cache/sheets_spool.jsonl → .cache/sheets_spool.dead.jsonl)
+    """
+    root, ext = os.path.splitext(path)
+    return f'{root}.dead{ext}'
+
+
+def shared_spool(sync=None, title=ANALYSIS_SHEET):
+    """
+    시트 이름별 프로세스 공용 스풀 (처음 요청할 때 만들고 기록 스레드 시작, SHEETS_USE_SPOOL=0이면 None)
+    - 한 로그 파일을 여러 인스턴스가 쓰면 항목 id가 겹치므로 기본 경로는 공용 인스턴스만 사용
+    - 분석결과 외 시트는 SHEETS_SPOOL_PATH 옆의 시트별 파일
+    """
+    if os.getenv('SHEETS_USE_SPOOL', '1') == '0':
+        return None
+    with _shared_lock:
+        if title not in _shared:
+            path = os.getenv('SHEETS_SPOOL_PATH', DEFAULT_PATH)
+            if title != ANALYSIS_SHEET:
+                root, ext = os.path.splitext(path)
+                path = f'{root}.{title}{ext}'
+            _shared[title] = SheetsSpool(sync=sync, path=path, title=title).start()
+        return _shared[title]
+
+
+def reset_spools(timeout=SHUTDOWN_TIMEOUT):
+    """
+    공용 스풀 모두 닫고 제거 (프로세스 종료 시 자동, 테스트용)
+    """
+    with _shared_lock:
+        spools = list(_shared.values())
+        _shared.clear()
+    for spool in spools:
+        spool.close(timeout)
+
+
+atexit.register(reset_spools)
+
+
+class SheetsSpool:
+    def __init__(self, sync=None, path=None, title=ANALYSIS_SHEET, batch_size=None, flush_interval=None,
+                 base_delay=2.0, max_delay=300.0, compact_after=1000, max_attempts=None, dead_path=None):
+        self.sync = sync or GoogleSheetsSync(spool=False)
+        self.title = title
+        self.path = path or os.getenv('SHEETS_SPOOL_PATH', DEFAULT_PATH)
+        # 계속 실패하는 행은 이 파일로 옮김 (id, 행, 마지막 오류)
+        self.dead_path = dead_path or os.getenv('SHEETS_SPOOL_DEAD_PATH') or dead_letter_path(self.path)
+        # 한 번에 기록하는 최대 행 수 / 미기록 행이 적어도 이 시간(초)마다 기록
+        self.batch_size = batch_size or int(os.getenv('SHEETS_BATCH_SIZE', 100))
+        self.flush_interval = (flush_interval if flush_interval is not None
+                               else float(os.getenv('SHEETS_FLUSH_SECONDS', 30)))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # 완료 항목이 이 수 이상 쌓이면 로그 압축
+        self.compact_after = compact_after
+        # 같은 묶음 연속 실패 허용 횟수 (넘으면 묶음 크기를 반으로, 한 행이면 dead-letter)
+        self.max_attempts = max_attempts or int(os.getenv('SHEETS_SPOOL_MAX_ATTEMPTS', 10))
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._condition = threading.Condition()
+        # 같은 묶음을 두 번 기록하지 않도록 기록은 한 번에 하나씩
+        self._flush_lock = threading.Lock()
+        self._pending = {}
+        self._next_id = 1
+        self._done_since_compact = 0
+        self._thread = None
+        self._stopping = False
+        self._attempt = 0
+        # 이번 묶음 최대 행 수 (문제 행을 찾는 동안 batch_size보다 작음)
+        self._batch_limit = self.batch_size
+        self._stats = {'spooled': 0, 'replayed': 0, 'truncated_bytes': 0, 'flushed': 0, 'flushes': 0,
+                       'failed_flushes': 0, 'dead_lettered': 0, 'last_error': None}
+
+        self._repair_tail()
+        self._replay()
+        self._log = open(self.path, 'a', encoding='utf-8')
+
+    def _repair_tail(self):
+        """
+        마지막 줄이 잘렸으면(줄바꿈 없이 끝남) 마지막 완전한 줄까지 자르기
+        - 그대로 'a'로 열면 다음 기록이 잘린 조각 뒤에 붙어 두 줄 모두 읽을 수 없게 됨
+        - 잘린 줄은 fsync 전이라 호출자에게 반환되지 않은 행
+        """
+        if not os.path.exists(self.path):
+            return
+
+        with open(self.path, 'rb+') as f:
+            size = f.seek(0, os.SEEK_END)
+            end = 0
+            # 끝에서부터 블록 단위로 마지막 줄바꿈 탐색
+            position = size
+            while position > 0:
+                start = max(0, position - 65536)
+                f.seek(start)
+                index = f.read(position - start).rfind(b'\n')
+                if index >= 0:
+                    end = start + index + 1
+                    break
+                position = start
+
+            if end < size:
+                f.truncate(end)
+                f.flush()
+                os.fsync(f.fileno())
+                self._stats['truncated_bytes'] = size - end
+
+    def _replay(self):
+        """
+        로그를 읽어 완료 표시가 없는 행 복원 (읽을 수 없는 줄은 무시, dead-letter로 옮긴 행도 완료 표시)
+        """
+        if not os.path.exists(self.path):
+            return
+
+        done = 0
+        with open(self.path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue
+                if 'row' in entry:
+                    self._pending[entry['id']] = entry['row']
+                    self._next_id = max(self._next_id, entry['id'] + 1)
+                else:
+                    for entry_id in entry.get('done', ()):
+                        self._pending.pop(entry_id, None)
+                        done += 1
+
+        self._stats['replayed'] = len(self._pending)
+        self._done_since_compact = done
+
+    def _write(self, entry):
+        # 기록 후 fsync까지 해야 반환 (전원 차단에도 유실 없음)
+        self._log.write(json.dumps(entry, ensure_ascii=False, default=str) + '\n')
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+    def append(self, row):
+        """
+        행을 스풀에 기록하고 바로 반환
+        """
+        with self._condition:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._write({'id': entry_id, 'row': row})
+            self._pending[entry_id] = row
+            self._stats['spooled'] += 1
+            if len(self._pending) >= self.batch_size:
+                self._condition.notify()
+        return {
+            'timestamp': datetime.now().isoformat(),
+            'status': 'queued',
+            'id': entry_id
+        }
+
+    def update_analysis_result(self, product_data, claude_result, gpt_result, validation=None):
+        """
+        GoogleSheetsSync.update_analysis_result 대신 사용 (행 구성은 같고 기록은 스풀 경유)
+        """
+        try:
+            row = self.sync.build_row(product_data, claude_result, gpt_result, validation)
+        except Exception as e:
+            return {
+                'timestamp': datetime.now().isoformat(),
+                'status': 'failed',
+                'error': str(e)
+            }
+        return self.append(row)
+
+    def start(self):
+        """
+        백그라운드 기록 스레드 시작 (재시작 시 복원한 행부터 기록)
+        """
+        with self._condition:
+            if self._thread is None:
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name='sheets-spool', daemon=True)
+                self._thread.start()
+        return self
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if not self._stopping and len(self._pending) < self.batch_size:
+                    self._condition.wait(self.flush_interval)
+                if self._stopping and not self._pending:
+                    return
+
+            if self.flush_once()['status'] == 'failed':
+                # Full jitter 백오프 (종료 요청 중이면 남은 행은 로그에 두고 종료)
+                delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** self._attempt))
+                with self._condition:
+                    if self._stopping:
+                        return
+                    self._condition.wait(delay)
+
+    def flush_once(self):
+        """
+        미기록 행을 최대 batch_size개 기록하고 완료 표시
+        - max_attempts번 연속 실패하면 묶음 크기를 반으로 줄이고, 한 행 묶음이면 dead-letter로 옮김
+        """
+        with self._flush_lock:
+            with self._condition:
+                batch = sorted(self._pending.items())[:self._batch_limit]
+            if not batch:
+                return {'status': 'success', 'rows': 0}
+
+            try:
+                self.sync.append_rows([row for _, row in batch], self.title)
+            except Exception as e:
+                with self._condition:
+                    self._attempt += 1
+                    self._stats['failed_flushes'] += 1
+                    self._stats['last_error'] = str(e)
+                    dead_lettered = 0
+                    if self._attempt >= self.max_attempts:
+                        self._attempt = 0
+                        if len(batch) > 1:
+                            self._batch_limit = max(1, len(batch) // 2)
+                        else:
+                            self._dead_letter(batch, str(e))
+                            dead_lettered = len(batch)
+                    pending = len(self._pending)
+                return {'status': 'failed', 'error': str(e), 'pending': pending, 'dead_lettered': dead_lettered}
+
+            ids = [entry_id for entry_id, _ in batch]
+            with self._condition:
+                self._write({'done': ids})
+                for entry_id in ids:
+                    self._pending.pop(entry_id, None)
+                self._attempt = 0
+                if not self._pending:
+                    self._batch_limit = self.batch_size
+                self._stats['flushed'] += len(ids)
+                self._stats['flushes'] += 1
+                self._done_since_compact += len(ids)
+                if self._done_since_compact >= self.compact_after:
+                    self._compact()
+            return {'status': 'success', 'rows': len(ids)}
+
+    def _dead_letter(self, batch, error):
+        """
+        계속 실패하는 행을 dead-letter 파일에 기록(fsync)한 뒤 로그에 완료 표시 (잠금 안에서 호출)
+        - 다시 기록하려면 파일의 row를 append로 다시 넣음
+        """
+        directory = os.path.dirname(self.dead_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.dead_path, 'a', encoding='utf-8') as f:
+            for entry_id, row in batch:
+                f.write(json.dumps({'id': entry_id, 'row': row, 'error': error,
+                                    'timestamp': datetime.now().isoformat()},
+                                   ensure_ascii=False, default=str) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+        ids = [entry_id for entry_id, _ in batch]
+        self._write({'done': ids, 'dead': True})
+        for entry_id in ids:
+            self._pending.pop(entry_id, None)
+        self._stats['dead_lettered'] += len(ids)
+        self._done_since_compact += len(ids)
+        # 문제 행을 뺐으므로 다시 원래 묶음 크기로
+        self._batch_limit = self.batch_size
+
+    def _compact(self):
+        """
+        미기록 행만 남긴 로그로 교체 (잠금 안에서 호출)
+        """
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            for entry_id, row in sorted(self._pending.items()):
+                f.write(json.dumps({'id': entry_id, 'row': row}, ensure_ascii=False, default=str) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        self._log.close()
+        os.replace(tmp_path, self.path)
+        self._log = open(self.path, 'a', encoding='utf-8')
+        self._done_since_compact = 0
+
+    def close(self, timeout=None):
+        """
+        남은 행 기록을 기다린 뒤 종료 (timeout 초과 시 남은 행은 로그에 두고 다음 실행에서 기록)
+        """
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        with self._condition:
+            if thread is None or not thread.is_alive():
+                self._thread = None
+                self._log.close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def stats(self):
+        with self._condition:
+            stats = dict(self._stats)
+            stats['pending'] = len(self._pending)
+        return stats
+
+if __name__ == "__main__":
+    # 테스트 데이터 (분석 실패 결과도 원문 그대로 기록)
+    test_product = {'name': 'Canadian Omega-3 Fish Oil', 'price_cad': 29.99, 'brand': 'NaturePath'}
+    failed = {'status': 'failed', 'error': 'not analyzed'}
+
+    with SheetsSpool(batch_size=50, flush_interval=1) as spool:
+        for _ in range(3):
+            print(json.dumps(spool.update_analysis_result(test_product, failed, failed), ensure_ascii=False))
+    print(json.dumps(spool.stats(), ensure_ascii=False, indent=2))
@@ -7,10 +7,14 @@
 """
 
 import os
+import sys
 import json
 from datetime import datetime
 from dotenv import load_dotenv
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data-collection'))
+from product_record import ProductRecord
+
 class FieldResearch:
     def __init__(self):
         self.research_data = []
@@ -18,12 +22,17 @@ class FieldResearch:
     def add_research_data(self, data):
         """
         현지 조사 데이터 추가
+        - 가격이 없거나 읽을 수 없으면 price_cad는 None (예전 기본값 0은 무료 제품으로 계산되어 바꿈)
         """
+        # 가격 문자열('$24.99' 등)도 입력 시 한 번만 파싱
+        record = ProductRecord.from_research(data)
+        
         research_entry = {
             'timestamp': datetime.now().isoformat(),
-            'product_name': data.get('product_name', ''),
+            'product_name': record.name,
             'store_location': data.get('store_location', ''),
-            'price_cad': data.get('price_cad', 0),
+            # CAD가 아니면 None (원래 통화 가격은 price/currency)
+            'price_cad': record.price_cad,
             'discount_info': data.get('discount_info', ''),
             'stock_status': data.get('stock_status', ''),
             'photo_urls': data.get('photo_urls', []),
@@ -32,6 +41,9 @@ class FieldResearch:
             'quality_score': data.get('quality_score', 0),  # 1-5점
             'recommendation': data.get('recommendation', '')  # 추천/보류/비추천
         }
+        if record.currency != 'CAD':
+            research_entry['price'] = record.price
+            research_entry['currency'] = record.currency
         
         self.research_data.append(research_entry)
         
@@ -61,6 +73,12 @@ class FieldResearch:
         
         return summary
     
+    def to_records(self):
+        """
+        조사 항목을 ProductRecord로 변환 (분석/시트 연동용)
+        """
+        return [ProductRecord.from_research(entry) for entry in self.research_data]
+    
     def export_to_sheets(self):
         """
         Google Sheets로 데이터 내보내기
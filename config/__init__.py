@@ -0,0 +1,9 @@
+# Config Module
+# 공용 API 클라이언트 / 환경 변수
+
+from .clients import (
+    load_env, anthropic_client, openai_client, firecrawl_app,
+    http_session, sheets_client, reset_clients
+)
+
+__version__ = "1.0.0"
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+공용 API 클라이언트 레지스트리
+- 프로세스당 제공자별 클라이언트 하나 (처음 사용할 때 생성, 스레드 안전)
+- 제공자별 HTTP 연결 풀 공유 (keep-alive, 풀 크기 HTTP_POOL_SIZE)
+- requests 세션은 스레드 안전하지 않으므로 스레드별 세션, 연결 풀(HTTPAdapter)만 공유
+- .env는 프로세스당 한 번만 로드
+"""
+
+import os
+import threading
+from dotenv import load_dotenv
+
+_lock = threading.RLock()
+_clients = {}
+_env_loaded = False
+# 스레드별 requests 세션 (reset_clients에서 모두 닫기 위해 목록도 보관)
+_thread_sessions = threading.local()
+_sessions = []
+
+# 제공자별 연결 풀 크기 (분석기/크롤러 동시 실행 수보다 크게)
+DEFAULT_POOL_SIZE = 20
+# 유휴 keep-alive 연결 유지 시간 (초)
+KEEPALIVE_EXPIRY = 60
+
+
+def load_env():
+    """
+    .env 로드 (이미 로드했으면 아무것도 하지 않음)
+    """
+    global _env_loaded
+    if _env_loaded:
+        return
+    with _lock:
+        if not _env_loaded:
+            load_dotenv()
+            _env_loaded = True
+
+
+def _get(name, factory):
+    """
+    이름별 클라이언트 조회, 없으면 잠금 안에서 한 번만 생성
+    """
+    client = _clients.get(name)
+    if client is not None:
+        return client
+    with _lock:
+        client = _clients.get(name)
+        if client is None:
+            load_env()
+            client = _clients[name] = factory()
+    return client
+
+
+def _pool_size():
+    return int(os.getenv('HTTP_POOL_SIZE', DEFAULT_POOL_SIZE))
+
+
+def _httpx_client(sdk):
+    """
+    SDK 기본 설정(타임아웃 등)을 유지한 httpx 클라이언트에 연결 풀 크기만 조정
+    """
+    import httpx
+
+    size = _pool_size()
+    limits = httpx.Limits(max_connections=size, max_keepalive_connections=size,
+                          keepalive_expiry=KEEPALIVE_EXPIRY)
+    return sdk.DefaultHttpxClient(limits=limits)
+
+
+def anthropic_client():
+    def create():
+        import anthropic
+        return anthropic.Anthropic(api_key=os.getenv('CLAUDE_API_KEY'), http_client=_httpx_client(anthropic))
+    return _get('anthropic', create)
+
+
+def openai_client():
+    def create():
+        import openai
+        return openai.OpenAI(api_key=os.getenv('OPENAI_API_KEY'), http_client=_httpx_client(openai))
+    return _get('openai', create)
+
+
+def firecrawl_app():
+    """
+    Firecrawl 클라이언트
+    - FirecrawlApp은 요청마다 requests 모듈 함수를 직접 호출해 세션/연결 풀을 주입할 수 없음
+      (공유는 클라이언트 인스턴스와 API 키별 속도 제한기 rate_limiter.shared_limiter까지)
+    """
+    def create():
+        from firecrawl import FirecrawlApp
+        return FirecrawlApp(api_key=os.getenv('FIRECRAWL_API_KEY'))
+    return _get('firecrawl', create)
+
+
+def _http_adapter():
+    """
+    requests 연결 풀 (스레드별 세션이 함께 사용, urllib3 풀은 스레드 안전)
+    """
+    def create():
+        from requests.adapters import HTTPAdapter
+        size = _pool_size()
+        return HTTPAdapter(pool_connections=size, pool_maxsize=size)
+    return _get('http_adapter', create)
+
+
+def http_session():
+    """
+    제품 페이지 직접 요청용 requests 세션 (호출한 스레드 전용, 연결 풀은 프로세스 공용)
+    - requests.Session은 쿠키/헤더 상태가 있어 스레드 간에 공유하지 않음
+    """
+    session = getattr(_thread_sessions, 'session', None)
+    if session is not None:
+        return session
+
+    import requests
+    adapter = _http_adapter()
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['User-Agent'] = 'Mozilla/5.0 (compatible; JookeSourcingBot/1.0)'
+    with _lock:
+        _sessions.append(session)
+    _thread_sessions.session = session
+    return session
+
+
+def sheets_client():
+    """
+    gspread 클라이언트 (서비스 계정 인증은 처음 사용할 때 한 번)
+    """
+    def create():
+        import gspread
+        return gspread.service_account(filename=os.getenv('GOOGLE_SERVICE_ACCOUNT_JSON'))
+    return _get('sheets', create)
+
+
+def reset_clients():
+    """
+    공용 클라이언트/스레드별 세션 모두 닫고 제거 (fork 후 자식 프로세스, 테스트용)
+    """
+    global _thread_sessions
+    with _lock:
+        clients = list(_clients.values()) + _sessions
+        _clients.clear()
+        _sessions.clear()
+        _thread_sessions = threading.local()
+    for client in clients:
+        close = getattr(client, 'close', None)
+        if callable(close):
+            close()
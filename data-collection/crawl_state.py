@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+카테고리 재크롤링 상태 저장소
+- 페이지별 콘텐츠 지문 (마크다운 해시) 저장
+- 이전 크롤링 대비 추가/변경/삭제 페이지 판별
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+
+
+def content_fingerprint(markdown):
+    """
+    공백 차이를 무시한 마크다운 콘텐츠 지문
+    """
+    normalized = re.sub(r'\s+', ' ', markdown or '').strip()
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
+class CrawlStateStore:
+    def __init__(self, path=None):
+        self.path = path or os.getenv('CRAWL_STATE_PATH', '.cache/crawl_state.sqlite3')
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                category TEXT NOT NULL,
+                url TEXT NOT NULL,
+                fingerprint TEXT NOT NULL,
+                updated_at REAL NOT NULL,
+                PRIMARY KEY (category, url)
+            )
+        """)
+        self._conn.commit()
+
+    def load(self, category):
+        """
+        카테고리의 이전 크롤링 지문 {url: fingerprint}
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT url, fingerprint FROM pages WHERE category = ?', (category,)
+            ).fetchall()
+        return dict(rows)
+
+    def diff(self, category, fingerprints):
+        """
+        현재 크롤링 지문 {url: fingerprint}을 이전 상태와 비교
+        """
+        previous = self.load(category)
+
+        added = [url for url in fingerprints if url not in previous]
+        changed = [url for url in fingerprints
+                   if url in previous and previous[url] != fingerprints[url]]
+        unchanged = [url for url in fingerprints
+                     if url in previous and previous[url] == fingerprints[url]]
+        removed = [url for url in previous if url not in fingerprints]
+
+        return {
+            'added': added,
+            'changed': changed,
+            'unchanged': unchanged,
+            'removed': removed
+        }
+
+    def update(self, category, fingerprints):
+        """
+        처리 완료된 페이지 지문 저장 {url: fingerprint}
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO pages (category, url, fingerprint, updated_at) VALUES (?, ?, ?, ?)',
+                [(category, url, fingerprint, now) for url, fingerprint in fingerprints.items()]
+            )
+            self._conn.commit()
+
+    def remove(self, category, urls):
+        """
+        사라진 페이지 지문 삭제
+        """
+        with self._lock:
+            self._conn.executemany(
+                'DELETE FROM pages WHERE category = ? AND url = ?',
+                [(category, url) for url in urls]
+            )
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -4,85 +4,404 @@ Firecrawl 기반 캐나다 사이트 크롤링
 """
 
 import os
+import sys
 import json
+import time
+from collections import deque
+from itertools import chain
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
-from firecrawl import FirecrawlApp
-from dotenv import load_dotenv
+from urllib.parse import urlparse
 
-load_dotenv()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from config.clients import load_env, firecrawl_app, http_session
+from local_extractor import LocalExtractor, missing_required
+from scrape_cache import ScrapeCache
+from url_frontier import canonicalize_url
+from rate_limiter import shared_limiter, RetriesExhausted
+from crawl_state import CrawlStateStore, content_fingerprint
+
+load_env()
+
+# 제품 정보 추출을 위한 스키마
+PRODUCT_EXTRACT_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "product_name": {"type": "string"},
+        "price": {"type": "string"},
+        "brand": {"type": "string"},
+        "description": {"type": "string"},
+        "ingredients": {"type": "array"},
+        "reviews_count": {"type": "number"},
+        "rating": {"type": "number"}
+    },
+    "required": ["product_name", "price"]
+}
 
 class FirecrawlScraper:
-    def __init__(self):
-        self.app = FirecrawlApp(api_key=os.getenv('FIRECRAWL_API_KEY'))
+    def __init__(self, cache=None, crawl_state=None, local_extractor=None, use_local=True, frontier=None,
+                 limiter=None, app=None, session=None):
+        # None이면 프로세스 공용 클라이언트/세션 (처음 사용할 때 생성)
+        self._app = app
+        self._session = session
+        # ScrapeCache 인스턴스 (None이면 캐시 미사용)
+        self.cache = cache
+        # CrawlStateStore 인스턴스 (증분 재크롤링용, 필요 시 생성)
+        self.crawl_state = crawl_state
+        # 로컬 추출기 (필수 필드를 못 채운 경우에만 Firecrawl extract 사용)
+        self.local_extractor = local_extractor or (LocalExtractor() if use_local else None)
+        # URLFrontier 인스턴스 (None이면 중복 제거 미사용)
+        self.frontier = frontier
+        # Firecrawl 요금제 한도에 맞춘 속도 제한/재시도/서킷 브레이커 (기본은 API 키별 공용)
+        self.limiter = limiter or shared_limiter(getattr(app, 'api_key', None))
+    
+    @property
+    def app(self):
+        return self._app or firecrawl_app()
+    
+    @property
+    def session(self):
+        return self._session or http_session()
         
-    def scrape_product_page(self, url):
+    def scrape_product_page(self, url, html=None, markdown=None, fresh=False):
         """
         제품 페이지 크롤링
+        - html/markdown을 이미 갖고 있으면 전달 (없으면 페이지 직접 요청)
+        - 로컬 추출 실패 시 Firecrawl extract로 대체
+        - fresh=True면 캐시를 읽지 않고 새로 수집 (결과는 캐시에 저장)
+        - 캐시 오류 포함 모든 예외는 이 URL의 failed 결과로 (scrape_many의 다른 URL에 영향 없음)
         """
-        try:
-            # 제품 정보 추출을 위한 스키마
-            extract_schema = {
-                "type": "object",
-                "properties": {
-                    "product_name": {"type": "string"},
-                    "price": {"type": "string"},
-                    "brand": {"type": "string"},
-                    "description": {"type": "string"},
-                    "ingredients": {"type": "array"},
-                    "reviews_count": {"type": "number"},
-                    "rating": {"type": "number"}
-                },
-                "required": ["product_name", "price"]
+        params = {
+            'formats': ['markdown', 'extract'],
+            'extract': {
+                'schema': PRODUCT_EXTRACT_SCHEMA
             }
+        }
+        
+        try:
+            cached = None if fresh else self._cache_get(url, params)
+            if cached:
+                return cached
             
-            result = self.app.scrape_url(
-                url, 
-                {
-                    'formats': ['markdown', 'extract'],
-                    'extract': {
-                        'schema': extract_schema
-                    }
-                }
-            )
+            local = self._extract_locally(url, html=html, markdown=markdown)
+            if local:
+                response = self._success_response(url, local, 'local')
+                self._cache_set(url, params, response)
+                return response
             
-            return {
-                'url': url,
+            result = self.limiter.call(self.app.scrape_url, url, params)
+            
+            response = self._success_response(url, result, 'firecrawl')
+            self._cache_set(url, params, response)
+            return response
+            
+        except Exception as e:
+            return self._failed_response({'url': url}, e)
+    
+    def _extract_locally(self, url, html=None, markdown=None):
+        """
+        로컬 추출 (필수 필드가 모두 채워진 경우에만 Firecrawl 결과 형태로 반환)
+        """
+        if self.local_extractor is None:
+            return None
+        
+        try:
+            if html is None and markdown is None:
+                page = self.session.get(url, timeout=15)
+                if page.status_code != 200:
+                    return None
+                html = page.text
+            
+            fields = self.local_extractor.extract(url, html=html, markdown=markdown)
+        except Exception:
+            return None
+        
+        if missing_required(fields):
+            return None
+        
+        return {
+            'markdown': markdown or '',
+            'extract': fields,
+            'metadata': {'sourceURL': url}
+        }
+    
+    def _success_response(self, url, data, extractor):
+        return {
+            'url': url,
+            'timestamp': datetime.now().isoformat(),
+            'data': data,
+            'extractor': extractor,
+            'status': 'success'
+        }
+    
+    def _failed_response(self, target, error):
+        """
+        실패 결과 (재시도를 다 쓰고 포기한 호출은 retries_exhausted/attempts 포함)
+        """
+        response = dict(target, timestamp=datetime.now().isoformat(), error=str(error), status='failed')
+        if isinstance(error, RetriesExhausted):
+            response['retries_exhausted'] = True
+            response['attempts'] = error.attempts
+        return response
+    
+    def _cache_get(self, url, params):
+        """
+        캐시 적중 시 저장된 결과에 cached 표시를 붙여 반환
+        """
+        if self.cache is None:
+            return None
+        
+        cached = self.cache.get(ScrapeCache.make_key(url, params))
+        if cached is not None:
+            cached['cached'] = True
+        return cached
+    
+    def _cache_set(self, url, params, response):
+        if self.cache is not None:
+            self.cache.set(ScrapeCache.make_key(url, params), response)
+            
+    def scrape_many(self, urls, max_workers=8, per_domain=2, ordered=True, fresh=False):
+        """
+        여러 제품 페이지 동시 크롤링
+        - max_workers: 전체 동시 요청 수
+        - per_domain: 도메인별 동시 요청 수 (사이트 부하/차단 방지)
+        - ordered=True: 입력 순서대로 리스트 반환
+        - ordered=False: 완료되는 순서대로 결과를 내보내는 제너레이터 반환
+        - frontier 사용 시 중복/최근 수집 URL은 status 'skipped'로 반환
+        - per_domain은 1 이상 (0 이하이면 ValueError)
+        - fresh=True면 캐시/frontier를 거치지 않고 모두 새로 수집 (수집 기록은 갱신)
+        """
+        if per_domain < 1:
+            raise ValueError(f'per_domain must be >= 1, got {per_domain}')
+        
+        # 제너레이터 등 한 번만 순회 가능한 입력도 받도록 먼저 리스트로 변환
+        urls = list(urls)
+        targets = list(enumerate(urls))
+        skipped = []
+        if self.frontier is not None and not fresh:
+            decisions = self.frontier.filter_new(urls)
+            targets = [(index, url) for index, url in targets if decisions[index] is not None]
+            skipped = [(index, self._skipped_response(url)) for index, url in enumerate(urls)
+                       if decisions[index] is None]
+        
+        completed = chain(skipped, self._scrape_concurrently(targets, max_workers, per_domain, fresh))
+        
+        if not ordered:
+            return (result for _, result in completed)
+        
+        results = [None] * len(urls)
+        for index, result in completed:
+            results[index] = result
+        return results
+    
+    def _skipped_response(self, url):
+        return {
+            'url': url,
+            'timestamp': datetime.now().isoformat(),
+            'reason': 'duplicate or fetched within freshness window',
+            'status': 'skipped'
+        }
+    
+    def _scrape_concurrently(self, targets, max_workers, per_domain, fresh=False):
+        """
+        도메인별 슬롯이 빈 URL만 풀에 제출하고 (index, 결과)를 완료 순서대로 반환
+        - targets: [(index, url), ...]
+        """
+        pending = {}
+        for index, url in targets:
+            domain = urlparse(url).netloc.lower()
+            pending.setdefault(domain, deque()).append((index, url))
+        
+        in_flight = {}
+        domain_load = {domain: 0 for domain in pending}
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while pending or in_flight:
+                # 빈 슬롯이 있는 도메인부터 돌아가며 제출
+                for domain in list(pending):
+                    if len(in_flight) >= max_workers:
+                        break
+                    queue = pending[domain]
+                    while queue and domain_load[domain] < per_domain and len(in_flight) < max_workers:
+                        index, url = queue.popleft()
+                        future = executor.submit(self.scrape_product_page, url, fresh=fresh)
+                        in_flight[future] = (index, domain)
+                        domain_load[domain] += 1
+                    if not queue:
+                        del pending[domain]
+                
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    index, domain = in_flight.pop(future)
+                    domain_load[domain] -= 1
+                    result = future.result()
+                    if self.frontier is not None and result['status'] == 'success':
+                        self.frontier.mark_fetched([result['url']])
+                    yield index, result
+            
+    def scrape_category(self, base_url, max_pages=5, fresh=False):
+        """
+        카테고리 페이지 크롤링
+        - fresh=True면 캐시를 읽지 않고 새로 크롤링 (결과는 캐시에 저장)
+        """
+        params = {
+            'crawlerOptions': {
+                'maxDepth': 2,
+                'limit': max_pages
+            },
+            'pageOptions': {
+                'formats': ['markdown']
+            }
+        }
+        
+        cached = None if fresh else self._cache_get(base_url, params)
+        if cached:
+            return cached
+        
+        try:
+            with self.limiter.crawl_slot():
+                result = self.limiter.call(self.app.crawl_url, base_url, params)
+            
+            response = {
+                'base_url': base_url,
                 'timestamp': datetime.now().isoformat(),
+                'pages_crawled': len(result.get('data', [])),
                 'data': result,
                 'status': 'success'
             }
+            self._cache_set(base_url, params, response)
+            return response
             
         except Exception as e:
-            return {
-                'url': url,
-                'timestamp': datetime.now().isoformat(),
-                'error': str(e),
-                'status': 'failed'
+            return self._failed_response({'base_url': base_url}, e)
+    
+    def scrape_category_incremental(self, base_url, max_pages=5):
+        """
+        카테고리 증분 재크롤링
+        - 마크다운 지문을 이전 크롤링과 비교
+        - 새 페이지/변경 페이지만 구조화 추출 (scrape_many)
+        - 추가/변경/삭제 페이지 목록 보고
+        - 캐시된 크롤링 결과로 비교하면 TTL 동안 변경을 놓치므로 캐시를 거치지 않음
+        - 새/변경 페이지는 frontier 신선도 기간 안이어도 다시 추출
+        - 정규화 URL은 비교 키로만 쓰고, 추출 요청은 크롤링이 돌려준 원래 URL로
+          (www 제거/https 강제 URL은 사이트에 따라 리다이렉트/404)
+        """
+        crawl = self.scrape_category(base_url, max_pages=max_pages, fresh=True)
+        if crawl['status'] != 'success':
+            return crawl
+        
+        if self.crawl_state is None:
+            self.crawl_state = CrawlStateStore()
+        
+        category = canonicalize_url(base_url)
+        fingerprints = {}
+        markdowns = {}
+        # 정규화 URL → 크롤링이 돌려준 원래 URL (같은 페이지가 여러 번 나오면 처음 것)
+        sources = {}
+        for page in crawl['data'].get('data', []):
+            url = self._page_url(page)
+            if url:
+                key = canonicalize_url(url)
+                sources.setdefault(key, url)
+                markdowns[key] = page.get('markdown', '')
+                fingerprints[key] = content_fingerprint(markdowns[key])
+        
+        diff = self.crawl_state.diff(category, fingerprints)
+        
+        # 이미 받은 마크다운으로 먼저 로컬 추출, 나머지만 개별 크롤링 (결과는 (정규화 URL, 결과) 쌍)
+        extracted = []
+        remaining = []
+        for key in diff['added'] + diff['changed']:
+            local = self._extract_locally(sources[key], markdown=markdowns[key])
+            if local:
+                extracted.append((key, self._success_response(sources[key], local, 'local')))
+            else:
+                remaining.append(key)
+        
+        # 로컬 추출 페이지도 수집 기록 (scrape_many를 거친 페이지는 거기서 기록)
+        if self.frontier is not None and extracted:
+            self.frontier.mark_fetched([result['url'] for _, result in extracted])
+        if remaining:
+            extracted += zip(remaining, self.scrape_many([sources[key] for key in remaining], fresh=True))
+        
+        # 추출에 성공한 페이지만 지문 갱신 (실패 페이지는 다음 실행에서 재시도)
+        succeeded = {key: fingerprints[key] for key, result in extracted if result['status'] == 'success'}
+        self.crawl_state.update(category, succeeded)
+        self.crawl_state.remove(category, diff['removed'])
+        
+        return {
+            'base_url': base_url,
+            'timestamp': datetime.now().isoformat(),
+            'pages_crawled': len(fingerprints),
+            'added': diff['added'],
+            'changed': diff['changed'],
+            'removed': diff['removed'],
+            'unchanged_count': len(diff['unchanged']),
+            'extracted': [result for _, result in extracted],
+            'failed_count': len([r for _, r in extracted if r['status'] == 'failed']),
+            'skipped_count': len([r for _, r in extracted if r['status'] == 'skipped']),
+            'status': 'success'
+        }
+    
+    def iter_category_pages(self, base_url, max_pages=5, poll_interval=2):
+        """
+        카테고리 크롤링 스트리밍
+        - 크롤링 작업을 비동기로 시작하고 상태를 폴링
+        - 새로 수집된 페이지를 정규화된 레코드로 하나씩 반환 (전체 결과를 메모리에 쌓지 않음)
+        - 크롤링 작업 실패 시 RuntimeError
+        """
+        params = {
+            'crawlerOptions': {
+                'maxDepth': 2,
+                'limit': max_pages
+            },
+            'pageOptions': {
+                'formats': ['markdown']
             }
+        }
+        
+        with self.limiter.crawl_slot():
+            job = self.limiter.call(self.app.crawl_url, base_url, params, wait_until_done=False)
+            job_id = job.get('jobId') or job.get('id')
+            seen = set()
             
-    def scrape_category(self, base_url, max_pages=5):
+            while True:
+                status = self.limiter.call(self.app.check_crawl_status, job_id)
+                state = status.get('status')
+                pages = status.get('data') or status.get('partial_data') or []
+                
+                for page in pages:
+                    url = canonicalize_url(self._page_url(page) or '')
+                    if url in seen:
+                        continue
+                    seen.add(url)
+                    yield self._page_record(base_url, page)
+                
+                if state == 'completed':
+                    return
+                if state in ('failed', 'cancelled'):
+                    raise RuntimeError(f"crawl job {job_id} {state}: {status.get('error', '')}")
+                
+                time.sleep(poll_interval)
+    
+    def write_category_jsonl(self, base_url, output_path, max_pages=5, poll_interval=2):
         """
-        카테고리 페이지 크롤링
+        카테고리 크롤링 결과를 페이지 단위로 JSONL 파일에 바로 기록
         """
+        pages_written = 0
+        
         try:
-            result = self.app.crawl_url(
-                base_url,
-                {
-                    'crawlerOptions': {
-                        'maxDepth': 2,
-                        'limit': max_pages
-                    },
-                    'pageOptions': {
-                        'formats': ['markdown']
-                    }
-                }
-            )
+            with open(output_path, 'a', encoding='utf-8') as f:
+                for record in self.iter_category_pages(base_url, max_pages=max_pages, poll_interval=poll_interval):
+                    f.write(json.dumps(record, ensure_ascii=False) + '\n')
+                    f.flush()
+                    pages_written += 1
             
             return {
                 'base_url': base_url,
                 'timestamp': datetime.now().isoformat(),
-                'pages_crawled': len(result.get('data', [])),
-                'data': result,
+                'output_path': output_path,
+                'pages_written': pages_written,
                 'status': 'success'
             }
             
@@ -90,9 +409,33 @@ class FirecrawlScraper:
             return {
                 'base_url': base_url,
                 'timestamp': datetime.now().isoformat(),
+                'output_path': output_path,
+                'pages_written': pages_written,
                 'error': str(e),
                 'status': 'failed'
             }
+    
+    def _page_record(self, base_url, page):
+        """
+        크롤링 페이지 정규화 레코드
+        """
+        metadata = page.get('metadata') or {}
+        return {
+            'base_url': base_url,
+            'url': self._page_url(page),
+            'title': metadata.get('title', ''),
+            'markdown': page.get('markdown', ''),
+            'metadata': metadata,
+            'timestamp': datetime.now().isoformat()
+        }
+    
+    @staticmethod
+    def _page_url(page):
+        """
+        크롤링 결과 페이지의 원본 URL
+        """
+        metadata = page.get('metadata') or {}
+        return metadata.get('sourceURL') or metadata.get('url') or page.get('url')
 
 if __name__ == "__main__":
     scraper = FirecrawlScraper()
@@ -100,5 +443,10 @@ if __name__ == "__main__":
     # 테스트 URL
     test_url = "https://well.ca/categories/vitamins-supplements_3.html"
     
-    result = scraper.scrape_category(test_url, max_pages=3)
-    print(json.dumps(result, ensure_ascii=False, indent=2))
\ No newline at end of file
+    # 사용법: python firecrawl_scraper.py [output.jsonl]
+    if len(sys.argv) > 1:
+        result = scraper.write_category_jsonl(test_url, sys.argv[1], max_pages=3)
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        for record in scraper.iter_category_pages(test_url, max_pages=3):
+            print(json.dumps(record, ensure_ascii=False))
@@ -0,0 +1,241 @@
+#!/usr/bin/env python3
+"""
+로컬 제품 정보 추출기 (Firecrawl extract 대체 경로)
+- JSON-LD / microdata 우선
+- 사이트별 CSS 셀렉터 보조
+- 마크다운만 있는 경우 제목/가격 패턴 추출 (추정값, 필수 필드를 채운 것으로 보지 않음)
+"""
+
+import re
+import json
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
+
+# Firecrawl 추출 스키마와 동일한 필드
+FIELDS = ['product_name', 'price', 'brand', 'description', 'ingredients', 'reviews_count', 'rating']
+REQUIRED_FIELDS = ['product_name', 'price']
+# 마크다운 패턴으로 채운 필드 목록을 담는 키 ("$49 이상 무료배송" 같은 배너도 가격으로 잡힘)
+GUESSED_KEY = 'guessed_fields'
+
+# 사이트별 CSS 셀렉터 (register_retailer로 추가 가능)
+RETAILER_SELECTORS = {
+    'well.ca': {
+        'product_name': 'h1.product-name, h1[itemprop="name"], .product-info h1',
+        'price': '.product-price, .product_price, [itemprop="price"]',
+        'brand': '.product-brand a, .product-brand, [itemprop="brand"]',
+        'description': '.product-description, #product-description',
+        'ingredients': '.product-ingredients, #ingredients',
+        'rating': '.rating-value, [itemprop="ratingValue"]',
+        'reviews_count': '.review-count, [itemprop="reviewCount"]'
+    },
+    'shoppersdrugmart.ca': {
+        'product_name': 'h1[data-testid="product-title"], h1.product-title',
+        'price': '[data-testid="price-container"], .product-price',
+        'brand': '[data-testid="product-brand"], .product-brand',
+        'description': '[data-testid="product-description"], .product-description',
+        'ingredients': '[data-testid="product-ingredients"], .product-ingredients',
+        'rating': '[data-testid="rating-value"], .bv_avgRating_component_container',
+        'reviews_count': '[data-testid="review-count"], .bv_numReviews_text'
+    },
+    'amazon.ca': {
+        'product_name': '#productTitle',
+        'price': '.a-price .a-offscreen, #priceblock_ourprice',
+        'brand': '#bylineInfo',
+        'description': '#feature-bullets, #productDescription',
+        'ingredients': '#important-information .content',
+        'rating': '#acrPopover .a-icon-alt, span[data-hook="rating-out-of-text"]',
+        'reviews_count': '#acrCustomerReviewText'
+    }
+}
+
+PRICE_PATTERN = re.compile(r'(?:CA?\$|\$)\s?(\d{1,5}(?:[.,]\d{2})?)')
+NUMBER_PATTERN = re.compile(r'\d+(?:[.,]\d+)*')
+
+
+def register_retailer(domain, selectors):
+    """
+    사이트별 CSS 셀렉터 등록
+    """
+    RETAILER_SELECTORS[domain.lower()] = selectors
+
+
+def missing_required(fields):
+    """
+    필수 필드 중 비어 있는 항목 (마크다운 추정값만 있는 필드도 비어 있는 것으로 봄)
+    """
+    guessed = fields.get(GUESSED_KEY) or ()
+    return [name for name in REQUIRED_FIELDS if not fields.get(name) or name in guessed]
+
+
+class LocalExtractor:
+    def __init__(self, selectors=None):
+        self.selectors = selectors if selectors is not None else RETAILER_SELECTORS
+
+    def extract(self, url, html=None, markdown=None):
+        """
+        HTML 또는 마크다운에서 제품 필드 추출
+        - 앞 단계에서 채운 필드는 덮어쓰지 않음
+        - 마크다운 추정으로 채운 필드는 GUESSED_KEY 목록에 기록
+        """
+        fields = {}
+
+        if html:
+            soup = BeautifulSoup(html, 'lxml')
+            self._merge(fields, self._from_json_ld(soup))
+            self._merge(fields, self._from_microdata(soup))
+            self._merge(fields, self._from_selectors(soup, url))
+
+        if markdown and missing_required(fields):
+            found = self._from_markdown(markdown)
+            guessed = [name for name in found if not fields.get(name)]
+            self._merge(fields, found)
+            if guessed:
+                fields[GUESSED_KEY] = guessed
+
+        return fields
+
+    def _merge(self, fields, found):
+        for name, value in found.items():
+            if value not in (None, '', []) and not fields.get(name):
+                fields[name] = value
+
+    def _from_json_ld(self, soup):
+        """
+        <script type="application/ld+json">의 Product 객체
+        """
+        for script in soup.find_all('script', type='application/ld+json'):
+            try:
+                data = json.loads(script.string or '')
+            except (TypeError, ValueError):
+                continue
+
+            product = self._find_product(data)
+            if product:
+                return self._from_schema_org(product)
+
+        return {}
+
+    def _find_product(self, data):
+        if isinstance(data, list):
+            for item in data:
+                found = self._find_product(item)
+                if found:
+                    return found
+            return None
+
+        if not isinstance(data, dict):
+            return None
+
+        types = data.get('@type')
+        if types == 'Product' or (isinstance(types, list) and 'Product' in types):
+            return data
+        if '@graph' in data:
+            return self._find_product(data['@graph'])
+        return None
+
+    def _from_schema_org(self, product):
+        offers = product.get('offers') or {}
+        if isinstance(offers, list):
+            offers = offers[0] if offers else {}
+        brand = product.get('brand') or ''
+        if isinstance(brand, dict):
+            brand = brand.get('name', '')
+        rating = product.get('aggregateRating') or {}
+
+        price = offers.get('price') or offers.get('lowPrice')
+        currency = offers.get('priceCurrency', '')
+
+        return {
+            'product_name': product.get('name', ''),
+            'price': f"{currency} {price}".strip() if price is not None else '',
+            'brand': brand,
+            'description': product.get('description', ''),
+            'rating': self._to_number(rating.get('ratingValue'), float),
+            'reviews_count': self._to_number(rating.get('reviewCount') or rating.get('ratingCount'), int)
+        }
+
+    def _from_microdata(self, soup):
+        """
+        itemprop 속성 (schema.org microdata)
+        """
+        scope = soup.find(attrs={'itemtype': re.compile(r'schema\.org/Product')})
+        if scope is None:
+            return {}
+
+        def prop(name):
+            tag = scope.find(attrs={'itemprop': name})
+            if tag is None:
+                return ''
+            return (tag.get('content') or tag.get_text(' ', strip=True)).strip()
+
+        price = prop('price')
+        currency = prop('priceCurrency')
+
+        return {
+            'product_name': prop('name'),
+            'price': f"{currency} {price}".strip() if price else '',
+            'brand': prop('brand'),
+            'description': prop('description'),
+            'rating': self._to_number(prop('ratingValue'), float),
+            'reviews_count': self._to_number(prop('reviewCount'), int)
+        }
+
+    def _from_selectors(self, soup, url):
+        """
+        사이트별 CSS 셀렉터
+        """
+        host = urlparse(url).hostname or ''
+        # 도메인 자체 또는 하위 도메인만 (notwell.ca가 well.ca와 맞지 않도록 점 경계 확인)
+        selectors = next((s for domain, s in self.selectors.items()
+                          if host == domain or host.endswith('.' + domain)), None)
+        if not selectors:
+            return {}
+
+        found = {}
+        for name, selector in selectors.items():
+            tag = soup.select_one(selector)
+            if tag is None:
+                continue
+            text = (tag.get('content') or tag.get_text(' ', strip=True)).strip()
+
+            if name == 'rating':
+                found[name] = self._to_number(text, float)
+            elif name == 'reviews_count':
+                found[name] = self._to_number(text, int)
+            elif name == 'ingredients':
+                found[name] = [item.strip() for item in re.split(r'[,;]', text) if item.strip()]
+            else:
+                found[name] = text
+
+        return found
+
+    def _from_markdown(self, markdown):
+        """
+        마크다운 첫 제목을 제품명, 첫 가격 패턴을 가격으로 사용
+        """
+        found = {}
+
+        heading = re.search(r'^#{1,2}\s+(.+)$', markdown, re.MULTILINE)
+        if heading:
+            found['product_name'] = heading.group(1).strip()
+
+        price = PRICE_PATTERN.search(markdown)
+        if price:
+            found['price'] = price.group(0).strip()
+
+        return found
+
+    @staticmethod
+    def _to_number(value, cast):
+        if value in (None, ''):
+            return None
+        if isinstance(value, (int, float)):
+            return cast(value)
+
+        match = NUMBER_PATTERN.search(str(value))
+        if not match:
+            return None
+        try:
+            return cast(float(match.group(0).replace(',', '')))
+        except ValueError:
+            return None
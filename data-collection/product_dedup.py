@@ -0,0 +1,279 @@
+#!/usr/bin/env python3
+"""
+유사 중복 제품 탐지 (분석 전 단계)
+- 제품명 + 브랜드 + 용량을 정규화해 문자 shingle → MinHash 서명 (NumPy 일괄 계산)
+- LSH 밴드 버킷으로 후보 쌍만 비교 (전체 쌍 비교 없이 수십만 건 처리)
+- 서명 유사도 + 용량 일치(클러스터 단위)로 확인 후 클러스터링, 클러스터당 대표 제품 하나만 분석하고 결과를 구성원에게 전달
+- 이름/브랜드가 비어 비교할 수 없는 제품은 병합하지 않음
+"""
+
+import re
+import json
+import zlib
+import unicodedata
+import numpy as np
+
+# 빈 shingle 집합의 서명 값 (uint32 최댓값)
+_EMPTY = np.iinfo(np.uint32).max
+
+# 용량 표기 (숫자 + 단위) → 정규화 단위
+SIZE_PATTERN = re.compile(
+    r'(\d+(?:[.,]\d+)?)\s*(ml|l|g|kg|mg|oz|lb|softgels?|capsules?|caps|tablets?|tabs|count|ct|pcs|pack)\b',
+    re.IGNORECASE
+)
+SIZE_UNITS = {
+    'ml': ('ml', 1), 'l': ('ml', 1000), 'g': ('g', 1), 'kg': ('g', 1000), 'mg': ('g', 0.001),
+    'oz': ('g', 28.35), 'lb': ('g', 453.6),
+    'softgel': ('ea', 1), 'softgels': ('ea', 1), 'capsule': ('ea', 1), 'capsules': ('ea', 1), 'caps': ('ea', 1),
+    'tablet': ('ea', 1), 'tablets': ('ea', 1), 'tabs': ('ea', 1), 'count': ('ea', 1), 'ct': ('ea', 1),
+    'pcs': ('ea', 1), 'pack': ('pack', 1)
+}
+# 사이트마다 붙는 판매 문구 (비교에서 제외)
+NOISE_WORDS = {'new', 'sale', 'value', 'size', 'bonus', 'pack', 'bottle', 'the', 'with', 'and', 'for'}
+
+# 대표 제품 선택 시 채워진 필드 수를 보는 항목
+COMPLETENESS_FIELDS = ('name', 'brand', 'price_cad', 'description', 'ingredients', 'rating', 'reviews_count')
+
+
+def extract_size(text):
+    """
+    텍스트의 첫 용량 표기 → '단위:정규화 수치' (예: '120 Softgels' → 'ea:120', '1 L' → 'ml:1000'), 없으면 None
+    """
+    match = SIZE_PATTERN.search(text or '')
+    if not match:
+        return None
+    amount = float(match.group(1).replace(',', '.'))
+    unit, factor = SIZE_UNITS[match.group(2).lower()]
+    return f"{unit}:{round(amount * factor, 1):g}"
+
+
+def normalize_text(product):
+    """
+    제품 → 비교용 정규화 문자열 (브랜드 + 제품명, 용량 표기/판매 문구/기호 제거)
+    """
+    name = product.get('name') or product.get('product_name') or ''
+    brand = product.get('brand') or ''
+    text = unicodedata.normalize('NFKC', f"{brand} {name}").lower()
+    text = SIZE_PATTERN.sub(' ', text)
+    words = re.findall(r'[0-9a-z가-힣]+', text)
+    return ' '.join(word for word in words if word not in NOISE_WORDS)
+
+
+def shingles(text, size=4):
+    """
+    문자 shingle 해시 배열 (짧은 문자열은 전체를 하나로)
+    """
+    if len(text) <= size:
+        grams = [text] if text else []
+    else:
+        grams = {text[i:i + size] for i in range(len(text) - size + 1)}
+    return np.array([zlib.crc32(gram.encode('utf-8')) for gram in grams], dtype=np.uint64)
+
+
+class ProductDeduplicator:
+    def __init__(self, threshold=0.6, num_perm=128, bands=32, shingle_size=4, seed=7, chunk_size=1000):
+        if num_perm % bands:
+            raise ValueError('num_perm must be divisible by bands')
+        # 추정 Jaccard 유사도가 이 값 이상이고 용량이 같으면 같은 제품
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.shingle_size = shingle_size
+        # 서명 계산 시 한 번에 처리할 제품 수 (메모리 상한)
+        self.chunk_size = chunk_size
+        # 누적 처리 제품 수 / 클러스터 수 / 분석을 건너뛴 중복 제품 수
+        self.stats = {'products': 0, 'clusters': 0, 'duplicates': 0}
+
+        # multiply-shift 해시 계수 (uint64 곱셈 wrap-around 후 상위 32비트, 나머지 연산 없음)
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+        # 밴드 값 → 버킷 키 결합 계수
+        self._band_mix = rng.integers(1, 2 ** 63, size=self.rows, dtype=np.uint64) | np.uint64(1)
+
+    def signatures(self, products):
+        """
+        제품 목록 → (제품 수, num_perm) MinHash 서명 행렬
+        - 제품 묶음마다 shingle을 이어 붙여 한 번에 해시, reduceat으로 제품별 최솟값
+        """
+        products = [self._as_dict(product) for product in products]
+        result = np.full((len(products), self.num_perm), _EMPTY, dtype=np.uint32)
+
+        for start in range(0, len(products), self.chunk_size):
+            chunk = [shingles(normalize_text(p), self.shingle_size) for p in products[start:start + self.chunk_size]]
+            lengths = np.array([len(values) for values in chunk])
+            nonempty = np.flatnonzero(lengths)
+            if not nonempty.size:
+                continue
+
+            values = np.concatenate([chunk[i] for i in nonempty])
+            offsets = np.concatenate(([0], np.cumsum(lengths[nonempty])[:-1]))
+            # (num_perm, shingle 수) 배치 → 제품 구간별 최솟값 (연속 축 reduceat, 임시 배열 재사용)
+            hashed = self._a[:, None] * values[None, :]
+            hashed += self._b[:, None]
+            hashed >>= np.uint64(32)
+            result[start + nonempty] = np.minimum.reduceat(hashed, offsets, axis=1).T
+
+        return result
+
+    def cluster(self, products):
+        """
+        제품 목록 → 제품별 클러스터 번호 배열 (클러스터 번호 = 대표 제품 인덱스)
+        """
+        products = [self._as_dict(product) for product in products]
+        count = len(products)
+        if not count:
+            return np.array([], dtype=np.int64)
+
+        signatures = self.signatures(products)
+        sizes = [extract_size(f"{p.get('name') or p.get('product_name') or ''} {p.get('size') or ''}") or ''
+                 for p in products]
+        _, size_codes = np.unique(sizes, return_inverse=True)
+        size_codes = np.where(np.asarray(sizes) == '', -1, size_codes.ravel())
+        heads, members = self.candidate_pairs(signatures, size_codes)
+
+        # 후보 쌍 확인: 추정 Jaccard 유사도 + 용량 (둘 다 있으면 같아야 함)
+        # 정규화 문자열이 빈 제품은 서명이 모두 _EMPTY로 같으므로 병합하지 않음 (각자 클러스터)
+        empty = (signatures == _EMPTY).all(axis=1)
+        similarity = (signatures[heads] == signatures[members]).mean(axis=1)
+        size_ok = (size_codes[heads] == size_codes[members]) | (size_codes[heads] < 0) | (size_codes[members] < 0)
+        confirmed = (similarity >= self.threshold) & size_ok & ~empty[heads] & ~empty[members]
+
+        parent = list(range(count))
+        # 클러스터(루트)별 용량 코드: 구성원 중 용량이 있는 제품의 용량, 없으면 -1
+        root_size = size_codes.tolist()
+
+        def find(index):
+            while parent[index] != index:
+                parent[index] = parent[parent[index]]
+                index = parent[index]
+            return index
+
+        for head, member in zip(heads[confirmed].tolist(), members[confirmed].tolist()):
+            root_head, root_member = find(head), find(member)
+            if root_head == root_member:
+                continue
+            # 용량은 쌍이 아니라 클러스터 단위로 확인 (용량 없는 제품을 거쳐 120/60 Softgels가 합쳐지지 않도록)
+            size_head, size_member = root_size[root_head], root_size[root_member]
+            if size_head >= 0 and size_member >= 0 and size_head != size_member:
+                continue
+            root, child = min(root_head, root_member), max(root_head, root_member)
+            parent[child] = root
+            root_size[root] = max(size_head, size_member)
+
+        roots = np.array([find(index) for index in range(count)])
+        return self._choose_canonical(products, roots)
+
+    def candidate_pairs(self, signatures, size_codes=None):
+        """
+        LSH 후보 쌍 (heads, members) 배열
+        - 밴드마다 값이 같은 제품끼리 같은 버킷, 버킷 안에서 용량 코드별로 다시 묶음 (size_codes, 없으면 -1)
+        - 같은 용량 묶음은 묶음 첫 제품과 나머지를 쌍으로, 묶음 첫 제품끼리는 버킷 첫 묶음(용량 없는 제품이
+          있으면 그 묶음)과 쌍으로 → 버킷 크기에 선형이고, 버킷 첫 제품과 용량이 달라도 같은 용량끼리는 연결
+        - 버킷 키는 밴드 값의 64비트 결합 (드문 키 충돌은 유사도 확인 단계에서 걸러짐)
+        - 여러 밴드에서 나온 같은 쌍은 한 번만
+        """
+        if size_codes is None:
+            size_codes = np.full(len(signatures), -1)
+        heads, members = [], []
+        positions = np.arange(len(signatures))
+        for band in range(self.bands):
+            block = signatures[:, band * self.rows:(band + 1) * self.rows].astype(np.uint64)
+            buckets = (block * self._band_mix).sum(axis=1)
+            # 버킷 → 용량 순 정렬 (용량 없는 제품 -1이 버킷 맨 앞)
+            order = np.lexsort((size_codes, buckets))
+            sorted_buckets, sorted_sizes = buckets[order], size_codes[order]
+
+            # 정렬 위치별 버킷/용량 묶음 시작 위치
+            bucket_start = np.concatenate(([True], sorted_buckets[1:] != sorted_buckets[:-1]))
+            group_start = bucket_start | np.concatenate(([True], sorted_sizes[1:] != sorted_sizes[:-1]))
+            bucket_start_of = np.maximum.accumulate(np.where(bucket_start, positions, 0))
+            group_start_of = np.maximum.accumulate(np.where(group_start, positions, 0))
+
+            # 같은 용량 묶음: 묶음 첫 제품 ↔ 나머지
+            shared = ~group_start
+            heads.append(order[group_start_of[shared]])
+            members.append(order[shared])
+            # 버킷 안 다른 용량 묶음: 버킷 첫 제품 ↔ 각 묶음 첫 제품
+            other_groups = group_start & ~bucket_start
+            heads.append(order[bucket_start_of[other_groups]])
+            members.append(order[other_groups])
+
+        if not heads:
+            return np.array([], dtype=np.int64), np.array([], dtype=np.int64)
+        # (head, member) → 64비트 정수 하나로 묶어 중복 제거
+        pairs = np.unique(np.concatenate(heads).astype(np.int64) << 32 | np.concatenate(members))
+        return pairs >> 32, pairs & 0xFFFFFFFF
+
+    def dedupe(self, products):
+        """
+        (대표 제품 목록, 제품별 대표 목록 인덱스)
+        """
+        products = [self._as_dict(product) for product in products]
+        clusters = self.cluster(products)
+        canonical_indices, positions = np.unique(clusters, return_inverse=True)
+        self.stats['products'] += len(products)
+        self.stats['clusters'] += len(canonical_indices)
+        self.stats['duplicates'] += len(products) - len(canonical_indices)
+        return [products[i] for i in canonical_indices], positions.tolist()
+
+    def analyze(self, products, analyze_many, reprice=None, **kwargs):
+        """
+        대표 제품만 analyze_many로 분석하고 결과를 클러스터 구성원 전체에 전달 (입력 순서대로)
+        - 구성원 결과: 대표 결과 복사본 + 'product'는 구성원 자신, 'duplicate_of'는 대표 제품
+        - reprice(구성원 목록, 구성원 결과 목록, **kwargs) → 결과 목록: 가격에 따라 달라지는 값(마진 등)을
+          구성원 자신의 가격으로 다시 계산 (사이트마다 가격이 다르므로, 없으면 대표 결과 그대로)
+        """
+        products = [self._as_dict(product) for product in products]
+        canonical, positions = self.dedupe(products)
+        analyzed = analyze_many(canonical, **kwargs)
+
+        results = []
+        duplicates = []
+        for index, (product, position) in enumerate(zip(products, positions)):
+            entry = analyzed[position]
+            if canonical[position] is not product:
+                entry = dict(entry, product=product, duplicate_of=canonical[position])
+                duplicates.append(index)
+            results.append(entry)
+
+        if reprice is not None and duplicates:
+            repriced = reprice([products[i] for i in duplicates], [results[i] for i in duplicates], **kwargs)
+            for index, entry in zip(duplicates, repriced):
+                results[index] = entry
+        return results
+
+    @staticmethod
+    def _choose_canonical(products, roots):
+        """
+        클러스터마다 정보가 가장 많은 제품을 대표로 (같으면 앞 제품)
+        """
+        completeness = np.array([sum(1 for field in COMPLETENESS_FIELDS if p.get(field) not in (None, '', []))
+                                 for p in products])
+        # 클러스터별 (완성도 내림차순, 인덱스 오름차순) 첫 제품
+        order = np.lexsort((np.arange(len(products)), -completeness, roots))
+        first = np.concatenate(([True], roots[order][1:] != roots[order][:-1]))
+        canonical_of_root = dict(zip(roots[order][first].tolist(), order[first].tolist()))
+        return np.array([canonical_of_root[root] for root in roots.tolist()])
+
+    @staticmethod
+    def _as_dict(product):
+        to_dict = getattr(product, 'to_dict', None)
+        return to_dict() if callable(to_dict) else product
+
+if __name__ == "__main__":
+    dedup = ProductDeduplicator()
+
+    # 테스트 데이터 (같은 제품을 여러 사이트에서 수집)
+    test_products = [
+        {'name': 'NaturePath Omega-3 Fish Oil 120 Softgels', 'brand': 'NaturePath', 'price_cad': 29.99},
+        {'name': 'Omega 3 Fish Oil - 120 softgels', 'brand': 'NaturePath', 'price_cad': 31.49,
+         'description': 'Wild-caught salmon oil'},
+        {'name': 'NaturePath Omega-3 Fish Oil 60 Softgels', 'brand': 'NaturePath', 'price_cad': 17.99},
+        {'name': 'Maple Syrup Lip Balm', 'brand': 'Maple Beauty', 'price_cad': 6.49}
+    ]
+
+    canonical, positions = dedup.dedupe(test_products)
+    print(json.dumps({'canonical': canonical, 'positions': positions}, ensure_ascii=False, indent=2))
+    print(json.dumps(dedup.stats, ensure_ascii=False, indent=2))
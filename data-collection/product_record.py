@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+제품 레코드 공통 형식
+- 가격은 한 번만 파싱해 정수 센트 + 통화로 보관
+- 크롤링 결과 / 현지 조사 / 시트 행 변환을 한 곳에서 처리
+"""
+
+import re
+
+# 가격 문자열 통화 표기 (앞쪽 표기 우선)
+CURRENCY_MARKERS = [
+    ('CA$', 'CAD'), ('C$', 'CAD'), ('CAD', 'CAD'),
+    ('US$', 'USD'), ('USD', 'USD'),
+    ('₩', 'KRW'), ('KRW', 'KRW'), ('원', 'KRW'),
+    ('$', None)
+]
+# 천 단위 구분(',' '.' 공백) + 소수부(',' 또는 '.' 뒤 1~2자리)
+AMOUNT_PATTERN = re.compile(r'\d+(?:[., \u00a0\u202f]\d{3})*(?:[.,]\d{1,2})?(?!\d)')
+DECIMAL_PATTERN = re.compile(r'[.,](\d{1,2})$')
+
+
+def parse_price(value, default_currency='CAD'):
+    """
+    가격 파싱 → (센트 단위 정수 또는 None, 통화)
+    - 29.99, '29.99', '$29.99', 'CAD 29.99', 'CA$1,299.00' 등 지원
+    - 프랑스어권 캐나다 표기 '29,99 $', '1 299,99 $' 지원 (마지막 구분자 뒤 1~2자리는 소수부)
+    - '$'만 있으면 기본 통화로 간주
+    """
+    if value is None or value == '':
+        return None, default_currency
+    if isinstance(value, bool):
+        return None, default_currency
+    if isinstance(value, (int, float)):
+        return int(round(value * 100)), default_currency
+
+    text = str(value).strip()
+    currency = default_currency
+    for marker, code in CURRENCY_MARKERS:
+        if marker in text:
+            currency = code or default_currency
+            break
+
+    match = AMOUNT_PATTERN.search(text)
+    if not match:
+        return None, currency
+
+    number = match.group(0)
+    decimal = DECIMAL_PATTERN.search(number)
+    fraction = decimal.group(1) if decimal else '0'
+    integer = re.sub(r'\D', '', number[:decimal.start()] if decimal else number)
+    return int(integer) * 100 + int(round(float('0.' + fraction) * 100)), currency
+
+
+class ProductRecord:
+    __slots__ = (
+        'name', 'brand', 'price_cents', 'currency', 'category', 'description',
+        'ingredients', 'rating', 'reviews_count', 'source_url'
+    )
+
+    def __init__(self, name='', brand='', price_cents=None, currency='CAD', category='',
+                 description='', ingredients=(), rating=None, reviews_count=None, source_url=''):
+        self.name = name
+        self.brand = brand
+        self.price_cents = price_cents
+        self.currency = currency
+        self.category = category
+        self.description = description
+        self.ingredients = tuple(ingredients or ())
+        self.rating = rating
+        self.reviews_count = reviews_count
+        self.source_url = source_url
+
+    def __repr__(self):
+        return f"ProductRecord(name={self.name!r}, price={self.price_display()!r})"
+
+    def __eq__(self, other):
+        if not isinstance(other, ProductRecord):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in self.__slots__)
+
+    @property
+    def price(self):
+        """
+        가격 (통화 단위 실수)
+        """
+        return None if self.price_cents is None else self.price_cents / 100
+
+    @property
+    def price_cad(self):
+        """
+        캐나다 달러 가격 (CAD가 아니면 None)
+        """
+        return self.price if self.currency == 'CAD' else None
+
+    def price_display(self):
+        return '' if self.price_cents is None else f"{self.currency} {self.price:.2f}"
+
+    @classmethod
+    def from_scrape(cls, response, category=''):
+        """
+        FirecrawlScraper.scrape_product_page 결과 → 레코드
+        """
+        data = response.get('data') or {}
+        fields = data.get('extract') or data.get('json') or {}
+        price_cents, currency = parse_price(fields.get('price'))
+
+        return cls(
+            name=fields.get('product_name', ''),
+            brand=fields.get('brand', ''),
+            price_cents=price_cents,
+            currency=currency,
+            category=category,
+            description=fields.get('description', ''),
+            ingredients=_as_list(fields.get('ingredients')),
+            rating=fields.get('rating'),
+            reviews_count=fields.get('reviews_count'),
+            source_url=response.get('url', '')
+        )
+
+    @classmethod
+    def from_research(cls, data):
+        """
+        FieldResearch 입력/항목 → 레코드
+        - price + currency가 있으면 우선 (CAD가 아닌 조사 항목은 price_cad가 None), 없으면 price_cad
+        """
+        if data.get('price') is not None and data.get('currency'):
+            price_cents, currency = parse_price(data['price'], data['currency'])
+        else:
+            price_cents, currency = parse_price(data.get('price_cad'))
+
+        return cls(
+            name=data.get('product_name', ''),
+            price_cents=price_cents,
+            currency=currency,
+            # 현지 조사는 매장이 출처
+            source_url=data.get('store_location', '')
+        )
+
+    @classmethod
+    def from_dict(cls, product_data):
+        """
+        분석기/시트에서 쓰는 제품 dict → 레코드
+        - 가격 우선순위: price_cents + currency → price_cad → price + currency (to_dict 결과 왕복 가능)
+        """
+        if isinstance(product_data, ProductRecord):
+            return product_data
+
+        currency = product_data.get('currency') or 'CAD'
+        if product_data.get('price_cents') is not None:
+            price_cents = int(product_data['price_cents'])
+        elif product_data.get('price_cad') is not None:
+            price_cents, currency = parse_price(product_data['price_cad'])
+        else:
+            price_cents, currency = parse_price(product_data.get('price'), currency)
+
+        return cls(
+            name=product_data.get('name') or product_data.get('product_name', ''),
+            brand=product_data.get('brand', ''),
+            price_cents=price_cents,
+            currency=currency,
+            category=product_data.get('category', ''),
+            description=product_data.get('description', ''),
+            ingredients=_as_list(product_data.get('ingredients')),
+            rating=product_data.get('rating'),
+            reviews_count=product_data.get('reviews_count'),
+            source_url=product_data.get('source_url', '')
+        )
+
+    def to_dict(self):
+        """
+        분석기 입력용 dict (price_cad 실수 포함)
+        """
+        data = {
+            'name': self.name,
+            'brand': self.brand,
+            'price_cad': self.price_cad,
+            'category': self.category,
+            'description': self.description,
+            'ingredients': list(self.ingredients),
+            'rating': self.rating,
+            'reviews_count': self.reviews_count,
+            'source_url': self.source_url
+        }
+        if self.currency != 'CAD':
+            data['price'] = self.price
+            data['currency'] = self.currency
+        return data
+
+    def sheet_values(self):
+        """
+        분석결과 시트 제품 열 값 (출처사이트 ~ 제품설명)
+        """
+        return [
+            self.source_url,
+            self.name,
+            self.brand,
+            self.price_cad if self.price_cad is not None else self.price_display(),
+            self.category,
+            ', '.join(self.ingredients),
+            self.rating if self.rating is not None else '',
+            self.description
+        ]
+
+
+def _as_list(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        return [item.strip() for item in value.split(',') if item.strip()]
+    return [str(item) for item in value]
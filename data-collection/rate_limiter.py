@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Firecrawl 호출 속도 제한 및 장애 대응
+- 토큰 버킷 (분당 요청 수)
+- 동시 크롤링 작업 수 제한
+- 지수 백오프 + 지터 재시도 (429/503의 Retry-After가 있으면 그만큼 전체 호출 대기, 상한 max_retry_after)
+- 재시도 횟수를 다 쓰면 RetriesExhausted (호출한 쪽에서 failed 결과로 보고)
+- 서킷 브레이커 (서비스 장애 시 큐 일시 정지)
+- API 키별 공용 인스턴스 (shared_limiter, 같은 키의 스크래퍼가 요금제 한도를 함께 사용)
+"""
+
+import os
+import re
+import time
+import random
+import threading
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504}
+STATUS_PATTERN = re.compile(r'[Ss]tatus(?: code)?:?\s*(\d{3})')
+
+# Retry-After 대기 상한 기본값 (초, 비정상 헤더로 작업자가 무기한 멈추지 않도록)
+DEFAULT_MAX_RETRY_AFTER = 120
+
+# API 키별 공용 FirecrawlLimiter
+_shared = {}
+_shared_lock = threading.Lock()
+
+
+class RetriesExhausted(Exception):
+    """
+    재시도 가능한 오류가 max_retries번 재시도 후에도 계속된 경우 (원래 예외는 last_error, __cause__)
+    """
+    def __init__(self, last_error, attempts):
+        super().__init__(f"gave up after {attempts} attempts: {last_error}")
+        self.last_error = last_error
+        self.attempts = attempts
+        self.status_code = status_code_of(last_error)
+
+
+def status_code_of(error):
+    """
+    예외에서 HTTP 상태 코드 추출 (SDK별 예외 형태가 달라 속성/메시지 모두 확인)
+    """
+    for attr in ('status_code', 'status'):
+        value = getattr(error, attr, None)
+        if isinstance(value, int):
+            return value
+
+    response = getattr(error, 'response', None)
+    if response is not None and isinstance(getattr(response, 'status_code', None), int):
+        return response.status_code
+
+    match = STATUS_PATTERN.search(str(error))
+    return int(match.group(1)) if match else None
+
+
+def retry_after_of(error):
+    """
+    예외 응답의 Retry-After 헤더 (초 또는 HTTP 날짜) → 대기 초, 없으면 None
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or getattr(error, 'headers', None)
+    if not headers:
+        return None
+
+    value = headers.get('Retry-After') or headers.get('retry-after')
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def shared_limiter(api_key=None):
+    """
+    API 키별 공용 FirecrawlLimiter (처음 요청할 때 생성)
+    - 스크래퍼마다 따로 만들면 각자 토큰 버킷을 가져 요금제 한도를 넘으므로 같은 키는 하나만 사용
+    """
+    key = api_key if api_key is not None else os.getenv('FIRECRAWL_API_KEY', '')
+    with _shared_lock:
+        limiter = _shared.get(key)
+        if limiter is None:
+            limiter = _shared[key] = FirecrawlLimiter()
+    return limiter
+
+
+def is_retryable(error):
+    """
+    재시도 가능한 오류 여부 (429, 5xx, 타임아웃, 연결 오류)
+    """
+    status = status_code_of(error)
+    if status is not None:
+        return status in RETRYABLE_STATUS
+
+    if isinstance(error, (TimeoutError, ConnectionError)):
+        return True
+
+    name = type(error).__name__.lower()
+    message = str(error).lower()
+    return any(word in name or word in message
+               for word in ('timeout', 'timed out', 'connection', 'rate limit', 'temporarily'))
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute, burst=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = burst or max(1, int(rate_per_minute / 10))
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        토큰 1개 획득 (부족하면 채워질 때까지 대기)
+        """
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=60):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.state = 'closed'
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        """
+        열린 상태면 재시도 시점까지 대기 후 반열림 상태에서 시험 호출 1건 허용
+        """
+        while True:
+            with self._lock:
+                if self.state == 'closed':
+                    return
+                if self.state == 'open':
+                    remaining = self.opened_at + self.reset_timeout - time.monotonic()
+                    if remaining <= 0:
+                        self.state = 'half_open'
+                        return
+                else:
+                    # half_open: 시험 호출 결과가 나올 때까지 다른 호출은 대기
+                    remaining = 1.0
+
+            time.sleep(min(remaining, 5.0))
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = 'closed'
+            self.opened_at = None
+
+    def record_neutral(self):
+        """
+        서비스 장애와 무관한 오류 (재시도 불가 4xx 등): 연속 실패 수는 그대로
+        - 반열림 시험 호출이었다면 서비스는 응답한 것이므로 닫힘으로 (다음 실패에서 바로 다시 열림)
+        """
+        with self._lock:
+            if self.state == 'half_open':
+                self.state = 'closed'
+                self.opened_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == 'half_open' or self.failures >= self.failure_threshold:
+                self.state = 'open'
+                self.opened_at = time.monotonic()
+
+
+class FirecrawlLimiter:
+    def __init__(self, requests_per_minute=None, max_concurrent_crawls=None,
+                 max_retries=5, base_delay=1.0, max_delay=60.0,
+                 failure_threshold=5, reset_timeout=60, max_retry_after=None):
+        # Firecrawl 요금제 한도 (환경변수로 조정)
+        requests_per_minute = requests_per_minute or int(os.getenv('FIRECRAWL_RPM', '100'))
+        max_concurrent_crawls = max_concurrent_crawls or int(os.getenv('FIRECRAWL_MAX_CRAWLS', '2'))
+
+        self.bucket = TokenBucket(requests_per_minute)
+        self.crawl_slots = threading.BoundedSemaphore(max_concurrent_crawls)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        # Retry-After 대기 상한 (초)
+        self.max_retry_after = (max_retry_after if max_retry_after is not None
+                                else float(os.getenv('FIRECRAWL_MAX_RETRY_AFTER', DEFAULT_MAX_RETRY_AFTER)))
+
+        self.retries = 0
+        # 재시도를 다 쓰고 포기한 호출 수
+        self.exhausted = 0
+        # Retry-After로 지정된 재개 시각 (time.monotonic 기준, 모든 호출 공통)
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+
+    def call(self, func, *args, **kwargs):
+        """
+        속도 제한/서킷 브레이커/재시도를 거쳐 API 호출
+        - 재시도 불가 오류(4xx 등)는 즉시 전달 (서킷 브레이커 연속 실패 수에 영향 없음)
+        - 재시도 횟수 초과 시 RetriesExhausted (마지막 예외는 last_error)
+        - Retry-After가 있으면 그 시간(max_retry_after 상한) 동안 이 limiter의 모든 호출 대기
+          (없으면 full jitter 백오프)
+        """
+        attempt = 0
+        while True:
+            self.breaker.before_call()
+            self._wait_resume()
+            self.bucket.acquire()
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as e:
+                if not is_retryable(e):
+                    self.breaker.record_neutral()
+                    raise
+
+                self.breaker.record_failure()
+                if attempt >= self.max_retries:
+                    with self._lock:
+                        self.exhausted += 1
+                    raise RetriesExhausted(e, attempt + 1) from e
+
+                attempt += 1
+                with self._lock:
+                    self.retries += 1
+
+                retry_after = retry_after_of(e)
+                if retry_after is not None:
+                    retry_after = min(retry_after, self.max_retry_after)
+                    with self._lock:
+                        self._resume_at = max(self._resume_at, time.monotonic() + retry_after)
+                    continue
+
+                # Full jitter 백오프
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+                continue
+
+            self.breaker.record_success()
+            return result
+
+    def _wait_resume(self):
+        while True:
+            with self._lock:
+                remaining = self._resume_at - time.monotonic()
+            if remaining <= 0:
+                return
+            time.sleep(remaining)
+
+    @contextmanager
+    def crawl_slot(self):
+        """
+        동시 크롤링 작업 수 제한
+        """
+        self.crawl_slots.acquire()
+        try:
+            yield
+        finally:
+            self.crawl_slots.release()
+
+    def stats(self):
+        return {
+            'retries': self.retries,
+            'exhausted': self.exhausted,
+            'circuit_state': self.breaker.state,
+            'consecutive_failures': self.breaker.failures
+        }
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Firecrawl 응답 로컬 캐시
+- SQLite 기반 디스크 캐시
+- 정규화 URL + 스키마/옵션 해시를 키로 사용
+- 항목별 TTL, 용량 제한 (LRU 삭제), 적중/실패 카운터
+"""
+
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from url_frontier import canonicalize_url
+
+
+class ScrapeCache:
+    def __init__(self, path=None, ttl=6 * 3600, max_bytes=500 * 1024 * 1024):
+        self.path = path or os.getenv('SCRAPE_CACHE_PATH', '.cache/scrape_cache.sqlite3')
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        # scrape_many 워커 스레드에서 공유하므로 연결 하나를 락으로 보호
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                url TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_entries_access ON entries(last_access)')
+        self._conn.commit()
+
+        self._total_bytes = self._conn.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+    @staticmethod
+    def make_key(url, options=None):
+        """
+        캐시 키 생성: 정규화 URL + 요청 옵션(추출 스키마 포함) 해시
+        """
+        options_json = json.dumps(options or {}, sort_keys=True, ensure_ascii=False)
+        options_hash = hashlib.sha256(options_json.encode('utf-8')).hexdigest()[:16]
+        return f"{canonicalize_url(url)}#{options_hash}"
+
+    def get(self, key):
+        """
+        캐시 조회 (만료 항목은 삭제 후 None)
+        """
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT payload, size, expires_at FROM entries WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            payload, size, expires_at = row
+            if expires_at <= now:
+                self._conn.execute('DELETE FROM entries WHERE key = ?', (key,))
+                self._conn.commit()
+                self._total_bytes -= size
+                self.misses += 1
+                return None
+
+            self._conn.execute('UPDATE entries SET last_access = ? WHERE key = ?', (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return json.loads(payload)
+
+    def set(self, key, value, ttl=None):
+        """
+        캐시 저장 (ttl 미지정 시 기본 TTL), 용량 초과 시 오래 안 쓴 항목부터 삭제
+        """
+        payload = json.dumps(value, ensure_ascii=False, default=str)
+        size = len(payload.encode('utf-8'))
+        now = time.time()
+        expires_at = now + (self.ttl if ttl is None else ttl)
+        url = key.split('#', 1)[0]
+
+        with self._lock:
+            previous = self._conn.execute('SELECT size FROM entries WHERE key = ?', (key,)).fetchone()
+            if previous:
+                self._total_bytes -= previous[0]
+
+            self._conn.execute(
+                'INSERT OR REPLACE INTO entries (key, url, payload, size, expires_at, last_access) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                (key, url, payload, size, expires_at, now)
+            )
+            self._total_bytes += size
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        """
+        총 용량이 max_bytes 이하가 될 때까지 LRU 순으로 삭제 (락 보유 상태에서 호출)
+        """
+        if self._total_bytes <= self.max_bytes:
+            return
+
+        # 만료 항목 먼저 정리
+        now = time.time()
+        expired = self._conn.execute(
+            'SELECT COALESCE(SUM(size), 0), COUNT(*) FROM entries WHERE expires_at <= ?', (now,)
+        ).fetchone()
+        if expired[1]:
+            self._conn.execute('DELETE FROM entries WHERE expires_at <= ?', (now,))
+            self._total_bytes -= expired[0]
+            self.evictions += expired[1]
+
+        cursor = self._conn.execute('SELECT key, size FROM entries ORDER BY last_access ASC')
+        victims = []
+        for key, size in cursor:
+            if self._total_bytes <= self.max_bytes:
+                break
+            victims.append((key,))
+            self._total_bytes -= size
+
+        if victims:
+            self._conn.executemany('DELETE FROM entries WHERE key = ?', victims)
+            self.evictions += len(victims)
+
+    def clear(self):
+        """
+        캐시 전체 삭제
+        """
+        with self._lock:
+            self._conn.execute('DELETE FROM entries')
+            self._conn.commit()
+            self._total_bytes = 0
+
+    def stats(self):
+        """
+        캐시 사용 현황
+        """
+        with self._lock:
+            entries = self._conn.execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            'entries': entries,
+            'total_bytes': self._total_bytes,
+            'max_bytes': self.max_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0,
+            'evictions': self.evictions
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+URL 프런티어
+- URL 정규화 (추적 파라미터 제거, 호스트/경로 정리)
+- 실행 간 중복 제거 (수집 신선도 기간 내 재요청 방지)
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# 모든 사이트 공통 광고/추적용 파라미터 (접두사 포함)
+# th/psc/cid/sid/source/tag 등은 사이트에 따라 변형/제품을 고르는 값이라 공통 목록에 넣지 않음
+TRACKING_PARAMS = {
+    'gclid', 'gclsrc', 'dclid', 'fbclid', 'msclkid', 'yclid', 'igshid', 'twclid', 'ttclid',
+    'mc_cid', 'mc_eid', '_ga', '_gl'
+}
+TRACKING_PREFIXES = ('utm_', 'hsa_')
+
+# 사이트별 추적용 파라미터 {도메인: (파라미터, 접두사, 경로 구간 접두사)} (도메인 또는 하위 도메인에 적용)
+# Amazon은 /dp/<ASIN>/ref=sr_1_1 처럼 경로에도 추적 구간을 붙임
+HOST_TRACKING_PARAMS = {
+    'amazon.ca': ({'ref', 'ref_', 'tag', 'qid', 'sr', 'crid', 'sprefix', 'linkcode', 'linkid'},
+                  ('pf_rd_', 'pd_rd_'), ('ref=',)),
+    'amazon.com': ({'ref', 'ref_', 'tag', 'qid', 'sr', 'crid', 'sprefix', 'linkcode', 'linkid'},
+                   ('pf_rd_', 'pd_rd_'), ('ref=',))
+}
+
+# 목록 페이지 페이지네이션/정렬 파라미터 (제품 페이지에서는 의미 없음)
+# p/view/limit 등은 사이트에 따라 제품 ID(?p=123)나 변형을 고르는 값이라 넣지 않음
+LISTING_PARAMS = {'page', 'pg', 'start', 'offset', 'sort', 'sortby', 'order'}
+
+DEFAULT_PORTS = {'http': '80', 'https': '443'}
+
+
+def canonicalize_url(url, keep_listing_params=True):
+    """
+    URL 정규화
+    - 스킴/호스트 소문자, www. 및 기본 포트 제거
+    - 공통/사이트별 추적 파라미터 제거, 나머지 쿼리 정렬
+    - 경로의 중복 슬래시/끝 슬래시 및 fragment 제거, 사이트별 추적 경로 구간(Amazon /ref=...) 제거
+    - keep_listing_params=False면 페이지네이션/정렬 파라미터도 제거 (제품 페이지용)
+    """
+    parts = urlsplit(url.strip())
+    scheme = (parts.scheme or 'https').lower()
+
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port and str(parts.port) != DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+
+    host_params, host_prefixes, path_prefixes = next(
+        (rules for domain, rules in HOST_TRACKING_PARAMS.items() if host == domain or host.endswith('.' + domain)),
+        (set(), (), ())
+    )
+
+    path = '/'.join(segment for segment in parts.path.split('/')
+                    if segment and not (path_prefixes and segment.lower().startswith(path_prefixes)))
+    path = '/' + path
+
+    query = []
+    for key, value in parse_qsl(parts.query, keep_blank_values=True):
+        name = key.lower()
+        if name in TRACKING_PARAMS or name.startswith(TRACKING_PREFIXES):
+            continue
+        if name in host_params or name.startswith(host_prefixes):
+            continue
+        if not keep_listing_params and name in LISTING_PARAMS:
+            continue
+        query.append((key, value))
+
+    return urlunsplit((scheme, host, path, urlencode(sorted(query)), ''))
+
+
+def url_key(canonical):
+    """
+    정규화 URL의 64비트 해시 (SQLite INTEGER PRIMARY KEY로 저장해 수백만 건도 작게 유지)
+    """
+    digest = hashlib.blake2b(canonical.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+class URLFrontier:
+    def __init__(self, path=None, freshness=24 * 3600, keep_listing_params=False):
+        self.path = path or os.getenv('URL_FRONTIER_PATH', '.cache/url_frontier.sqlite3')
+        self.freshness = freshness
+        self.keep_listing_params = keep_listing_params
+
+        self.skipped = 0
+        self.admitted = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fetched (
+                key INTEGER PRIMARY KEY,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def canonicalize(self, url):
+        return canonicalize_url(url, keep_listing_params=self.keep_listing_params)
+
+    def filter_new(self, urls):
+        """
+        수집 대상 URL 선별
+        - 같은 배치 안의 중복과 신선도 기간 내 수집된 URL 제외
+        - 반환: 입력과 같은 길이의 리스트 (수집 대상은 정규화 URL, 제외 대상은 None)
+        """
+        cutoff = time.time() - self.freshness
+        decisions = []
+        batch_keys = set()
+
+        with self._lock:
+            for url in urls:
+                canonical = self.canonicalize(url)
+                key = url_key(canonical)
+
+                if key in batch_keys:
+                    decisions.append(None)
+                    self.skipped += 1
+                    continue
+                batch_keys.add(key)
+
+                row = self._conn.execute('SELECT fetched_at FROM fetched WHERE key = ?', (key,)).fetchone()
+                if row and row[0] > cutoff:
+                    decisions.append(None)
+                    self.skipped += 1
+                    continue
+
+                decisions.append(canonical)
+                self.admitted += 1
+
+        return decisions
+
+    def seen(self, url):
+        """
+        신선도 기간 내 수집 여부
+        """
+        key = url_key(self.canonicalize(url))
+        with self._lock:
+            row = self._conn.execute('SELECT fetched_at FROM fetched WHERE key = ?', (key,)).fetchone()
+        return bool(row) and row[0] > time.time() - self.freshness
+
+    def mark_fetched(self, urls):
+        """
+        수집 완료 URL 기록
+        """
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO fetched (key, fetched_at) VALUES (?, ?)',
+                [(url_key(self.canonicalize(url)), now) for url in urls]
+            )
+            self._conn.commit()
+
+    def prune(self):
+        """
+        신선도 기간이 지난 기록 삭제
+        """
+        with self._lock:
+            deleted = self._conn.execute(
+                'DELETE FROM fetched WHERE fetched_at <= ?', (time.time() - self.freshness,)
+            ).rowcount
+            self._conn.commit()
+        return deleted
+
+    def stats(self):
+        with self._lock:
+            tracked = self._conn.execute('SELECT COUNT(*) FROM fetched').fetchone()[0]
+        return {
+            'tracked_urls': tracked,
+            'admitted': self.admitted,
+            'skipped': self.skipped
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+배치 API 로컬 대역 서버 (BatchAnalyzer 테스트용)
+- Claude Message Batches: POST/GET /v1/messages/batches, 결과 JSONL
+- OpenAI Batch: POST /v1/files, POST/GET /v1/batches, GET /v1/files/{id}/content
+- 배치는 상태 조회 polls_until_done회 후 완료, fail_ids의 custom_id는 오류 결과로 반환
+- fail_paths의 POST 경로는 500 응답 (제출 실패 재현)
+- 응답 본문은 analysis_schema 형식을 만족하는 고정 분석 결과
+
+사용법: python fake_batch_server.py [포트]
+        ANTHROPIC_BASE_URL=http://127.0.0.1:<포트> OPENAI_BASE_URL=http://127.0.0.1:<포트>/v1
+"""
+
+import re
+import sys
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+CLAUDE_ANALYSIS = {
+    'market_potential': 7,
+    'competition_level': 5,
+    'expected_margin_percent': 32.5,
+    'entry_score': 71,
+    'keywords': ['오메가3', '캐나다'],
+    'target_customers': '30-50대 건강 관심층',
+    'risks': ['수입 규제'],
+    'recommended': True
+}
+GPT_ANALYSIS = {
+    'competitor_price_range': {'min_krw': 25000, 'max_krw': 45000},
+    'marketing_points': ['캐나다산 원료'],
+    'hashtags': ['#오메가3'],
+    'description': '캐나다 직수입 오메가3'
+}
+USAGE = {'input_tokens': 120, 'output_tokens': 80}
+
+
+class FakeBatchServer:
+    def __init__(self, port=0, polls_until_done=1, fail_ids=(), fail_paths=()):
+        self.polls_until_done = polls_until_done
+        self.fail_ids = set(fail_ids)
+        self.fail_paths = set(fail_paths)
+        # 배치 ID → {'requests': [...], 'polls': 상태 조회 수}
+        self.claude_batches = {}
+        self.gpt_batches = {}
+        self.files = {}
+        self.requests = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._thread = None
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self._server.server_address[1]}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, name='fake-batch-api', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+
+    def _new_id(self, prefix, table):
+        return f"{prefix}_{len(table) + 1}"
+
+    def _poll(self, batch):
+        batch['polls'] += 1
+        return batch['polls'] > self.polls_until_done
+
+    def _claude_batch(self, batch_id):
+        batch = self.claude_batches[batch_id]
+        ended = batch['polls'] > self.polls_until_done
+        return {
+            'id': batch_id,
+            'type': 'message_batch',
+            'processing_status': 'ended' if ended else 'in_progress',
+            'request_counts': {'processing': 0 if ended else len(batch['requests']), 'succeeded': 0,
+                               'errored': 0, 'canceled': 0, 'expired': 0},
+            'created_at': '2024-01-01T00:00:00Z',
+            'expires_at': '2024-01-02T00:00:00Z',
+            'cancel_initiated_at': None,
+            'ended_at': '2024-01-01T01:00:00Z' if ended else None,
+            'archived_at': None,
+            'results_url': f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None
+        }
+
+    def _claude_results(self, batch_id):
+        lines = []
+        for request in self.claude_batches[batch_id]['requests']:
+            custom_id = request['custom_id']
+            if custom_id in self.fail_ids:
+                result = {'type': 'errored', 'error': {'type': 'error',
+                                                       'error': {'type': 'api_error', 'message': 'fake error'}}}
+            else:
+                result = {'type': 'succeeded', 'message': {
+                    'id': f"msg_{custom_id}", 'type': 'message', 'role': 'assistant',
+                    'model': request['params']['model'],
+                    'content': [{'type': 'tool_use', 'id': f"tool_{custom_id}",
+                                 'name': request['params']['tool_choice']['name'], 'input': CLAUDE_ANALYSIS}],
+                    'stop_reason': 'tool_use', 'stop_sequence': None, 'usage': USAGE
+                }}
+            lines.append(json.dumps({'custom_id': custom_id, 'result': result}, ensure_ascii=False))
+        return '\n'.join(lines)
+
+    def _gpt_batch(self, batch_id):
+        batch = self.gpt_batches[batch_id]
+        completed = batch['polls'] > self.polls_until_done
+        return {
+            'id': batch_id,
+            'object': 'batch',
+            'endpoint': '/v1/chat/completions',
+            'input_file_id': batch['input_file_id'],
+            'completion_window': '24h',
+            'status': 'completed' if completed else 'in_progress',
+            'created_at': 0,
+            'output_file_id': f"{batch_id}_output" if completed else None,
+            'error_file_id': None
+        }
+
+    def _gpt_output(self, batch_id):
+        lines = []
+        for request in self.gpt_batches[batch_id]['requests']:
+            custom_id = request['custom_id']
+            if custom_id in self.fail_ids:
+                response = {'status_code': 500, 'request_id': custom_id, 'body': {'error': 'fake error'}}
+            else:
+                response = {'status_code': 200, 'request_id': custom_id, 'body': {
+                    'choices': [{'message': {'content': json.dumps(GPT_ANALYSIS, ensure_ascii=False)}}],
+                    'usage': {'prompt_tokens': 100, 'completion_tokens': 60}
+                }}
+            lines.append(json.dumps({'id': f"req_{custom_id}", 'custom_id': custom_id, 'response': response,
+                                     'error': None}, ensure_ascii=False))
+        return '\n'.join(lines)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _send(self, body, content_type='application/json', status=200):
+                if not isinstance(body, (bytes, str)):
+                    body = json.dumps(body, ensure_ascii=False)
+                if isinstance(body, str):
+                    body = body.encode('utf-8')
+                self.send_response(status)
+                self.send_header('content-type', content_type)
+                self.send_header('content-length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _not_found(self):
+                self._send({'error': {'type': 'not_found_error', 'message': self.path}}, status=404)
+
+            def do_POST(self):
+                raw = self.rfile.read(int(self.headers.get('content-length', 0)))
+                path = self.path.split('?')[0]
+                with server._lock:
+                    server.requests.append(('POST', path))
+
+                    if path in server.fail_paths:
+                        return self._send({'error': {'type': 'api_error', 'message': 'unavailable'}}, status=500)
+
+                    if path == '/v1/messages/batches':
+                        batch_id = server._new_id('msgbatch', server.claude_batches)
+                        server.claude_batches[batch_id] = {'requests': json.loads(raw)['requests'], 'polls': 0}
+                        return self._send(server._claude_batch(batch_id))
+
+                    if path == '/v1/files':
+                        # multipart 본문에서 JSONL 줄만 추출
+                        file_id = server._new_id('file', server.files)
+                        server.files[file_id] = [json.loads(line) for line in raw.decode('utf-8').splitlines()
+                                                 if line.startswith('{"custom_id"')]
+                        return self._send({'id': file_id, 'object': 'file', 'bytes': len(raw), 'created_at': 0,
+                                           'filename': 'input.jsonl', 'purpose': 'batch', 'status': 'processed'})
+
+                    if path == '/v1/batches':
+                        body = json.loads(raw)
+                        batch_id = server._new_id('batch', server.gpt_batches)
+                        server.gpt_batches[batch_id] = {'input_file_id': body['input_file_id'], 'polls': 0,
+                                                        'requests': server.files.get(body['input_file_id'], [])}
+                        return self._send(server._gpt_batch(batch_id))
+
+                self._not_found()
+
+            def do_GET(self):
+                path = self.path.split('?')[0]
+                with server._lock:
+                    server.requests.append(('GET', path))
+
+                    match = re.fullmatch(r'/v1/messages/batches/([\w-]+)(/results)?', path)
+                    if match and match.group(1) in server.claude_batches:
+                        if match.group(2):
+                            return self._send(server._claude_results(match.group(1)), 'application/x-jsonl')
+                        server._poll(server.claude_batches[match.group(1)])
+                        return self._send(server._claude_batch(match.group(1)))
+
+                    match = re.fullmatch(r'/v1/batches/([\w-]+)', path)
+                    if match and match.group(1) in server.gpt_batches:
+                        server._poll(server.gpt_batches[match.group(1)])
+                        return self._send(server._gpt_batch(match.group(1)))
+
+                    match = re.fullmatch(r'/v1/files/([\w-]+)_output/content', path)
+                    if match and match.group(1) in server.gpt_batches:
+                        return self._send(server._gpt_output(match.group(1)), 'application/octet-stream')
+
+                self._not_found()
+
+        return Handler
+
+if __name__ == "__main__":
+    fake = FakeBatchServer(port=int(sys.argv[1]) if len(sys.argv) > 1 else 8765)
+    print(f"ANTHROPIC_BASE_URL={fake.url} OPENAI_BASE_URL={fake.url}/v1")
+    fake._server.serve_forever()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+AnalysisCache 테스트 (제품 지문, 키 구성, 프롬프트 버전 변경 시 무효화, 항목 수 제한)
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'ai-analysis'))
+
+from analysis_cache import AnalysisCache, product_fingerprint
+from analysis_metrics import AnalysisMetrics
+from claude_analysis import ClaudeAnalyzer, MODEL
+from prompts import CLAUDE_PROMPT_VERSION
+
+PRODUCT = {'name': 'Omega-3 Fish Oil', 'brand': 'NaturePath', 'price_cad': 29.99}
+
+
+class TestAnalysisCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = AnalysisCache(path=os.path.join(self.tmp.name, 'analysis.sqlite3'))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def test_fingerprint_ignores_volatile_and_formatting(self):
+        noisy = {'brand': 'NaturePath ', 'name': ' Omega-3  Fish Oil', 'price_cad': 29.99,
+                 'timestamp': '2024-01-01T00:00:00', 'description': '', 'ingredients': []}
+        self.assertEqual(product_fingerprint(noisy), product_fingerprint(PRODUCT))
+        self.assertNotEqual(product_fingerprint(dict(PRODUCT, price_cad=31.49)), product_fingerprint(PRODUCT))
+
+    def test_key_includes_version_model_and_params(self):
+        key = AnalysisCache.make_key('claude', 'm', 'v1', PRODUCT, {'max_tokens': 1000})
+        self.assertNotEqual(key, AnalysisCache.make_key('claude', 'm', 'v2', PRODUCT, {'max_tokens': 1000}))
+        self.assertNotEqual(key, AnalysisCache.make_key('claude', 'm2', 'v1', PRODUCT, {'max_tokens': 1000}))
+        self.assertNotEqual(key, AnalysisCache.make_key('claude', 'm', 'v1', PRODUCT, {'max_tokens': 2000}))
+
+    def test_invalidate_stale_only_touches_one_analyzer(self):
+        self.cache.set('a', {'v': 1}, 'claude', 'm', 'old')
+        self.cache.set('b', {'v': 2}, 'claude', 'm', 'new')
+        self.cache.set('c', {'v': 3}, 'gpt', 'm', 'old')
+
+        self.assertEqual(self.cache.invalidate_stale('claude', 'new'), 1)
+        self.assertIsNone(self.cache.get('a'))
+        self.assertEqual(self.cache.get('b'), {'v': 2})
+        self.assertEqual(self.cache.get('c'), {'v': 3})
+
+    def test_expired_and_overflow_entries_removed(self):
+        self.cache.set('expired', {'v': 0}, 'claude', 'm', 'v', ttl=-1)
+        self.assertIsNone(self.cache.get('expired'))
+
+        small = AnalysisCache(path=os.path.join(self.tmp.name, 'small.sqlite3'), max_entries=2)
+        for key in ('a', 'b', 'c'):
+            small.set(key, {'key': key}, 'claude', 'm', 'v')
+        self.assertEqual(small.stats()['entries'], 2)
+        self.assertEqual(small.evictions, 1)
+        small.close()
+
+    def test_analyzer_drops_results_of_previous_prompt_version(self):
+        old_key = AnalysisCache.make_key('claude', MODEL, 'previous-version', PRODUCT, {'max_tokens': 1000})
+        self.cache.set(old_key, {'status': 'success', 'analysis': {}}, 'claude', MODEL, 'previous-version')
+
+        metrics = AnalysisMetrics(path=os.path.join(self.tmp.name, 'metrics.prom'))
+        # client=object(): 캐시 적중이면 API를 부르지 않음
+        analyzer = ClaudeAnalyzer(cache=self.cache, metrics=metrics, client=object())
+        self.assertIsNone(self.cache.get(old_key))
+
+        key = analyzer.cache_key(PRODUCT)
+        self.cache.set(key, {'status': 'success', 'analysis': {'entry_score': 70}}, 'claude', MODEL,
+                       CLAUDE_PROMPT_VERSION)
+        result = analyzer.analyze_product(PRODUCT)
+        self.assertTrue(result['cached'])
+        self.assertEqual(metrics.summary()['claude']['cache_hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+분석기 공통 기반 테스트 (파싱 실패 결과의 사용량/비용 기록, 캐시 저장 조건)
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, '..', 'ai-analysis'))
+
+from fake_batch_server import CLAUDE_ANALYSIS
+from analysis_cache import AnalysisCache
+from analysis_metrics import AnalysisMetrics
+from claude_analysis import ClaudeAnalyzer
+from gpt_analysis import GPTAnalyzer
+from screening import ScreeningAnalyzer
+
+PRODUCT = {'name': 'Omega-3 Fish Oil', 'brand': 'NaturePath', 'price_cad': 29.99}
+USAGE = {'input_tokens': 400, 'output_tokens': 120}
+
+
+class FakeAnthropic:
+    """
+    Anthropic 클라이언트 대역 (tool_input을 도구 입력으로 돌려줌)
+    """
+
+    def __init__(self, tool_input, tool_name):
+        self.tool_input = tool_input
+        self.tool_name = tool_name
+        self.calls = 0
+        self.messages = SimpleNamespace(with_raw_response=self)
+
+    def create(self, **params):
+        self.calls += 1
+        message = SimpleNamespace(
+            content=[SimpleNamespace(type='tool_use', name=self.tool_name, input=self.tool_input)],
+            usage=SimpleNamespace(**USAGE)
+        )
+        return SimpleNamespace(parse=lambda: message, retries_taken=1)
+
+
+class FakeOpenAI:
+    """
+    OpenAI 클라이언트 대역 (content를 응답 본문으로 돌려줌)
+    """
+
+    def __init__(self, content):
+        response = SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=content))],
+            usage=SimpleNamespace(prompt_tokens=USAGE['input_tokens'], completion_tokens=USAGE['output_tokens'],
+                                  prompt_tokens_details=None)
+        )
+        raw = SimpleNamespace(parse=lambda: response, retries_taken=0)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(
+            with_raw_response=SimpleNamespace(create=lambda **params: raw)))
+
+
+class TestAnalyzerBase(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.metrics = AnalysisMetrics(path=os.path.join(self.tmp.name, 'metrics.prom'))
+        self.cache = AnalysisCache(path=os.path.join(self.tmp.name, 'analysis.sqlite3'))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    def assert_failed_with_usage(self, result, analyzer):
+        self.assertEqual(result['status'], 'failed')
+        self.assertEqual(result['usage']['output_tokens'], USAGE['output_tokens'])
+        self.assertGreater(result['cost_usd'], 0)
+        summary = self.metrics.summary()[analyzer]
+        self.assertEqual(summary['output_tokens'], USAGE['output_tokens'])
+        self.assertGreater(summary['cost_usd'], 0)
+
+    def test_claude_parse_failure_keeps_usage(self):
+        client = FakeAnthropic({'entry_score': 'high'}, 'record_analysis')
+        analyzer = ClaudeAnalyzer(cache=self.cache, metrics=self.metrics, client=client)
+        result = analyzer.analyze_product(PRODUCT)
+
+        self.assert_failed_with_usage(result, 'claude')
+        self.assertEqual(result['retries'], 1)
+        self.assertIn('raw', result)
+        # 실패 결과는 캐시하지 않음: 다시 호출
+        analyzer.analyze_product(PRODUCT)
+        self.assertEqual(client.calls, 2)
+
+    def test_gpt_parse_failure_keeps_usage(self):
+        analyzer = GPTAnalyzer(metrics=self.metrics, client=FakeOpenAI('분석할 수 없습니다'))
+        self.assert_failed_with_usage(analyzer.analyze_marketing(PRODUCT), 'gpt')
+
+    def test_screening_results_carry_model_and_cost(self):
+        client = FakeAnthropic({'entry_score': 500, 'reason': 'x'}, 'record_screening')
+        screener = ScreeningAnalyzer(metrics=self.metrics, client=client)
+        self.assert_failed_with_usage(screener.screen_product(PRODUCT), 'screening')
+
+        client.tool_input = {'entry_score': 72, 'reason': '수요 확인'}
+        result = screener.screen_product(PRODUCT)
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['model'], ScreeningAnalyzer.MODEL)
+        self.assertGreater(result['cost_usd'], 0)
+
+    def test_success_cached_once(self):
+        client = FakeAnthropic(dict(CLAUDE_ANALYSIS), 'record_analysis')
+        analyzer = ClaudeAnalyzer(cache=self.cache, metrics=self.metrics, client=client)
+        first = analyzer.analyze_product(PRODUCT)
+        second = analyzer.analyze_product(PRODUCT)
+
+        self.assertEqual(first['analysis'], CLAUDE_ANALYSIS)
+        self.assertTrue(second['cached'])
+        self.assertEqual(client.calls, 1)
+        self.assertEqual(self.metrics.summary()['claude']['cache_hits'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
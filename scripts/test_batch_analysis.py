@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+BatchAnalyzer 테스트 (로컬 대역 서버: fake_batch_server.py)
+- 제출 → 폴링 → 수집, 상태 파일(batch_runs.json)로 재시작 후 이어서 수집
+- 반복 수집 시 지표 중복 기록 없음, 제출 실패 배치 재제출
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, '..', 'ai-analysis'))
+
+import anthropic
+import openai
+from fake_batch_server import FakeBatchServer, CLAUDE_ANALYSIS
+from batch_analysis import BatchAnalyzer
+from claude_analysis import ClaudeAnalyzer
+from gpt_analysis import GPTAnalyzer
+from analysis_metrics import AnalysisMetrics
+
+PRODUCTS = [
+    {'name': 'Omega-3 Fish Oil', 'brand': 'NaturePath', 'price_cad': 29.99, 'category': '건강식품'},
+    {'name': 'Vitamin D3 1000 IU', 'brand': 'Jamieson', 'price_cad': 12.49, 'category': '건강식품'},
+    {'name': 'Maple Syrup 500ml', 'brand': 'Citadelle', 'price_cad': 15.99, 'category': '식품'}
+]
+
+
+class TestBatchAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeBatchServer(polls_until_done=1, fail_ids={'p00002'}).start()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.state_path = os.path.join(self.tmp.name, 'batch_runs.json')
+
+    def tearDown(self):
+        self.server.stop()
+        self.tmp.cleanup()
+
+    def analyzer(self):
+        self.metrics = metrics = AnalysisMetrics(path=os.path.join(self.tmp.name, 'metrics.prom'))
+        claude = ClaudeAnalyzer(metrics=metrics, client=anthropic.Anthropic(
+            api_key='test', base_url=self.server.url, max_retries=0))
+        gpt = GPTAnalyzer(metrics=metrics, client=openai.OpenAI(
+            api_key='test', base_url=f"{self.server.url}/v1", max_retries=0))
+        return BatchAnalyzer(claude=claude, gpt=gpt, state_path=self.state_path)
+
+    def test_submit_poll_collect(self):
+        batch = self.analyzer()
+        submitted = batch.submit(PRODUCTS)
+        self.assertEqual(submitted['status'], 'submitted')
+        self.assertEqual((submitted['claude_submitted'], submitted['gpt_submitted']), (3, 3))
+
+        first = batch.poll(submitted['run_id'])
+        self.assertFalse(first['done'])
+        self.assertEqual((first['claude_status'], first['gpt_status']), ('in_progress', 'in_progress'))
+        self.assertTrue(batch.poll(submitted['run_id'])['done'])
+
+        results = batch.collect(submitted['run_id'])
+        self.assertEqual([r['product']['name'] for r in results], [p['name'] for p in PRODUCTS])
+        self.assertEqual([r['claude']['status'] for r in results], ['success', 'success', 'failed'])
+        self.assertEqual([r['gpt']['status'] for r in results], ['success', 'success', 'failed'])
+        self.assertEqual(results[0]['claude']['analysis'], CLAUDE_ANALYSIS)
+        self.assertIn('margins', results[0]['gpt'])
+        self.assertEqual(batch.pending_runs(), [])
+
+    def test_resume_from_state_file(self):
+        run_id = self.analyzer().submit(PRODUCTS)['run_id']
+
+        with open(self.state_path, encoding='utf-8') as f:
+            run = json.load(f)[run_id]
+        self.assertEqual(run['status'], 'submitted')
+        self.assertTrue(run['claude_batch_id'] and run['gpt_batch_id'])
+
+        # 새 프로세스 대신 새 인스턴스: 상태 파일만으로 이어서 수집
+        resumed = self.analyzer()
+        self.assertEqual(resumed.pending_runs(), [run_id])
+        results = resumed.wait(run_id, poll_interval=0, timeout=5)
+        self.assertEqual(len(results), len(PRODUCTS))
+        self.assertEqual(results[1]['claude']['status'], 'success')
+        self.assertEqual(resumed.pending_runs(), [])
+
+    def test_collect_twice_records_metrics_once(self):
+        batch = self.analyzer()
+        run_id = batch.submit(PRODUCTS)['run_id']
+        first = batch.wait(run_id, poll_interval=0, timeout=5)
+        summary = self.metrics.summary()
+        requests = len(self.server.requests)
+
+        second = batch.collect(run_id)
+        self.assertEqual(second, first)
+        self.assertEqual(self.metrics.summary(), summary)
+        # 저장된 결과 사용: 배치 결과를 다시 내려받지 않음
+        self.assertEqual(len(self.server.requests), requests)
+
+    def test_submit_failed_part_reported_and_resubmitted(self):
+        self.server.fail_paths = {'/v1/batches'}
+        batch = self.analyzer()
+        submitted = batch.submit(PRODUCTS)
+        self.assertEqual(submitted['status'], 'failed')
+        self.assertEqual(submitted['unsubmitted'], ['gpt'])
+
+        run_id = submitted['run_id']
+        status = batch.poll(run_id)
+        self.assertEqual(status['gpt_status'], 'submit_failed')
+        self.assertIn('error', status)
+
+        self.server.fail_paths = set()
+        resubmitted = batch.resubmit(run_id)
+        self.assertEqual(resubmitted['status'], 'submitted')
+        # Claude 배치는 이미 제출됨: GPT만 다시 제출
+        self.assertEqual((resubmitted['claude_submitted'], resubmitted['gpt_submitted']), (0, 3))
+
+        results = batch.wait(run_id, poll_interval=0, timeout=5)
+        self.assertEqual([r['gpt']['status'] for r in results], ['success', 'success', 'failed'])
+
+    def test_collect_reports_unsubmitted_part(self):
+        self.server.fail_paths = {'/v1/batches'}
+        batch = self.analyzer()
+        run_id = batch.submit(PRODUCTS)['run_id']
+
+        results = batch.wait(run_id, poll_interval=0, timeout=5)
+        self.assertEqual([r['claude']['status'] for r in results], ['success', 'success', 'failed'])
+        self.assertTrue(all(r['gpt']['status'] == 'failed' for r in results))
+        self.assertIn('batch submit failed', results[0]['gpt']['error'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""
+공용 클라이언트 레지스트리 테스트 (스레드별 requests 세션, 연결 풀 공유)
+"""
+
+import os
+import sys
+import threading
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..'))
+
+from config.clients import http_session, reset_clients
+
+
+class TestHTTPSession(unittest.TestCase):
+    def tearDown(self):
+        reset_clients()
+
+    def test_one_session_per_thread_with_shared_pool(self):
+        main = http_session()
+        self.assertIs(http_session(), main)
+
+        sessions = []
+        thread = threading.Thread(target=lambda: sessions.append(http_session()))
+        thread.start()
+        thread.join()
+
+        self.assertIsNot(sessions[0], main)
+        self.assertIs(sessions[0].get_adapter('https://well.ca'), main.get_adapter('https://well.ca'))
+
+    def test_reset_replaces_sessions(self):
+        before = http_session()
+        reset_clients()
+        after = http_session()
+        self.assertIsNot(after, before)
+        self.assertIsNot(after.get_adapter('https://well.ca'), before.get_adapter('https://well.ca'))
+
+
+if __name__ == '__main__':
+    unittest.main()
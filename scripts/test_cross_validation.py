@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+CrossValidator 테스트 (배열 단위 검증, 빈 입력, 텍스트/실패 분석, 입력 길이 검사)
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, '..', 'ai-analysis'))
+
+from fake_batch_server import CLAUDE_ANALYSIS, GPT_ANALYSIS
+from cross_validation import CrossValidator, DECISIONS, LOW_CONSISTENCY_STEP
+
+CLAUDE = {'status': 'success', 'analysis': dict(CLAUDE_ANALYSIS)}
+GPT = {'status': 'success', 'analysis': dict(GPT_ANALYSIS),
+       'margins': {'korean_price_krw': 39800, 'net_margin_percent': 30.0}}
+TEXT = {'status': 'success', 'analysis': '시장성은 높지만 경쟁이 심합니다.'}
+FAILED = {'status': 'failed', 'error': 'timeout'}
+
+
+class TestCrossValidator(unittest.TestCase):
+    def setUp(self):
+        self.validator = CrossValidator()
+
+    def test_empty_input(self):
+        self.assertEqual(self.validator.validate_many([], []), [])
+
+    def test_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.validator.validate_many([CLAUDE], [])
+
+    def test_structured_pair(self):
+        result = self.validator.validate_many([CLAUDE], [GPT])[0]
+        self.assertEqual(result['status'], 'success')
+        # 마진 차이 2.5%p, 판매가는 경쟁 가격대 안, 추천 일치, 키워드 '오메가3' 하나 겹침
+        self.assertEqual(result['agreement']['price'], 1.0)
+        self.assertEqual(result['agreement']['recommendation'], 1.0)
+        self.assertAlmostEqual(result['agreement']['margin'], 1 - 2.5 / 30, places=3)
+        self.assertAlmostEqual(result['agreement']['keywords'], 1 / 2, places=3)
+        self.assertEqual(result['final_recommendation']['decision'], '현지 조사 후 진행')
+
+    def test_text_and_failed_analyses(self):
+        results = self.validator.validate_many([TEXT, FAILED, CLAUDE], [TEXT, GPT, FAILED])
+        self.assertEqual(len(results), 3)
+
+        self.assertTrue(all(result['status'] == 'success' for result in results))
+        for result in (results[0], results[2]):
+            # 비교할 항목이 없으면 일치도 0, 신뢰도 0, 차이 검토 단계 추가
+            self.assertEqual(result['consistency_score'], 0.0)
+            self.assertEqual(result['final_recommendation']['confidence'], 0.0)
+            self.assertEqual(result['final_recommendation']['next_steps'][0], LOW_CONSISTENCY_STEP)
+        # Claude 실패: 판매가 위치(GPT 가격대 vs 마진 엔진)만 비교 가능
+        self.assertEqual([name for name, value in results[1]['agreement'].items() if value is not None], ['price'])
+        self.assertEqual(results[1]['final_recommendation']['confidence'], 0.25)
+
+        self.assertEqual(results[0]['agreement'], dict.fromkeys(results[0]['agreement']))
+        self.assertEqual(results[0]['final_score'], 0.0)
+        self.assertEqual(results[0]['final_recommendation']['decision'], DECISIONS[-1][1])
+        # GPT 결과가 없어도 Claude 점수로 최종 점수 계산
+        self.assertGreater(results[2]['final_score'], 0)
+
+    def test_single_matches_batch(self):
+        many = self.validator.validate_many([CLAUDE, TEXT], [GPT, TEXT])
+        single = self.validator.validate_analysis(CLAUDE, GPT)
+        self.assertEqual({k: v for k, v in single.items() if k != 'timestamp'},
+                         {k: v for k, v in many[0].items() if k != 'timestamp'})
+        self.assertEqual(self.validator.validate_analysis(CLAUDE, FAILED)['status'], 'failed')
+
+
+if __name__ == '__main__':
+    unittest.main()
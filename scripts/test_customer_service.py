@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+문의 분류 테스트 (Aho-Corasick 매처의 겹친 키워드, 여러 분류 근거, 자동 응답 기준 경계, 키워드/모델/담당자 분기)
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, '..', 'automation'))
+
+from keyword_matcher import KeywordMatcher
+from customer_service import CustomerService, AUTO_RESPONSE_CONFIDENCE, MODEL_CONFIDENCE
+from inquiry_model import InquiryModel
+from test_inquiry_model import labeled_inquiries
+
+
+class FakeModel:
+    """
+    메시지별로 정해 둔 (분류, 신뢰도)를 돌려주는 InquiryModel 대역
+    """
+    def __init__(self, predictions):
+        self.predictions = predictions
+        self.calls = []
+
+    def classify(self, messages):
+        self.calls.append(list(messages))
+        return [self.predictions[message] for message in messages]
+
+
+class TestKeywordMatcher(unittest.TestCase):
+    def test_overlapping_keywords(self):
+        matcher = KeywordMatcher({'a': ['배송', '배송비'], 'b': ['송비', '비']})
+        self.assertEqual(sorted(matcher.find('배송비')),
+                         [(0, '배송', 'a'), (0, '배송비', 'a'), (1, '송비', 'b'), (2, '비', 'b')])
+
+    def test_failure_link_continues_match(self):
+        # 'abcd'가 d에서 끊겨도 실패 링크로 'bce'를 이어서 찾음
+        matcher = KeywordMatcher({'a': ['abcd'], 'b': ['bce']})
+        self.assertEqual(matcher.find('xabce'), [(2, 'bce', 'b')])
+
+    def test_scores_count_distinct_keywords(self):
+        matcher = KeywordMatcher({'배송': ['배송', '도착'], '환불': ['환불', '반품'], '성분': ['NPN']})
+        evidence = matcher.scores('반품하면 배송비 환불되나요? 배송 도착이 늦어서요 npn')
+
+        self.assertEqual({name: entry['hits'] for name, entry in evidence.items()},
+                         {'환불': 2, '배송': 2, '성분': 1})
+        self.assertEqual(evidence['환불']['keywords'], ['반품', '환불'])
+        self.assertEqual(evidence['배송']['first'], 5)
+
+    def test_keyword_shared_by_categories(self):
+        matcher = KeywordMatcher({'a': ['환불'], 'b': ['환불', '취소']})
+        evidence = matcher.scores('환불')
+        self.assertEqual((evidence['a']['hits'], evidence['b']['hits']), (1, 1))
+
+
+class TestClassifyInquiry(unittest.TestCase):
+    def setUp(self):
+        # 모델 파일 없이 키워드 규칙만
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cs = CustomerService(model_path=os.path.join(self.tmp.name, 'missing.npz'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def classify(self, message):
+        result = self.cs.classify_inquiry(message)
+        return result['category'], result['confidence'], result['requires_human']
+
+    def test_single_category(self):
+        self.assertEqual(self.classify('환불 받고 싶어요'), ('환불', 0.84, False))
+        self.assertEqual(self.classify('배송은 언제 되나요?'), ('배송', 0.936, False))
+
+    def test_two_category_tie_auto_responds(self):
+        # 동률이면 먼저 나온 분류, 두 분류 동률은 자동 응답
+        self.assertEqual(self.classify('환불 배송'), ('환불', 0.56, False))
+        self.assertEqual(self.classify('배송 환불'), ('배송', 0.56, False))
+
+    def test_dominant_category_with_competing_evidence(self):
+        category, confidence, requires_human = self.classify('반품하면 배송비 환불되나요?')
+        self.assertEqual((category, requires_human), ('환불', False))
+        self.assertGreater(confidence, self.classify('환불 배송')[1])
+
+    def test_threshold_edges(self):
+        # 두 분류 2:2 동률은 기준 이상, 세 분류 동률(1:1:1, 2:2:2)은 기준 미만
+        for message, expected in [('배송 도착 환불 반품', False),
+                                  ('환불이랑 배송이랑 할인', True),
+                                  ('배송 도착 환불 반품 할인 쿠폰', True)]:
+            category, confidence, requires_human = self.classify(message)
+            self.assertEqual(requires_human, expected, message)
+            self.assertEqual(requires_human, confidence < AUTO_RESPONSE_CONFIDENCE, message)
+
+    def test_no_keywords(self):
+        self.assertEqual(self.classify('이상한 질문입니다'), ('기타', 0.3, True))
+
+
+class TestClassifyMany(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def service(self, model=None):
+        cs = CustomerService(model_path=os.path.join(self.tmp.name, 'missing.npz'))
+        cs.model = model
+        return cs
+
+    def test_keywords_first_then_model_then_human(self):
+        model = FakeModel({
+            '택배 조회가 안돼요': ('배송', MODEL_CONFIDENCE),
+            '이상한 질문입니다': ('가격', MODEL_CONFIDENCE - 0.01),
+            '환불이랑 배송이랑 할인': ('환불', 0.9),
+            '주문서 양식 있나요': ('기타', 0.95)
+        })
+        messages = ['환불 받고 싶어요', '택배 조회가 안돼요', '이상한 질문입니다', '환불이랑 배송이랑 할인',
+                    '주문서 양식 있나요']
+        results = self.service(model).classify_many(messages)
+
+        self.assertEqual([result['source'] for result in results], ['keywords', 'model', 'human', 'model', 'human'])
+        # 키워드로 자동 응답한 메시지는 모델에 보내지 않고, 나머지는 한 번에
+        self.assertEqual(model.calls, [messages[1:]])
+        self.assertEqual((results[1]['category'], results[1]['confidence']), ('배송', MODEL_CONFIDENCE))
+        self.assertEqual(results[2]['category'], '기타')
+        self.assertEqual(results[2]['model_prediction'], {'category': '가격', 'confidence': 0.59})
+        # FAQ에 없는 분류는 신뢰도가 높아도 담당자 확인
+        self.assertEqual(results[4]['model_prediction']['category'], '기타')
+
+    def test_without_model_keyword_results_only(self):
+        results = self.service().classify_many(['배송은 언제 되나요?', '택배 조회가 안돼요'])
+        self.assertEqual([result['source'] for result in results], ['keywords', 'human'])
+        self.assertNotIn('model_prediction', results[1])
+
+    def test_model_file_loaded_at_startup(self):
+        path = InquiryModel.train(*labeled_inquiries()).save(os.path.join(self.tmp.name, 'inquiry_model.npz'))
+        cs = CustomerService(model_path=path)
+        self.assertIsInstance(cs.model, InquiryModel)
+
+        result = cs.classify_many(['운송장 번호 알려주세요 확인 부탁드립니다'])[0]
+        self.assertEqual((result['category'], result['source']), ('배송', 'model'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+DuoAnalyzer 테스트 (Claude/GPT 병렬 호출, 입력 순서 결과 병합, 부분 실패 상태)
+"""
+
+import os
+import sys
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, '..', 'ai-analysis'))
+
+from fake_batch_server import CLAUDE_ANALYSIS, GPT_ANALYSIS
+from duo_analysis import DuoAnalyzer
+from gpt_analysis import GPTAnalyzer
+
+DELAY = 0.1
+
+
+class FakeClaude:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+
+    def analyze_product(self, product):
+        time.sleep(DELAY)
+        if product['name'] in self.fail:
+            return {'status': 'failed', 'error': 'claude down'}
+        return {'status': 'success', 'analysis': dict(CLAUDE_ANALYSIS)}
+
+
+def fake_gpt(fail=()):
+    gpt = GPTAnalyzer(client=object())
+
+    def analyze_marketing(product):
+        time.sleep(DELAY)
+        if product['name'] in fail:
+            return {'status': 'failed', 'error': 'gpt down'}
+        return {'status': 'success', 'analysis': dict(GPT_ANALYSIS)}
+
+    gpt.analyze_marketing = analyze_marketing
+    return gpt
+
+
+PRODUCTS = [
+    {'name': f"Product {i}", 'price_cad': 10.0 + i, 'category': '건강식품'} for i in range(4)
+]
+
+
+class TestDuoAnalyzer(unittest.TestCase):
+    def test_parallel_calls_merged_in_input_order(self):
+        duo = DuoAnalyzer(claude=FakeClaude(), gpt=fake_gpt(), max_concurrency=8)
+        started = time.perf_counter()
+        results = duo.analyze_many(PRODUCTS)
+        elapsed = time.perf_counter() - started
+
+        # 8개 호출(제품 4 × 2)이 모두 동시에: 순차 실행(8 × DELAY)보다 훨씬 빠름
+        self.assertLess(elapsed, DELAY * 4)
+        self.assertEqual([r['product']['name'] for r in results], [p['name'] for p in PRODUCTS])
+        self.assertTrue(all(r['status'] == 'success' for r in results))
+        self.assertTrue(all('validation' in r and 'margins' in r['gpt'] for r in results))
+        # 제품마다 자기 가격으로 계산한 마진
+        self.assertEqual(len({r['gpt']['margins']['goods_krw'] for r in results}), len(PRODUCTS))
+        for result in results:
+            timings = result['timings']
+            self.assertEqual(timings['product_seconds'], max(timings['claude_seconds'], timings['gpt_seconds']))
+
+    def test_partial_and_failed_status(self):
+        duo = DuoAnalyzer(claude=FakeClaude(fail={'Product 1', 'Product 2'}), gpt=fake_gpt(fail={'Product 2'}))
+        results = duo.analyze_many(PRODUCTS)
+
+        self.assertEqual([r['status'] for r in results], ['success', 'partial', 'failed', 'success'])
+        # 교차 검증은 두 분석이 모두 성공한 제품만
+        self.assertEqual(['validation' in r for r in results], [True, False, False, True])
+
+    def test_concurrency_limit(self):
+        duo = DuoAnalyzer(claude=FakeClaude(), gpt=fake_gpt(), max_concurrency=2)
+        started = time.perf_counter()
+        duo.analyze_many(PRODUCTS)
+        # 동시 호출 2개 → 호출 8개는 4번에 나눠 실행
+        self.assertGreaterEqual(time.perf_counter() - started, DELAY * 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+FirecrawlScraper 테스트 (대역 Firecrawl 클라이언트)
+- scrape_many: 도메인별 동시 요청 수, 결과 순서, URL별 실패 격리
+"""
+
+import os
+import sys
+import json
+import time
+import tempfile
+import threading
+import unittest
+from urllib.parse import urlparse
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'data-collection'))
+
+from firecrawl_scraper import FirecrawlScraper
+from rate_limiter import FirecrawlLimiter
+from url_frontier import canonicalize_url, URLFrontier
+from crawl_state import CrawlStateStore
+
+
+class StubApp:
+    """
+    scrape_url/crawl_url만 흉내 내는 FirecrawlApp 대역 (도메인별 최대 동시 호출 수 기록)
+    """
+    def __init__(self, delay=0.02, fail=(), pages=()):
+        self.delay = delay
+        self.fail = set(fail)
+        # crawl_url이 돌려줄 {원래 URL: 마크다운}
+        self.pages = dict(pages)
+        self.calls = []
+        self.active = {}
+        self.peak = {}
+        self._lock = threading.Lock()
+
+    def scrape_url(self, url, params):
+        domain = urlparse(url).netloc
+        with self._lock:
+            self.calls.append(url)
+            self.active[domain] = self.active.get(domain, 0) + 1
+            self.peak[domain] = max(self.peak.get(domain, 0), self.active[domain])
+        time.sleep(self.delay)
+        with self._lock:
+            self.active[domain] -= 1
+        if url in self.fail:
+            raise ValueError('Unexpected error: Status code: 404')
+        return {'markdown': url, 'extract': {'product_name': url, 'price': '$1.00'}}
+
+    def crawl_url(self, base_url, params, wait_until_done=True):
+        return {'data': [{'markdown': markdown, 'metadata': {'sourceURL': url}}
+                         for url, markdown in self.pages.items()]}
+
+
+class MarkdownExtractor:
+    """
+    마크다운에 'local'이 있는 페이지만 필수 필드를 채우는 LocalExtractor 대역
+    """
+    def extract(self, url, html=None, markdown=None):
+        if 'local' in (markdown or ''):
+            return {'product_name': url, 'price': '$2.00'}
+        return {}
+
+
+class BrokenCache:
+    """
+    특정 URL 조회에서 예외를 내는 ScrapeCache 대역
+    """
+    def __init__(self, broken_url):
+        self.broken_url = canonicalize_url(broken_url)
+        self.stored = {}
+
+    def get(self, key):
+        if key.split('#', 1)[0] == self.broken_url:
+            raise OSError('disk I/O error')
+        return None
+
+    def set(self, key, value):
+        self.stored[key] = value
+
+
+def make_urls():
+    return ([f"https://well.ca/products/p{i}.html" for i in range(6)] +
+            [f"https://www.londondrugs.com/p{i}.html" for i in range(4)])
+
+
+class TestScrapeMany(unittest.TestCase):
+    def scraper(self, app, **kwargs):
+        return FirecrawlScraper(app=app, use_local=False,
+                                limiter=FirecrawlLimiter(requests_per_minute=60000, max_retries=0), **kwargs)
+
+    def test_per_domain_limit_and_order(self):
+        app = StubApp()
+        urls = make_urls()
+        results = self.scraper(app).scrape_many(urls, max_workers=8, per_domain=2)
+
+        self.assertEqual([r['url'] for r in results], urls)
+        self.assertTrue(all(r['status'] == 'success' for r in results))
+        self.assertEqual(sorted(app.calls), sorted(urls))
+        self.assertEqual(max(app.peak.values()), 2)
+
+    def test_unordered_yields_every_url(self):
+        urls = make_urls()
+        results = list(self.scraper(StubApp()).scrape_many(urls, per_domain=3, ordered=False))
+        self.assertEqual(sorted(r['url'] for r in results), sorted(urls))
+
+    def test_failures_isolated_per_url(self):
+        urls = make_urls()
+        app = StubApp(fail={urls[1]})
+        scraper = self.scraper(app, cache=BrokenCache(urls[7]))
+        results = scraper.scrape_many(urls)
+
+        failed = [i for i, r in enumerate(results) if r['status'] == 'failed']
+        self.assertEqual(failed, [1, 7])
+        self.assertIn('404', results[1]['error'])
+        self.assertIn('disk I/O error', results[7]['error'])
+
+    def test_per_domain_validated(self):
+        with self.assertRaises(ValueError):
+            self.scraper(StubApp()).scrape_many(make_urls(), per_domain=0)
+
+
+class StreamingApp:
+    """
+    비동기 크롤링 작업 대역: 상태 조회마다 페이지가 하나씩 늘어나고 마지막 조회에서 final_state
+    """
+    def __init__(self, count=3, final_state='completed'):
+        self.count = count
+        self.final_state = final_state
+        self.polls = 0
+
+    def crawl_url(self, base_url, params, wait_until_done=True):
+        assert wait_until_done is False
+        return {'jobId': 'job-1'}
+
+    def check_crawl_status(self, job_id):
+        self.polls += 1
+        pages = [{'markdown': f"page {i}", 'metadata': {'sourceURL': f"https://shop.ca/p/{i}", 'title': str(i)}}
+                 for i in range(min(self.polls, self.count))]
+        state = self.final_state if self.polls >= self.count else 'scraping'
+        return {'status': state, 'partial_data': pages, 'error': 'boom' if state == 'failed' else None}
+
+
+class TestCategoryStreaming(unittest.TestCase):
+    def scraper(self, app):
+        return FirecrawlScraper(app=app, use_local=False,
+                                limiter=FirecrawlLimiter(requests_per_minute=60000, max_retries=0))
+
+    def test_pages_yielded_while_crawl_runs(self):
+        app = StreamingApp(count=3)
+        pages = self.scraper(app).iter_category_pages('https://shop.ca/c', poll_interval=0)
+
+        # 첫 페이지는 작업이 끝나기 전(상태 조회 1회 후)에 바로 나옴
+        first = next(pages)
+        self.assertEqual((first['url'], app.polls), ('https://shop.ca/p/0', 1))
+        rest = list(pages)
+        self.assertEqual([r['url'] for r in rest], ['https://shop.ca/p/1', 'https://shop.ca/p/2'])
+        self.assertEqual(app.polls, 3)
+
+    def test_jsonl_written_per_page_and_failure_reported(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'pages.jsonl')
+            result = self.scraper(StreamingApp(count=2)).write_category_jsonl(
+                'https://shop.ca/c', path, poll_interval=0)
+            self.assertEqual((result['status'], result['pages_written']), ('success', 2))
+
+            failed = self.scraper(StreamingApp(count=2, final_state='failed')).write_category_jsonl(
+                'https://shop.ca/c', path, poll_interval=0)
+            self.assertEqual((failed['status'], failed['pages_written']), ('failed', 2))
+            self.assertIn('boom', failed['error'])
+
+            with open(path, encoding='utf-8') as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual([r['title'] for r in records], ['0', '1', '0', '1'])
+
+
+class TestIncrementalCrawl(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.frontier = URLFrontier(path=os.path.join(self.tmp.name, 'frontier.sqlite3'))
+        self.state = CrawlStateStore(path=os.path.join(self.tmp.name, 'state.sqlite3'))
+
+    def tearDown(self):
+        self.frontier.close()
+        self.tmp.cleanup()
+
+    def test_fetches_original_urls_and_marks_local_pages(self):
+        local_url = 'http://www.shop.ca/p/1.html'
+        remote_url = 'http://www.shop.ca/p/2.html'
+        app = StubApp(pages={local_url: 'local page', remote_url: 'remote page'})
+        scraper = FirecrawlScraper(app=app, local_extractor=MarkdownExtractor(), frontier=self.frontier,
+                                   crawl_state=self.state,
+                                   limiter=FirecrawlLimiter(requests_per_minute=60000, max_retries=0))
+
+        first = scraper.scrape_category_incremental('https://www.shop.ca/c')
+        self.assertEqual(len(first['added']), 2)
+        self.assertEqual(sorted(r['url'] for r in first['extracted']), [local_url, remote_url])
+        # 개별 추출은 크롤링이 돌려준 URL 그대로 (www/http 유지)
+        self.assertEqual(app.calls, [remote_url])
+        self.assertTrue(self.frontier.seen(local_url))
+        self.assertTrue(self.frontier.seen(remote_url))
+
+        second = scraper.scrape_category_incremental('https://www.shop.ca/c')
+        self.assertEqual((second['added'], second['changed'], second['unchanged_count']), ([], [], 2))
+        self.assertEqual(app.calls, [remote_url])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+문의 분류 모델 테스트 (학습 분할만으로 어휘/IDF, 분류, 모델 파일 저장/로드)
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'automation'))
+
+from inquiry_model import InquiryModel, split_indices
+
+# FAQ 키워드가 없는 문의 (키워드 규칙으로는 담당자 확인)
+PHRASES = {
+    '배송': ['택배 조회가 안돼요', '물건이 아직 안 왔어요', '운송장 번호 알려주세요', '통관 중이라고 나와요',
+           '택배사가 어디인가요'],
+    '환불': ['돈 돌려받고 싶어요', '결제 철회 부탁드려요', '주문 철회하고 싶어요', '돌려보내려면 어떻게 하나요',
+           '입금 돌려주세요'],
+    '성분': ['임산부가 먹어도 되나요', '비건 제품인가요', '젤라틴 들어있나요', '글루텐 프리인가요',
+           '캡슐 재질이 뭔가요'],
+    '가격': ['더 싸게 살 수 있나요', '적립금 사용 되나요', '묶음 구매 혜택 있나요', '프로모션 코드 있나요',
+           '회원 등급 혜택 알려주세요']
+}
+SUFFIXES = ['', ' 빨리 답변 부탁드려요', ' 확인 부탁드립니다', ' 궁금합니다']
+
+
+def labeled_inquiries():
+    messages, labels = [], []
+    for category, phrases in PHRASES.items():
+        for phrase in phrases:
+            for suffix in SUFFIXES:
+                messages.append(phrase + suffix)
+                labels.append(category)
+    return messages, labels
+
+
+class TestInquiryModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.messages, cls.labels = labeled_inquiries()
+        cls.model = InquiryModel.train(cls.messages, cls.labels)
+
+    def test_vocabulary_from_training_split_only(self):
+        messages = list(self.messages)
+        training, validation = split_indices(len(messages))
+        self.assertGreaterEqual(len(validation), 2)
+        for index in validation:
+            messages[index] += ' zqxj'
+
+        model = InquiryModel.train(messages, self.labels)
+        self.assertFalse([ngram for ngram in model.vocabulary if 'zq' in ngram])
+        # IDF 문서 수도 학습 분할 기준 (가장 드문 n-gram의 문서 빈도는 min_df=2)
+        self.assertAlmostEqual(model.idf.max(), np.log((1 + len(training)) / (1 + 2)) + 1)
+
+    def test_classifies_unseen_phrasing(self):
+        predictions = self.model.classify(['운송장 번호 궁금해요', '결제 철회 가능할까요', '비건 인증 궁금합니다'])
+        self.assertEqual([category for category, _ in predictions], ['배송', '환불', '성분'])
+        for _, confidence in predictions:
+            self.assertTrue(0 < confidence <= 1)
+
+        probabilities = self.model.predict_proba(['택배사가 어디인가요', ''])
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1)
+        self.assertEqual(self.model.predict_proba([]).shape, (0, 4))
+
+    def test_save_load_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = self.model.save(os.path.join(tmp, 'models', 'inquiry_model.npz'))
+            self.assertEqual(os.listdir(os.path.dirname(path)), ['inquiry_model.npz'])
+            loaded = InquiryModel.load(path)
+
+        self.assertEqual(loaded.classes, self.model.classes)
+        self.assertEqual(loaded.vocabulary, self.model.vocabulary)
+        self.assertEqual((loaded.temperature, loaded.ngram_range), (self.model.temperature, self.model.ngram_range))
+        np.testing.assert_array_equal(loaded.predict_proba(self.messages), self.model.predict_proba(self.messages))
+
+
+if __name__ == '__main__':
+    unittest.main()
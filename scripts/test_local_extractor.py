@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+LocalExtractor 테스트 (사이트별 셀렉터 도메인 매칭, 마크다운 추정 필드)
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'data-collection'))
+
+from local_extractor import LocalExtractor, missing_required, GUESSED_KEY
+
+WELL_HTML = """
+<html><body>
+  <h1 class="product-name">Omega-3 Fish Oil</h1>
+  <span class="product-price">$29.99</span>
+</body></html>
+"""
+
+
+class TestLocalExtractor(unittest.TestCase):
+    def setUp(self):
+        self.extractor = LocalExtractor()
+
+    def test_selectors_match_domain_and_subdomains(self):
+        for url in ('https://well.ca/products/omega.html', 'https://www.well.ca:443/products/omega.html'):
+            fields = self.extractor.extract(url, html=WELL_HTML)
+            self.assertEqual(fields['product_name'], 'Omega-3 Fish Oil', url)
+            self.assertEqual(missing_required(fields), [], url)
+
+    def test_selectors_need_dot_boundary(self):
+        fields = self.extractor.extract('https://notwell.ca/products/omega.html', html=WELL_HTML)
+        self.assertFalse(fields.get('product_name'))
+        self.assertIn('product_name', missing_required(fields))
+
+    def test_markdown_guesses_are_not_required_fields(self):
+        fields = self.extractor.extract('https://example.ca/p', markdown='# Maple Syrup\n\nFree shipping over $49.00')
+        self.assertIn('price', fields[GUESSED_KEY])
+        self.assertIn('price', missing_required(fields))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+MarginEngine 테스트 (통화 변환, 판매가 상한, prepare() 결과 재사용)
+"""
+
+import os
+import sys
+import math
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'data-collection'))
+sys.path.insert(0, os.path.join(ROOT, '..', 'ai-analysis'))
+
+from product_record import ProductRecord
+from margin_engine import MarginEngine
+
+
+class TestMarginEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = MarginEngine(exchange_rate=1000)
+
+    def test_currency_conversion(self):
+        usd_per_cad = self.engine.cost_table['usd_per_cad']
+        products = [
+            {'name': 'cad', 'price_cad': 29.99},
+            ProductRecord(name='usd', price_cents=1999, currency='USD'),
+            ProductRecord(name='krw', price_cents=2000000, currency='KRW').to_dict(),
+            {'name': 'cents', 'price_cents': 1999, 'currency': 'USD', 'price_cad': None}
+        ]
+        prices = self.engine.to_cad(self.engine.prepare(products))
+        self.assertAlmostEqual(prices[0], 29.99)
+        self.assertAlmostEqual(prices[1], 19.99 / usd_per_cad)
+        self.assertAlmostEqual(prices[2], 20.0)
+        self.assertAlmostEqual(prices[3], 19.99 / usd_per_cad)
+
+    def test_unknown_price(self):
+        self.assertEqual(self.engine.calculate_records([{'name': 'x'}]), [None])
+
+    def test_price_cap(self):
+        product = {'name': 'x', 'price_cad': 29.99, 'category': '건강식품'}
+        uncapped = self.engine.calculate_records([product])[0]
+        capped = self.engine.calculate_records([product], price_caps=[30000])[0]
+        self.assertEqual(capped['korean_price_krw'], min(uncapped['korean_price_krw'], 30000))
+
+    def test_non_positive_caps_ignored(self):
+        product = {'name': 'x', 'price_cad': 29.99, 'category': '건강식품'}
+        uncapped = self.engine.calculate_records([product])[0]
+        for cap in (0, -5000, None, float('nan')):
+            record = self.engine.calculate_records([product], price_caps=[cap])[0]
+            self.assertEqual(record, uncapped, cap)
+            self.assertFalse(math.isnan(record['net_margin_percent']))
+
+    def test_with_costs_recalculates(self):
+        product = {'name': 'x', 'price_cad': 29.99, 'category': '건강식품'}
+        base = self.engine.calculate_records([product])[0]
+        cheaper = self.engine.with_costs(shipping_fees_krw=[0, 0, 0, 0]).calculate_records([product])[0]
+        self.assertEqual(base['total_cost_krw'] - cheaper['total_cost_krw'], base['shipping_krw'])
+
+    def test_krw_price_uses_calculate_rate(self):
+        # 원화 가격 제품은 환율과 무관하게 같은 원화 원가
+        product = {'name': 'krw', 'price_cents': 2000000, 'currency': 'KRW'}
+        inputs = self.engine.prepare([product])
+        for rate in (1000, 1350):
+            goods = self.engine.calculate(inputs, exchange_rate=rate)['goods_krw']
+            self.assertAlmostEqual(goods[0], 20000)
+
+    def test_prepared_inputs_follow_rate_and_cost_changes(self):
+        products = [
+            {'name': 'usd', 'price_cents': 1999, 'currency': 'USD', 'category': '건강식품'},
+            {'name': 'heavy', 'price_cad': 29.99, 'category': '펫용품'},
+            {'name': 'weighed', 'price_cad': 29.99, 'weight_kg': 0.2, 'category': '펫용품'}
+        ]
+        inputs = self.engine.prepare(products)
+
+        changed = self.engine.with_costs(usd_per_cad=0.5, category_weights_kg={'펫용품': 0.4})
+        self.assertEqual(changed.calculate_records(inputs, exchange_rate=1350),
+                         changed.calculate_records(products, exchange_rate=1350))
+        # 기준표 변경 후 추정 중량(0.4kg)과 명시 중량(0.2kg)은 같은 배송 구간
+        shipping = changed.calculate(inputs)['shipping_krw']
+        self.assertEqual(shipping[1], shipping[2])
+
+
+if __name__ == '__main__':
+    unittest.main()
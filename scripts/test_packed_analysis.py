@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+PackedAnalyzer 테스트 (제품별 사용량/비용 분배, count_tokens 기준 절감량, 누락 제품 재요청)
+"""
+
+import os
+import re
+import sys
+import tempfile
+import unittest
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, '..', 'ai-analysis'))
+
+from fake_batch_server import CLAUDE_ANALYSIS
+from analysis_metrics import AnalysisMetrics
+from claude_analysis import ClaudeAnalyzer, MODEL
+from packed_analysis import PackedAnalyzer, split_usage
+
+PRODUCTS = [
+    {'name': f"Product {i}", 'brand': 'NaturePath', 'price_cad': 10.0 + i, 'category': '건강식품'} for i in range(3)
+]
+USAGE = {'input_tokens': 901, 'output_tokens': 300, 'cache_read_input_tokens': 2000,
+         'cache_creation_input_tokens': 0}
+SINGLE_INPUT_TOKENS = 1500
+
+
+class FakeMessages:
+    """
+    Anthropic messages 대역 (묶음 응답에서 skip의 id는 빠뜨림)
+    """
+
+    def __init__(self, skip=()):
+        self.skip = set(skip)
+        self.calls = []
+        self.with_raw_response = self
+
+    def create(self, **params):
+        self.calls.append(params)
+        ids = re.findall(r'"id": "(p\d+)"', params['messages'][0]['content'])
+        analyses = [{'id': i, 'analysis': dict(CLAUDE_ANALYSIS)} for i in ids if i not in self.skip]
+        self.skip = set()
+        message = SimpleNamespace(
+            content=[SimpleNamespace(type='tool_use', name='record_analyses', input={'analyses': analyses})],
+            usage=SimpleNamespace(**USAGE)
+        )
+        return SimpleNamespace(parse=lambda: message, retries_taken=0)
+
+    def count_tokens(self, **params):
+        return SimpleNamespace(input_tokens=SINGLE_INPUT_TOKENS)
+
+
+class TestPackedAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.metrics = AnalysisMetrics(path=os.path.join(self.tmp.name, 'metrics.prom'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def packed(self, messages, **kwargs):
+        claude = ClaudeAnalyzer(metrics=self.metrics, client=SimpleNamespace(messages=messages))
+        return PackedAnalyzer(claude=claude, **kwargs)
+
+    def test_split_usage_keeps_totals(self):
+        shares = split_usage(USAGE, 3)
+        self.assertEqual([s['input_tokens'] for s in shares], [301, 300, 300])
+        for name, value in USAGE.items():
+            self.assertEqual(sum(s[name] for s in shares), value)
+
+    def test_results_carry_usage_model_and_cost(self):
+        results = self.packed(FakeMessages()).analyze_many(PRODUCTS)
+
+        self.assertTrue(all(r['status'] == 'success' and r['packed'] for r in results))
+        self.assertEqual(sum(r['usage']['output_tokens'] for r in results), USAGE['output_tokens'])
+        for result in results:
+            self.assertEqual(result['model'], MODEL)
+            self.assertGreater(result['cost_usd'], 0)
+        self.assertAlmostEqual(sum(r['cost_usd'] for r in results),
+                               self.metrics.summary()['claude']['cost_usd'], places=5)
+
+    def test_savings_from_reported_input_tokens(self):
+        packed = self.packed(FakeMessages())
+        packed.analyze_many(PRODUCTS)
+        stats = packed.stats()
+
+        packed_per_product = (USAGE['input_tokens'] + USAGE['cache_read_input_tokens']) / len(PRODUCTS)
+        self.assertEqual(stats['single_input_tokens_per_product'], SINGLE_INPUT_TOKENS)
+        self.assertEqual(stats['tokens_saved_per_product'], round(SINGLE_INPUT_TOKENS - packed_per_product, 1))
+
+        unmeasured = self.packed(FakeMessages(), measure_savings=False)
+        unmeasured.analyze_many(PRODUCTS)
+        self.assertNotIn('tokens_saved_per_product', unmeasured.stats())
+
+    def test_missing_products_retried(self):
+        messages = FakeMessages(skip={'p1'})
+        packed = self.packed(messages)
+        results = packed.analyze_many(PRODUCTS)
+
+        self.assertEqual([r['status'] for r in results], ['success'] * 3)
+        self.assertEqual(len(messages.calls), 2)
+        self.assertEqual(packed.stats()['retried_products'], 1)
+        # 첫 묶음은 3개 제품으로 나눈 몫, 재요청은 p1 혼자
+        self.assertEqual(results[0]['pack_size'], 3)
+        self.assertEqual(results[1]['pack_size'], 1)
+        self.assertEqual(results[1]['usage']['input_tokens'], USAGE['input_tokens'])
+
+
+if __name__ == '__main__':
+    unittest.main()
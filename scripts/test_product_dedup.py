@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+ProductDeduplicator 테스트 (LSH 클러스터링, 클러스터 단위 용량 확인, 구성원 가격별 마진)
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, '..', 'data-collection'))
+sys.path.insert(0, os.path.join(ROOT, '..', 'ai-analysis'))
+
+from product_dedup import ProductDeduplicator
+from fake_batch_server import CLAUDE_ANALYSIS, GPT_ANALYSIS
+from duo_analysis import DuoAnalyzer
+from gpt_analysis import GPTAnalyzer
+
+
+class FakeClaude:
+    def analyze_product(self, product):
+        return {'status': 'success', 'analysis': dict(CLAUDE_ANALYSIS)}
+
+
+class TestProductDeduplicator(unittest.TestCase):
+    def setUp(self):
+        self.dedup = ProductDeduplicator()
+
+    def test_near_duplicates_cluster(self):
+        products = [
+            {'name': 'NaturePath Omega-3 Fish Oil 120 Softgels', 'brand': 'NaturePath', 'price_cad': 29.99},
+            {'name': 'Omega 3 Fish Oil - 120 softgels', 'brand': 'NaturePath', 'price_cad': 31.49,
+             'description': 'Wild-caught salmon oil'},
+            {'name': 'Maple Syrup Lip Balm', 'brand': 'Maple Beauty', 'price_cad': 6.49}
+        ]
+        clusters = self.dedup.cluster(products).tolist()
+        # 정보가 더 많은 두 번째 제품이 대표
+        self.assertEqual(clusters, [1, 1, 2])
+
+    def test_sizes_checked_per_cluster(self):
+        # 용량 없는 제품이 버킷 첫 제품이면 쌍 (0, 1), (0, 2)는 각각 용량 조건을 통과
+        products = [
+            {'name': 'NaturePath Omega-3 Fish Oil', 'brand': 'NaturePath'},
+            {'name': 'NaturePath Omega-3 Fish Oil 120 Softgels', 'brand': 'NaturePath'},
+            {'name': 'NaturePath Omega-3 Fish Oil 60 Softgels', 'brand': 'NaturePath'}
+        ]
+        clusters = self.dedup.cluster(products).tolist()
+        self.assertNotEqual(clusters[1], clusters[2])
+        self.assertIn(clusters[0], (clusters[1], clusters[2]))
+
+    def test_same_size_members_merge_regardless_of_order(self):
+        # 버킷 첫 제품(60)과 용량이 달라도 120 제품끼리는 합쳐져야 함
+        name = 'NaturePath Omega-3 Fish Oil'
+        products = [
+            {'name': name, 'size': '60 Softgels', 'brand': 'NaturePath'},
+            {'name': name, 'size': '120 Softgels', 'brand': 'NaturePath'},
+            {'name': name, 'size': '120 Softgels', 'brand': 'NaturePath'}
+        ]
+        clusters = self.dedup.cluster(products).tolist()
+        self.assertEqual(clusters, [0, 1, 1])
+
+        reordered = [products[1], products[0], products[2]]
+        clusters = self.dedup.cluster(reordered).tolist()
+        self.assertEqual(clusters, [0, 1, 0])
+
+    def test_empty_text_not_merged(self):
+        products = [{'name': ''}, {'name': None, 'brand': ''}, {'price_cad': 5.0}, {'name': '!!!'}]
+        canonical, positions = self.dedup.dedupe(products)
+        self.assertEqual(len(canonical), 4)
+        self.assertEqual(positions, [0, 1, 2, 3])
+
+    def test_members_repriced(self):
+        gpt = GPTAnalyzer(client=object())
+        gpt.analyze_marketing = lambda product: {'status': 'success', 'analysis': dict(GPT_ANALYSIS)}
+        duo = DuoAnalyzer(claude=FakeClaude(), gpt=gpt, deduplicator=self.dedup)
+
+        products = [
+            {'name': 'Omega 3 Fish Oil - 120 softgels', 'brand': 'NaturePath', 'price_cad': 29.99,
+             'category': '건강식품', 'description': 'Wild-caught salmon oil'},
+            {'name': 'NaturePath Omega-3 Fish Oil 120 Softgels', 'brand': 'NaturePath', 'price_cad': 19.99,
+             'category': '건강식품'}
+        ]
+        results = duo.analyze_many(products)
+        self.assertIs(results[1]['duplicate_of'], products[0])
+        self.assertIs(results[1]['product'], products[1])
+
+        expected = gpt.margin_engine.calculate_records(
+            products, price_caps=[GPT_ANALYSIS['competitor_price_range']['max_krw']] * 2)
+        self.assertEqual([r['gpt']['margins'] for r in results], expected)
+        self.assertNotEqual(results[0]['gpt']['margins'], results[1]['gpt']['margins'])
+        self.assertNotEqual(results[0]['validation'], results[1]['validation'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+ProductRecord / 가격 파싱 테스트
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'data-collection'))
+sys.path.insert(0, os.path.join(ROOT, '..', 'collaboration'))
+
+from product_record import ProductRecord, parse_price
+from field_research import FieldResearch
+
+
+class TestParsePrice(unittest.TestCase):
+    def test_formats(self):
+        cases = {
+            '$29.99': (2999, 'CAD'),
+            'CAD 29.99': (2999, 'CAD'),
+            'CA$1,299.00': (129900, 'CAD'),
+            'US$ 5': (500, 'USD'),
+            '₩12,000': (1200000, 'KRW'),
+            '12000원': (1200000, 'KRW'),
+            29.99: (2999, 'CAD'),
+        }
+        for value, expected in cases.items():
+            self.assertEqual(parse_price(value), expected, value)
+
+    def test_french_canadian_decimal_comma(self):
+        self.assertEqual(parse_price('29,99 $'), (2999, 'CAD'))
+        self.assertEqual(parse_price('1 299,99 $'), (129999, 'CAD'))
+        self.assertEqual(parse_price('1 299,99 $'), (129999, 'CAD'))
+
+    def test_missing(self):
+        self.assertEqual(parse_price(None), (None, 'CAD'))
+        self.assertEqual(parse_price('가격 문의'), (None, 'CAD'))
+
+
+class TestProductRecord(unittest.TestCase):
+    def record(self, price_cents, currency):
+        return ProductRecord(name='Omega-3', brand='NaturePath', price_cents=price_cents, currency=currency,
+                             category='건강식품', ingredients=['fish oil'], rating=4.5, reviews_count=120,
+                             source_url='https://well.ca/p/1')
+
+    def test_round_trip_keeps_currency(self):
+        for currency, cents in (('CAD', 2999), ('USD', 1999), ('KRW', 1200000)):
+            record = self.record(cents, currency)
+            self.assertEqual(ProductRecord.from_dict(record.to_dict()), record, currency)
+
+    def test_non_cad_has_no_cad_price(self):
+        data = self.record(1999, 'USD').to_dict()
+        self.assertIsNone(data['price_cad'])
+        self.assertEqual((data['price'], data['currency']), (19.99, 'USD'))
+
+    def test_price_cents_takes_precedence(self):
+        record = ProductRecord.from_dict({'name': 'x', 'price_cents': 1500, 'currency': 'USD', 'price_cad': 99})
+        self.assertEqual((record.price_cents, record.currency), (1500, 'USD'))
+
+    def test_legacy_price_cad(self):
+        record = ProductRecord.from_dict({'name': 'x', 'price_cad': '29,99 $'})
+        self.assertEqual((record.price_cents, record.currency), (2999, 'CAD'))
+
+
+class TestFieldResearchRecords(unittest.TestCase):
+    def test_non_cad_price_survives_to_records(self):
+        research = FieldResearch()
+        research.add_research_data({'product_name': 'a', 'price_cad': 'US$ 5'})
+        research.add_research_data({'product_name': 'b', 'price_cad': '24,99 $'})
+        research.add_research_data({'product_name': 'c'})
+
+        self.assertEqual([(e['price_cad'], e.get('currency')) for e in research.research_data],
+                         [(None, 'USD'), (24.99, None), (None, None)])
+        self.assertEqual([(r.price_cents, r.currency) for r in research.to_records()],
+                         [(500, 'USD'), (2499, 'CAD'), (None, 'CAD')])
+
+
+if __name__ == '__main__':
+    unittest.main()
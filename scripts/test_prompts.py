@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+프롬프트 버전 해시 테스트 (내용/스키마 변경 시 버전 변경, 분석기별 버전 분리)
+"""
+
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'ai-analysis'))
+
+import prompts
+from analysis_schema import ClaudeAnalysis
+from prompts import prompt_version
+
+
+class TestPromptVersion(unittest.TestCase):
+    def test_stable_for_same_content(self):
+        self.assertEqual(prompt_version('system', 'template {product_json}'),
+                         prompt_version('system', 'template {product_json}'))
+        self.assertRegex(prompt_version('system'), r'^[0-9a-f]{12}$')
+
+    def test_changes_with_any_template(self):
+        base = prompt_version('system', 'template', {'type': 'object'})
+        self.assertNotEqual(base, prompt_version('system ', 'template', {'type': 'object'}))
+        self.assertNotEqual(base, prompt_version('system', 'template.', {'type': 'object'}))
+        self.assertNotEqual(base, prompt_version('system', 'template', {'type': 'array'}))
+        self.assertNotEqual(base, prompt_version('template', 'system', {'type': 'object'}))
+
+    def test_template_boundaries_matter(self):
+        self.assertNotEqual(prompt_version('ab', 'c'), prompt_version('a', 'bc'))
+
+    def test_schema_key_order_ignored(self):
+        self.assertEqual(prompt_version({'a': 1, 'b': [1, 2]}), prompt_version({'b': [1, 2], 'a': 1}))
+
+    def test_schema_change_changes_version(self):
+        schema = ClaudeAnalysis.schema()
+        schema['properties'] = dict(schema['properties'], extra={'type': 'string'})
+        self.assertNotEqual(
+            prompts.CLAUDE_PROMPT_VERSION,
+            prompt_version(prompts.CLAUDE_SYSTEM_PROMPT, prompts.CLAUDE_PRODUCT_TEMPLATE, schema)
+        )
+
+    def test_versions_differ_per_analyzer(self):
+        versions = {prompts.CLAUDE_PROMPT_VERSION, prompts.GPT_PROMPT_VERSION,
+                    prompts.SCREENING_PROMPT_VERSION, prompts.PACKED_PROMPT_VERSION}
+        self.assertEqual(len(versions), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
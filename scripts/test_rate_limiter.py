@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+FirecrawlLimiter 테스트 (서킷 브레이커, Retry-After 상한, 재시도 소진 보고)
+"""
+
+import os
+import sys
+import time
+import unittest
+from email.utils import formatdate
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'data-collection'))
+
+from rate_limiter import FirecrawlLimiter, RetriesExhausted, retry_after_of, shared_limiter
+from firecrawl_scraper import FirecrawlScraper
+
+
+class HTTPError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def failing(*errors):
+    """
+    errors를 차례로 던지고 다 쓰면 'ok'를 반환하는 함수
+    """
+    errors = list(errors)
+
+    def call():
+        if errors:
+            raise errors.pop(0)
+        return 'ok'
+    return call
+
+
+class TestFirecrawlLimiter(unittest.TestCase):
+    def limiter(self, **kwargs):
+        kwargs.setdefault('base_delay', 0)
+        return FirecrawlLimiter(requests_per_minute=60000, **kwargs)
+
+    def test_client_error_keeps_failure_streak(self):
+        limiter = self.limiter(max_retries=0, failure_threshold=3)
+        with self.assertRaises(RetriesExhausted):
+            limiter.call(failing(HTTPError(503)))
+        with self.assertRaises(RetriesExhausted):
+            limiter.call(failing(HTTPError(503)))
+        with self.assertRaises(HTTPError):
+            limiter.call(failing(HTTPError(404)))
+        self.assertEqual(limiter.breaker.failures, 2)
+
+        with self.assertRaises(RetriesExhausted):
+            limiter.call(failing(HTTPError(503)))
+        self.assertEqual(limiter.breaker.state, 'open')
+
+    def test_client_error_closes_half_open_breaker(self):
+        limiter = self.limiter(max_retries=0, failure_threshold=1, reset_timeout=0)
+        with self.assertRaises(RetriesExhausted):
+            limiter.call(failing(HTTPError(503)))
+        with self.assertRaises(HTTPError):
+            limiter.call(failing(HTTPError(404)))
+        self.assertEqual(limiter.breaker.state, 'closed')
+
+    def test_retry_after_is_capped(self):
+        limiter = self.limiter(max_retries=1, max_retry_after=0.05)
+        started = time.monotonic()
+        self.assertEqual(limiter.call(failing(HTTPError(429, {'Retry-After': '3600'}))), 'ok')
+        self.assertLess(time.monotonic() - started, 1)
+        self.assertEqual(limiter.retries, 1)
+
+    def test_retries_exhausted_reported(self):
+        limiter = self.limiter(max_retries=2)
+        with self.assertRaises(RetriesExhausted) as raised:
+            limiter.call(failing(*[HTTPError(503)] * 3))
+        self.assertEqual((raised.exception.attempts, raised.exception.status_code), (3, 503))
+        self.assertEqual(limiter.stats()['exhausted'], 1)
+
+    def test_scraper_failed_result_marks_exhausted(self):
+        class App:
+            def scrape_url(self, url, params):
+                raise HTTPError(503)
+
+        scraper = FirecrawlScraper(app=App(), use_local=False, limiter=self.limiter(max_retries=1))
+        result = scraper.scrape_product_page('https://well.ca/p/1')
+        self.assertEqual(result['status'], 'failed')
+        self.assertEqual((result['retries_exhausted'], result['attempts']), (True, 2))
+
+    def test_retry_after_parsing(self):
+        self.assertEqual(retry_after_of(HTTPError(429, {'Retry-After': '7'})), 7.0)
+        self.assertAlmostEqual(retry_after_of(HTTPError(429, {'retry-after': formatdate(time.time() + 30)})),
+                               30, delta=2)
+        self.assertIsNone(retry_after_of(HTTPError(429, {'Retry-After': 'soon'})))
+        self.assertIsNone(retry_after_of(HTTPError(429)))
+
+    def test_shared_limiter_per_key(self):
+        self.assertIs(shared_limiter('key-a'), shared_limiter('key-a'))
+        self.assertIsNot(shared_limiter('key-a'), shared_limiter('key-b'))
+
+
+if __name__ == '__main__':
+    unittest.main()
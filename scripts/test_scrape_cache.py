@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+ScrapeCache 테스트 (TTL 만료, 용량 기준 LRU 삭제, 재시작 후 용량 복원)
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'data-collection'))
+
+from scrape_cache import ScrapeCache
+
+
+class Clock:
+    """
+    time.time 대역 (테스트에서 직접 진행)
+    """
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+def entry_size(value):
+    return len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+class TestScrapeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cache.sqlite3')
+        self.clock = Clock()
+        patcher = mock.patch('scrape_cache.time', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_uses_canonical_url_and_options(self):
+        a = ScrapeCache.make_key('https://www.well.ca/p/1?utm_source=x', {'formats': ['markdown']})
+        b = ScrapeCache.make_key('https://well.ca/p/1', {'formats': ['markdown']})
+        c = ScrapeCache.make_key('https://well.ca/p/1', {'formats': ['extract']})
+        self.assertEqual(a, b)
+        self.assertNotEqual(b, c)
+
+    def test_ttl_expiry(self):
+        cache = ScrapeCache(path=self.path, ttl=10)
+        cache.set('k', {'v': 1})
+        self.assertEqual(cache.get('k'), {'v': 1})
+        self.clock.now += 10
+        self.assertIsNone(cache.get('k'))
+        self.assertEqual(cache.stats()['total_bytes'], 0)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        cache.close()
+
+    def test_lru_eviction_by_bytes(self):
+        value = {'data': 'x' * 100}
+        size = entry_size(value)
+        cache = ScrapeCache(path=self.path, max_bytes=size * 3)
+        for key in ('a', 'b', 'c'):
+            cache.set(key, value)
+            self.clock.now += 1
+
+        # a를 읽어 최근 사용으로, 다음 저장 시 가장 오래 안 쓴 b 삭제
+        self.assertIsNotNone(cache.get('a'))
+        self.clock.now += 1
+        cache.set('d', value)
+
+        self.assertIsNone(cache.get('b'))
+        for key in ('a', 'c', 'd'):
+            self.assertIsNotNone(cache.get(key), key)
+        stats = cache.stats()
+        self.assertEqual((stats['entries'], stats['total_bytes'], stats['evictions']), (3, size * 3, 1))
+        cache.close()
+
+    def test_overwrite_and_reopen_keep_byte_count(self):
+        cache = ScrapeCache(path=self.path)
+        cache.set('k', {'data': 'short'})
+        cache.set('k', {'data': 'a much longer payload'})
+        expected = entry_size({'data': 'a much longer payload'})
+        self.assertEqual(cache.stats()['total_bytes'], expected)
+        cache.close()
+
+        reopened = ScrapeCache(path=self.path)
+        self.assertEqual(reopened.stats()['total_bytes'], expected)
+        reopened.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+TieredAnalyzer 테스트 (휴리스틱 제외, 가격 없는 제품 처리, 선별 모델/비용 기록)
+"""
+
+import os
+import sys
+import math
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'ai-analysis'))
+
+from screening import TieredAnalyzer, heuristic_scores
+
+PRICED = {'name': 'Omega-3', 'price_cad': 29.99, 'category': '건강식품', 'rating': 4.7, 'reviews_count': 1250}
+UNPRICED = {'name': 'Omega-3 (가격 미표시)', 'category': '건강식품', 'rating': 4.7, 'reviews_count': 1250}
+CHEAP = {'name': 'Snow Shovel', 'price_cad': 1.99, 'category': '생활용품', 'rating': 3.0}
+
+
+class FakeScreener:
+    """
+    ScreeningAnalyzer 대역 (모든 제품 진출 점수 score)
+    """
+
+    def __init__(self, score=80):
+        self.score = score
+        self.screened = []
+
+    def screen_product(self, product):
+        self.screened.append(product['name'])
+        return {'status': 'success', 'analysis': {'entry_score': self.score, 'reason': '테스트'},
+                'model': 'claude-3-haiku-20240307', 'cost_usd': 0.0001}
+
+
+class FakeDuo:
+    """
+    DuoAnalyzer 대역
+    """
+
+    def analyze_many(self, products, exchange_rate=1350):
+        return [{'product': product, 'status': 'success'} for product in products]
+
+
+class TestTieredAnalyzer(unittest.TestCase):
+    def test_unpriced_scores_nan(self):
+        scores = heuristic_scores([PRICED, UNPRICED])
+        self.assertGreater(scores[0], 50)
+        self.assertTrue(math.isnan(scores[1]))
+
+    def test_unpriced_sent_to_model_screen(self):
+        screener = FakeScreener()
+        tiered = TieredAnalyzer(duo=FakeDuo(), screener=screener)
+        priced, unpriced, cheap = tiered.analyze_many([PRICED, UNPRICED, CHEAP])
+
+        self.assertEqual(screener.screened, [PRICED['name'], UNPRICED['name']])
+        self.assertEqual((priced['tier'], unpriced['tier'], cheap['tier']), ('full', 'full', 'heuristic'))
+        self.assertTrue(unpriced['screening']['unpriced'])
+        self.assertIsNone(unpriced['screening']['heuristic_score'])
+
+    def test_unpriced_without_model(self):
+        tiered = TieredAnalyzer(duo=FakeDuo(), use_model=False)
+        results = tiered.analyze_many([PRICED, UNPRICED])
+
+        self.assertEqual([r['tier'] for r in results], ['full', 'unpriced'])
+        self.assertEqual(tiered.tier_counts['unpriced'], 1)
+
+    def test_screening_records_model_and_cost(self):
+        tiered = TieredAnalyzer(duo=FakeDuo(), screener=FakeScreener(score=30))
+        result = tiered.analyze_product(PRICED)
+
+        self.assertEqual(result['status'], 'rejected')
+        self.assertEqual(result['tier'], 'screening_model')
+        self.assertEqual(result['screening']['model'], 'claude-3-haiku-20240307')
+        self.assertEqual(result['screening']['cost_usd'], 0.0001)
+
+
+if __name__ == '__main__':
+    unittest.main()
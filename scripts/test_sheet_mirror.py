@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+SheetMirror 테스트 (append 후 중단 시 중복 추가 방지, 시트 숫자 서식 정규화, 바뀐 셀만 갱신, 스풀 경유 새 행)
+"""
+
+import os
+import re
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'automation'))
+
+from google_sheets_sync import ANALYSIS_HEADERS
+from sheet_mirror import SheetMirror, HEADER_ROWS
+from sheets_spool import SheetsSpool
+
+
+def sheet_value(value):
+    # 시트에서 읽으면 숫자는 서식이 붙은 문자열 (29.9 → '29.90')
+    if isinstance(value, float):
+        return f'{value:.2f}'
+    return '' if value is None else str(value)
+
+
+class FakeSync:
+    """
+    메모리 시트를 쓰는 GoogleSheetsSync 대역 (fail_after_append=True면 행을 추가한 뒤 예외)
+    """
+    def __init__(self):
+        self.values = [list(ANALYSIS_HEADERS)]
+        self.api_calls = 0
+        self.updates = []
+        self.fail_after_append = False
+
+    def append_rows(self, rows, title):
+        self.api_calls += 1
+        first = len(self.values) + 1
+        self.values.extend([sheet_value(value) for value in row] for row in rows)
+        if self.fail_after_append:
+            raise TimeoutError('response lost')
+        return {'updates': {'updatedRange': f"'{title}'!A{first}:V{len(self.values)}"}}
+
+    def batch_update(self, data, title):
+        self.api_calls += 1
+        self.updates.extend(data)
+        for entry in data:
+            column, row_number = re.match(r'([A-Z]+)(\d+)', entry['range']).groups()
+            start = ord(column) - ord('A')
+            for offset, value in enumerate(entry['values'][0]):
+                self.values[int(row_number) - 1][start + offset] = sheet_value(value)
+
+    def get_all_values(self, title):
+        self.api_calls += 1
+        return [list(row) for row in self.values]
+
+
+def make_row(name, price=29.9, score=72):
+    row = [''] * len(ANALYSIS_HEADERS)
+    row[ANALYSIS_HEADERS.index('제품명')] = name
+    row[ANALYSIS_HEADERS.index('브랜드')] = 'NaturePath'
+    row[ANALYSIS_HEADERS.index('출처사이트')] = f'https://example.ca/products/{name.lower()}'
+    row[ANALYSIS_HEADERS.index('캐나다가격')] = price
+    row[ANALYSIS_HEADERS.index('진출점수')] = score
+    return row
+
+
+class TestSheetMirror(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.sync = FakeSync()
+        self.mirror = SheetMirror(sync=self.sync, path=os.path.join(self.tmp.name, 'mirror.sqlite3'), spool=False)
+
+    def tearDown(self):
+        self.mirror.close()
+        self.tmp.cleanup()
+
+    def data_rows(self):
+        return self.sync.values[HEADER_ROWS:]
+
+    def test_interrupted_append_not_duplicated(self):
+        self.mirror.upsert(make_row('Omega'))
+        self.sync.fail_after_append = True
+        self.assertEqual(self.mirror.push()['status'], 'failed')
+
+        # 행은 시트에 들어갔지만 행 번호를 기록하지 못함: 다음 push는 시트를 먼저 확인
+        self.sync.fail_after_append = False
+        self.mirror.upsert(make_row('Krill'))
+        result = self.mirror.push()
+        self.assertEqual((result['status'], result['new_rows']), ('success', 1))
+        names = [row[ANALYSIS_HEADERS.index('제품명')] for row in self.data_rows()]
+        self.assertEqual(names, ['Omega', 'Krill'])
+        self.assertEqual(self.mirror.stats(), {'rows': 2, 'dirty': 0, 'new': 0})
+
+    def test_formatted_numbers_not_dirty(self):
+        self.mirror.upsert(make_row('Omega', price=29.9))
+        self.mirror.push()
+        # 시트에서 다시 읽으면 '29.90', '72'
+        self.mirror.load()
+        self.assertEqual(self.mirror.stats()['dirty'], 0)
+
+        self.assertFalse(self.mirror.upsert(make_row('Omega', price=29.9)))
+        result = self.mirror.push()
+        self.assertEqual((result['updated_rows'], result['ranges']), (0, 0))
+        self.assertEqual(self.sync.updates, [])
+
+    def test_changed_cells_pushed_as_ranges(self):
+        self.mirror.upsert(make_row('Omega', price=29.9, score=72))
+        self.mirror.push()
+
+        self.assertTrue(self.mirror.upsert(make_row('Omega', price=31.5, score=72)))
+        result = self.mirror.push()
+        self.assertEqual((result['updated_rows'], result['cells']), (1, 2))
+        # 바뀐 가격 + 수집일자
+        self.assertEqual([entry['range'] for entry in self.sync.updates], ['A2:A2', 'E2:E2'])
+        self.assertEqual(self.data_rows()[0][ANALYSIS_HEADERS.index('캐나다가격')], '31.50')
+
+    def test_new_rows_through_spool(self):
+        spool = SheetsSpool(sync=self.sync, path=os.path.join(self.tmp.name, 'spool.jsonl'), flush_interval=0)
+        mirror = SheetMirror(sync=self.sync, path=os.path.join(self.tmp.name, 'spooled.sqlite3'), spool=spool)
+        mirror.upsert(make_row('Omega'))
+        result = mirror.push()
+        self.assertEqual((result['new_rows'], result['spooled']), (1, True))
+        self.assertEqual(self.data_rows(), [])
+
+        # 스풀이 기록하기 전의 push는 같은 행을 다시 넘기지 않음
+        self.assertEqual(mirror.push()['new_rows'], 0)
+        self.assertEqual(spool.stats()['spooled'], 1)
+
+        spool.flush_once()
+        mirror.push()
+        self.assertEqual(len(self.data_rows()), 1)
+        self.assertEqual(mirror.stats(), {'rows': 1, 'dirty': 0, 'new': 0})
+        spool.close()
+        mirror.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
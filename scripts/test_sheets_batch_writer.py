@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+SheetsBatchWriter 테스트 (경과 시간 기준 백그라운드 기록, 기록 실패 시 버퍼 상한, 스풀 경유)
+"""
+
+import os
+import sys
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'automation'))
+
+from sheets_batch_writer import SheetsBatchWriter
+
+
+class FakeSync:
+    """
+    append_rows 호출만 기록하는 GoogleSheetsSync 대역 (fail=True면 항상 실패)
+    """
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.rows = []
+        self.api_calls = 0
+
+    def append_rows(self, rows, title):
+        self.api_calls += 1
+        if self.fail:
+            raise RuntimeError('sheets unavailable')
+        self.rows.extend(rows)
+
+
+class FakeSpool:
+    """
+    append로 받은 행만 모으는 SheetsSpool 대역
+    """
+    def __init__(self):
+        self.rows = []
+
+    def append(self, row):
+        self.rows.append(row)
+        return {'status': 'queued', 'id': len(self.rows)}
+
+
+class TestSheetsBatchWriter(unittest.TestCase):
+    def wait_for(self, condition, timeout=2.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(0.01)
+        return False
+
+    def test_interval_flush_without_further_adds(self):
+        sync = FakeSync()
+        writer = SheetsBatchWriter(sync=sync, batch_size=100, flush_interval=0.1, spool=False)
+        self.assertEqual(writer.add_row(['a'])['status'], 'buffered')
+
+        # 다음 add 없이도 경과 시간이 지나면 기록
+        self.assertTrue(self.wait_for(lambda: sync.rows == [['a']]))
+        self.assertEqual(writer.stats()['pending'], 0)
+        writer.close()
+
+    def test_close_stops_timer_and_flushes(self):
+        sync = FakeSync()
+        writer = SheetsBatchWriter(sync=sync, batch_size=100, flush_interval=60, spool=False)
+        writer.add_row(['a'])
+        self.assertEqual(writer.close(), {'status': 'success', 'rows': 1})
+        self.assertFalse(writer._timer.is_alive())
+        self.assertEqual(sync.rows, [['a']])
+
+    def test_failed_flushes_reject_rows_over_cap(self):
+        sync = FakeSync(fail=True)
+        writer = SheetsBatchWriter(sync=sync, batch_size=1, flush_interval=0, max_pending=2, spool=False)
+        self.assertEqual(writer.add_row(['a'])['pending'], 1)
+        self.assertEqual(writer.add_row(['b'])['pending'], 2)
+
+        result = writer.add_row(['c'])
+        self.assertEqual((result['status'], result['error']), ('failed', 'buffer full'))
+        stats = writer.stats()
+        self.assertEqual((stats['pending'], stats['rejected_rows']), (2, 1))
+
+        sync.fail = False
+        writer.close()
+        self.assertEqual(sync.rows, [['a'], ['b']])
+
+    def test_rows_routed_through_spool(self):
+        sync, spool = FakeSync(), FakeSpool()
+        writer = SheetsBatchWriter(sync=sync, batch_size=1, flush_interval=0, max_pending=1, spool=spool)
+        for row in (['a'], ['b']):
+            self.assertEqual(writer.add_row(row)['status'], 'queued')
+        writer.close()
+
+        # 시트 기록은 스풀 몫 (버퍼 상한과 무관)
+        self.assertEqual(spool.rows, [['a'], ['b']])
+        self.assertEqual(sync.rows, [])
+        stats = writer.stats()
+        self.assertEqual((stats['spooled_rows'], stats['rejected_rows'], stats['pending']), (2, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+SheetsSpool 테스트 (재시작 복원, 잘린 마지막 줄, 기록 실패, 로그 압축, dead-letter, 기본 스풀 경유)
+"""
+
+import os
+import sys
+import json
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(ROOT, '..', 'automation'))
+
+from google_sheets_sync import GoogleSheetsSync
+from sheets_spool import SheetsSpool, reset_spools
+
+
+class FakeSync:
+    """
+    append_rows 호출만 기록하는 GoogleSheetsSync 대역 (fail=True면 항상 실패, poison 행이 든 묶음도 실패)
+    """
+    def __init__(self, fail=False, poison=None):
+        self.fail = fail
+        self.poison = poison
+        self.rows = []
+
+    def append_rows(self, rows, title):
+        if self.fail:
+            raise RuntimeError('sheets unavailable')
+        if self.poison in rows:
+            raise RuntimeError('invalid row')
+        self.rows.extend(rows)
+
+
+class FakeWorksheet:
+    """
+    append_row(s)로 받은 행만 모으는 gspread 워크시트 대역
+    """
+    def __init__(self):
+        self.rows = []
+
+    def append_row(self, row):
+        self.rows.append(row)
+
+    def append_rows(self, rows):
+        self.rows.extend(rows)
+
+
+class TestSheetsSpool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'spool.jsonl')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def spool(self, sync, **kwargs):
+        return SheetsSpool(sync=sync, path=self.path, batch_size=10, flush_interval=0, **kwargs)
+
+    def read_log(self):
+        with open(self.path, encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+
+    def test_torn_tail_truncated_before_append(self):
+        spool = self.spool(FakeSync())
+        spool.append(['a'])
+        spool.close()
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write('{"id": 2, "ro')
+
+        sync = FakeSync()
+        spool = self.spool(sync)
+        self.assertEqual(spool.stats()['truncated_bytes'], len('{"id": 2, "ro'))
+        self.assertEqual(spool.stats()['replayed'], 1)
+        spool.append(['b'])
+        spool.close()
+
+        # 모든 줄을 읽을 수 있어야 함 (새 행이 잘린 조각에 붙지 않음)
+        self.assertEqual([entry['row'] for entry in self.read_log()], [['a'], ['b']])
+        spool = self.spool(sync)
+        self.assertEqual(spool.flush_once(), {'status': 'success', 'rows': 2})
+        spool.close()
+        self.assertEqual(sync.rows, [['a'], ['b']])
+
+    def test_done_rows_not_replayed(self):
+        sync = FakeSync()
+        spool = self.spool(sync)
+        spool.append(['a'])
+        spool.flush_once()
+        spool.append(['b'])
+        spool.close()
+
+        spool = self.spool(sync)
+        self.assertEqual(spool.stats()['replayed'], 1)
+        spool.flush_once()
+        spool.close()
+        self.assertEqual(sync.rows, [['a'], ['b']])
+
+    def test_failed_flush_keeps_rows(self):
+        sync = FakeSync(fail=True)
+        spool = self.spool(sync)
+        spool.append(['a'])
+        result = spool.flush_once()
+        self.assertEqual((result['status'], result['pending']), ('failed', 1))
+        self.assertEqual(spool.stats()['last_error'], 'sheets unavailable')
+
+        sync.fail = False
+        self.assertEqual(spool.flush_once(), {'status': 'success', 'rows': 1})
+        self.assertEqual(spool.stats()['pending'], 0)
+        spool.close()
+        self.assertEqual(sync.rows, [['a']])
+
+    def test_compaction_keeps_pending_rows(self):
+        spool = self.spool(FakeSync(), compact_after=2)
+        spool.append(['a'])
+        spool.append(['b'])
+        spool.flush_once()
+        spool.append(['c'])
+        spool.close()
+
+        self.assertEqual(self.read_log(), [{'id': 3, 'row': ['c']}])
+
+    def test_poison_row_dead_lettered(self):
+        sync = FakeSync(poison=['bad'])
+        spool = self.spool(sync, max_attempts=2)
+        for row in (['a'], ['bad'], ['c']):
+            spool.append(row)
+
+        # 연속 실패 → 묶음 크기 절반 (a 기록) → 한 행 묶음도 계속 실패하면 dead-letter
+        results = [spool.flush_once() for _ in range(6)]
+        self.assertEqual(sum(result.get('dead_lettered', 0) for result in results), 1)
+        self.assertEqual(sync.rows, [['a'], ['c']])
+        stats = spool.stats()
+        self.assertEqual((stats['pending'], stats['dead_lettered']), (0, 1))
+        spool.close()
+
+        with open(spool.dead_path, encoding='utf-8') as f:
+            dead = [json.loads(line) for line in f]
+        self.assertEqual([(entry['row'], entry['error']) for entry in dead], [(['bad'], 'invalid row')])
+        # 재시작해도 dead-letter 행은 다시 기록하지 않음
+        self.assertEqual(self.spool(sync).stats()['replayed'], 0)
+
+    def test_update_analysis_result_spooled_by_default(self):
+        worksheet = FakeWorksheet()
+        gc = SimpleNamespace(open_by_key=lambda key: SimpleNamespace(worksheet=lambda title: worksheet))
+        failed = {'status': 'failed', 'error': 'not analyzed'}
+        product = {'name': 'Omega-3 Fish Oil', 'price_cad': 29.99}
+
+        with mock.patch.dict(os.environ, {'SHEETS_SPOOL_PATH': self.path, 'SHEETS_USE_SPOOL': '1'}):
+            self.assertEqual(GoogleSheetsSync(gc=gc).update_analysis_result(product, failed, failed)['status'],
+                             'queued')
+            self.assertEqual(len(self.read_log()), 1)
+            reset_spools()
+        self.assertEqual(len(worksheet.rows), 1)
+
+        # 스풀을 끄면 한 행씩 바로 기록
+        result = GoogleSheetsSync(gc=gc, spool=False).update_analysis_result(product, failed, failed)
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(len(worksheet.rows), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+URL 정규화 / URLFrontier 테스트
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data-collection'))
+
+from url_frontier import canonicalize_url, URLFrontier
+
+
+class TestCanonicalizeURL(unittest.TestCase):
+    def test_strips_common_tracking_params(self):
+        url = 'HTTPS://www.Well.ca/products/omega-3_1.html/?utm_source=x&gclid=1&fbclid=2&size=60#reviews'
+        self.assertEqual(canonicalize_url(url), 'https://well.ca/products/omega-3_1.html?size=60')
+
+    def test_keeps_variant_params_on_other_sites(self):
+        # th/psc/cid/sid/source/tag는 사이트에 따라 제품/변형을 고르는 값
+        url = 'https://shop.example.ca/p?th=1&psc=1&cid=42&sid=7&source=b&tag=vegan'
+        self.assertEqual(canonicalize_url(url), 'https://shop.example.ca/p?cid=42&psc=1&sid=7&source=b&tag=vegan&th=1')
+
+    def test_amazon_scoped_params(self):
+        url = 'https://www.amazon.ca/dp/B00ABC/ref=sr_1_1?ref_=x&qid=1&sr=8-1&pd_rd_w=z&th=1&psc=1&tag=aff-20'
+        self.assertEqual(canonicalize_url(url), 'https://amazon.ca/dp/B00ABC?psc=1&th=1')
+        # 같은 제품의 /ref= 경로 변형은 하나로
+        self.assertEqual(canonicalize_url('https://www.amazon.ca/dp/B00ABC/ref=pd_sbs_1'),
+                         canonicalize_url('https://amazon.ca/dp/B00ABC'))
+        # 다른 사이트의 ref= 경로 구간은 그대로
+        self.assertEqual(canonicalize_url('https://shop.example.ca/ref=a/p'), 'https://shop.example.ca/ref=a/p')
+
+    def test_listing_params(self):
+        url = 'https://well.ca/categories/vitamins_3.html?page=2&sort=price'
+        self.assertEqual(canonicalize_url(url), 'https://well.ca/categories/vitamins_3.html?page=2&sort=price')
+        self.assertEqual(canonicalize_url(url, keep_listing_params=False), 'https://well.ca/categories/vitamins_3.html')
+
+    def test_product_id_params_kept(self):
+        # ?p=<id> 제품 페이지가 하나로 합쳐지지 않도록
+        first = canonicalize_url('https://shop.example.ca/?p=101&view=full', keep_listing_params=False)
+        second = canonicalize_url('https://shop.example.ca/?p=102&view=full', keep_listing_params=False)
+        self.assertEqual(first, 'https://shop.example.ca/?p=101&view=full')
+        self.assertNotEqual(first, second)
+
+
+class TestURLFrontier(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.frontier = URLFrontier(path=os.path.join(self.tmp.name, 'frontier.sqlite3'))
+
+    def tearDown(self):
+        self.frontier.close()
+        self.tmp.cleanup()
+
+    def test_filters_batch_duplicates_and_fresh_urls(self):
+        urls = ['https://well.ca/p/1?utm_source=a', 'https://www.well.ca/p/1', 'https://well.ca/p/2']
+        decisions = self.frontier.filter_new(urls)
+        self.assertEqual(decisions, ['https://well.ca/p/1', None, 'https://well.ca/p/2'])
+
+        self.frontier.mark_fetched(['https://well.ca/p/1'])
+        self.assertEqual(self.frontier.filter_new(urls), [None, None, 'https://well.ca/p/2'])
+
+    def test_product_id_pages_not_skipped(self):
+        self.frontier.mark_fetched(['https://shop.example.ca/?p=101'])
+        self.assertEqual(self.frontier.filter_new(['https://shop.example.ca/?p=102']),
+                         ['https://shop.example.ca/?p=102'])
+
+
+if __name__ == '__main__':
+    unittest.main()